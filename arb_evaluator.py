@@ -1,8 +1,19 @@
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Iterable, Optional
+
+from exchanges.ladder import Ladder
+from utils.logging import get_logger
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+logger = get_logger(__name__)
 
 # Config: tune these once you see outputs.
 BETDEX_COMMISSION = 0.03
@@ -10,6 +21,14 @@ POLY_FEE = 0.0
 POLY_SLIPPAGE = 0.002
 MIN_EUR_PROFIT = 0.10
 BASE_STAKE_EUR = 5.0
+# Batches at least this long use the NumPy path when numpy is installed.
+VECTORIZE_MIN_PAIRS = 256
+# Size stakes against stored order-book depth instead of BASE_STAKE_EUR.
+DEPTH_SIZING = True
+# Bisection steps when a stake ends inside a partially filled level.
+DEPTH_BISECT_STEPS = 40
+# Rows per executemany batch when persisting evaluations.
+PERSIST_CHUNK_SIZE = 1000
 
 
 def _utcnow() -> datetime:
@@ -18,7 +37,7 @@ def _utcnow() -> datetime:
 
 @dataclass
 class ArbResult:
-    event_uid: str
+    event_key: int
     team: str
     poly_market_id: str
     betdex_market_id: str
@@ -31,6 +50,8 @@ class ArbResult:
     worst_case_profit: float
     profit_if_team_wins: float
     profit_if_team_not_win: float
+    # Hex uid for output and audit rows; ArbEvaluator fills it in.
+    event_uid: Optional[str] = None
 
 
 def _pm_yes_profit(stake: float, p_yes: float, fee: float, slip: float) -> float:
@@ -107,149 +128,660 @@ def _solve_back_stake_for_balance(
     return (pm_profit_lose - pm_loss_win) / denom
 
 
-def evaluate_arbs(session) -> list[ArbResult]:
-    from db.models import ArbitrageEvaluation, BinaryMarket, ExchangeMarket
+_Pair = tuple[int, str, str, float, float, str, str, Optional[float], Optional[float]]
 
-    pm_rows = (
-        session.query(BinaryMarket)
-        .filter(BinaryMarket.platform == "polymarket")
-        .all()
+
+def _lay_outcome(stake_pm: float, p_yes: float, odds_lay: float) -> tuple[float, float, float]:
+    """PM YES vs exchange LAY: (lay_stake, profit_if_win, profit_if_not_win)."""
+    lay_stake = _solve_lay_stake_for_balance(
+        stake_pm=stake_pm,
+        p_yes=p_yes,
+        odds_lay=odds_lay,
+        commission=BETDEX_COMMISSION,
+        fee=POLY_FEE,
+        slip=POLY_SLIPPAGE,
+    )
+    profit_win = _pm_yes_profit(
+        stake_pm, p_yes, POLY_FEE, POLY_SLIPPAGE
+    ) + _bdx_lay_loss(lay_stake, odds_lay)
+    profit_not = _pm_yes_loss(
+        stake_pm, p_yes, POLY_FEE, POLY_SLIPPAGE
+    ) + _bdx_lay_profit(lay_stake, BETDEX_COMMISSION)
+    return lay_stake, profit_win, profit_not
+
+
+def _back_outcome(stake_pm: float, p_no: float, odds_back: float) -> tuple[float, float, float]:
+    """PM NO vs exchange BACK: (back_stake, profit_if_win, profit_if_not_win)."""
+    back_stake = _solve_back_stake_for_balance(
+        stake_pm=stake_pm,
+        p_no=p_no,
+        odds_back=odds_back,
+        commission=BETDEX_COMMISSION,
+        fee=POLY_FEE,
+        slip=POLY_SLIPPAGE,
     )
-    ex_rows = session.query(ExchangeMarket).all()
+    profit_win = _pm_no_loss(
+        stake_pm, p_no, POLY_FEE, POLY_SLIPPAGE
+    ) + _bdx_back_profit(back_stake, odds_back, BETDEX_COMMISSION)
+    profit_not = _pm_no_profit(
+        stake_pm, p_no, POLY_FEE, POLY_SLIPPAGE
+    ) + _bdx_back_loss(back_stake)
+    return back_stake, profit_win, profit_not
+
+
+def _evaluate_pair(pair: _Pair, min_profit: float = MIN_EUR_PROFIT) -> list[ArbResult]:
+    (
+        event_key,
+        team,
+        pm_id,
+        p_yes,
+        p_no,
+        market_id,
+        selection_id,
+        best_back,
+        best_lay,
+    ) = pair
+    stake_pm = BASE_STAKE_EUR
+    results: list[ArbResult] = []
 
-    pm_index: dict[tuple[str, str], tuple[float, Optional[float], str]] = {}
-    for pm in pm_rows:
-        if not pm.event_uid or not pm.team or pm.price is None:
-            continue
-        p_yes = float(pm.price)
-        p_no = getattr(pm, "price_no", None)
-        if p_no is None:
-            p_no = 1.0 - p_yes
-        pm_index[(pm.event_uid, pm.team)] = (p_yes, float(p_no), pm.market_id)
+    if best_lay and best_lay > 1.01:
+        lay_stake, profit_win, profit_not = _lay_outcome(stake_pm, p_yes, float(best_lay))
+        worst = min(profit_win, profit_not)
+
+        if worst >= min_profit:
+            results.append(
+                ArbResult(
+                    event_key=event_key,
+                    team=team,
+                    poly_market_id=pm_id,
+                    betdex_market_id=market_id,
+                    betdex_selection_id=selection_id,
+                    direction="PM_YES_vs_BDX_LAY",
+                    pm_price=p_yes,
+                    bdx_odds=float(best_lay),
+                    stake_pm=stake_pm,
+                    lay_stake_or_back_stake=lay_stake,
+                    worst_case_profit=worst,
+                    profit_if_team_wins=profit_win,
+                    profit_if_team_not_win=profit_not,
+                )
+            )
 
-    ex_index: dict[tuple[str, str], tuple[str, str, Optional[float], Optional[float]]] = {}
-    for ex in ex_rows:
-        if not ex.event_uid or not ex.selection_name:
-            continue
-        key = (ex.event_uid, ex.selection_name)
-        ex_index[key] = (
-            ex.market_id,
-            ex.selection_id,
-            ex.best_back_odds,
-            ex.best_lay_odds,
-        )
+    if best_back and best_back > 1.01:
+        back_stake, profit_win, profit_not = _back_outcome(stake_pm, p_no, float(best_back))
+        worst = min(profit_win, profit_not)
+
+        if worst >= min_profit:
+            results.append(
+                ArbResult(
+                    event_key=event_key,
+                    team=team,
+                    poly_market_id=pm_id,
+                    betdex_market_id=market_id,
+                    betdex_selection_id=selection_id,
+                    direction="PM_NO_vs_BDX_BACK",
+                    pm_price=p_no,
+                    bdx_odds=float(best_back),
+                    stake_pm=stake_pm,
+                    lay_stake_or_back_stake=back_stake,
+                    worst_case_profit=worst,
+                    profit_if_team_wins=profit_win,
+                    profit_if_team_not_win=profit_not,
+                )
+            )
 
-    pm_uids = {uid for (uid, _team) in pm_index.keys()}
-    ex_uids = {uid for (uid, _team) in ex_index.keys()}
-    overlap = pm_uids & ex_uids
-    print(
-        f"[arb] pm markets: {len(pm_index)} | ex markets: {len(ex_index)} | "
-        f"overlapping event_uids: {len(overlap)}"
-    )
+    return results
 
-    results: list[ArbResult] = []
 
-    for key, (p_yes, p_no, pm_id) in pm_index.items():
-        if key not in ex_index:
-            continue
+def _evaluate_pairs_scalar(pairs: list[_Pair], min_profit: float = MIN_EUR_PROFIT) -> list[ArbResult]:
+    results: list[ArbResult] = []
+    for pair in pairs:
+        results.extend(_evaluate_pair(pair, min_profit))
+    return results
+
+
+def _evaluate_pairs_vectorized(
+    pairs: list[_Pair], min_profit: float = MIN_EUR_PROFIT
+) -> list[ArbResult]:
+    # Same arithmetic as the scalar helpers, in the same operation order, so
+    # every float matches the scalar path bit for bit.
+    n = len(pairs)
+    if n == 0:
+        return []
+
+    p_yes = np.fromiter((p[3] for p in pairs), dtype=np.float64, count=n)
+    p_no = np.fromiter((p[4] for p in pairs), dtype=np.float64, count=n)
+    back = np.fromiter(
+        (p[7] if p[7] is not None else np.nan for p in pairs),
+        dtype=np.float64,
+        count=n,
+    )
+    lay = np.fromiter(
+        (p[8] if p[8] is not None else np.nan for p in pairs),
+        dtype=np.float64,
+        count=n,
+    )
+    stake_pm = BASE_STAKE_EUR
+    commission = BETDEX_COMMISSION
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # PM YES vs exchange LAY.
+        eff_yes = p_yes + POLY_FEE + POLY_SLIPPAGE
+        yes_profit = stake_pm * (1.0 - eff_yes)
+        yes_loss = -stake_pm * eff_yes
+        lay_denom = lay - commission
+        lay_stake = np.where(lay_denom > 0, (yes_profit - yes_loss) / lay_denom, 0.0)
+        lay_win = yes_profit + -(lay_stake * (lay - 1.0))
+        lay_not = yes_loss + lay_stake * (1.0 - commission)
+        lay_worst = np.minimum(lay_win, lay_not)
+        lay_ok = (lay > 1.01) & (lay_worst >= min_profit)
+
+        # PM NO vs exchange BACK.
+        eff_no = p_no + POLY_FEE + POLY_SLIPPAGE
+        no_profit = stake_pm * (1.0 - eff_no)
+        no_loss = -stake_pm * eff_no
+        back_denom = (1.0 * (back - 1.0)) * (1.0 - commission) + 1.0
+        back_stake = np.where(back_denom > 0, (no_profit - no_loss) / back_denom, 0.0)
+        back_win = no_loss + (back_stake * (back - 1.0)) * (1.0 - commission)
+        back_not = no_profit + -back_stake
+        back_worst = np.minimum(back_win, back_not)
+        back_ok = (back > 1.01) & (back_worst >= min_profit)
 
-        event_uid, team = key
-        market_id, selection_id, best_back, best_lay = ex_index[key]
-        stake_pm = BASE_STAKE_EUR
-
-        if best_lay and best_lay > 1.01:
-            lay_stake = _solve_lay_stake_for_balance(
-                stake_pm=stake_pm,
-                p_yes=p_yes,
-                odds_lay=float(best_lay),
-                commission=BETDEX_COMMISSION,
-                fee=POLY_FEE,
-                slip=POLY_SLIPPAGE,
-            )
-            profit_win = _pm_yes_profit(
-                stake_pm, p_yes, POLY_FEE, POLY_SLIPPAGE
-            ) + _bdx_lay_loss(lay_stake, float(best_lay))
-            profit_not = _pm_yes_loss(
-                stake_pm, p_yes, POLY_FEE, POLY_SLIPPAGE
-            ) + _bdx_lay_profit(lay_stake, BETDEX_COMMISSION)
-            worst = min(profit_win, profit_not)
-
-            if worst >= MIN_EUR_PROFIT:
-                results.append(
-                    ArbResult(
-                        event_uid=event_uid,
-                        team=team,
-                        poly_market_id=pm_id,
-                        betdex_market_id=market_id,
-                        betdex_selection_id=selection_id,
-                        direction="PM_YES_vs_BDX_LAY",
-                        pm_price=p_yes,
-                        bdx_odds=float(best_lay),
-                        stake_pm=stake_pm,
-                        lay_stake_or_back_stake=lay_stake,
-                        worst_case_profit=worst,
-                        profit_if_team_wins=profit_win,
-                        profit_if_team_not_win=profit_not,
-                    )
+    results: list[ArbResult] = []
+    for i in np.flatnonzero(lay_ok | back_ok).tolist():
+        event_key, team, pm_id, _p_yes, _p_no, market_id, selection_id, _b, _l = pairs[i]
+        if lay_ok[i]:
+            results.append(
+                ArbResult(
+                    event_key=event_key,
+                    team=team,
+                    poly_market_id=pm_id,
+                    betdex_market_id=market_id,
+                    betdex_selection_id=selection_id,
+                    direction="PM_YES_vs_BDX_LAY",
+                    pm_price=float(p_yes[i]),
+                    bdx_odds=float(lay[i]),
+                    stake_pm=stake_pm,
+                    lay_stake_or_back_stake=float(lay_stake[i]),
+                    worst_case_profit=float(lay_worst[i]),
+                    profit_if_team_wins=float(lay_win[i]),
+                    profit_if_team_not_win=float(lay_not[i]),
                 )
-
-        if best_back and best_back > 1.01:
-            back_stake = _solve_back_stake_for_balance(
-                stake_pm=stake_pm,
-                p_no=p_no,
-                odds_back=float(best_back),
-                commission=BETDEX_COMMISSION,
-                fee=POLY_FEE,
-                slip=POLY_SLIPPAGE,
             )
-            profit_win = _pm_no_loss(
-                stake_pm, p_no, POLY_FEE, POLY_SLIPPAGE
-            ) + _bdx_back_profit(back_stake, float(best_back), BETDEX_COMMISSION)
-            profit_not = _pm_no_profit(
-                stake_pm, p_no, POLY_FEE, POLY_SLIPPAGE
-            ) + _bdx_back_loss(back_stake)
-            worst = min(profit_win, profit_not)
-
-            if worst >= MIN_EUR_PROFIT:
-                results.append(
-                    ArbResult(
-                        event_uid=event_uid,
-                        team=team,
-                        poly_market_id=pm_id,
-                        betdex_market_id=market_id,
-                        betdex_selection_id=selection_id,
-                        direction="PM_NO_vs_BDX_BACK",
-                        pm_price=p_no,
-                        bdx_odds=float(best_back),
-                        stake_pm=stake_pm,
-                        lay_stake_or_back_stake=back_stake,
-                        worst_case_profit=worst,
-                        profit_if_team_wins=profit_win,
-                        profit_if_team_not_win=profit_not,
-                    )
+        if back_ok[i]:
+            results.append(
+                ArbResult(
+                    event_key=event_key,
+                    team=team,
+                    poly_market_id=pm_id,
+                    betdex_market_id=market_id,
+                    betdex_selection_id=selection_id,
+                    direction="PM_NO_vs_BDX_BACK",
+                    pm_price=float(p_no[i]),
+                    bdx_odds=float(back[i]),
+                    stake_pm=stake_pm,
+                    lay_stake_or_back_stake=float(back_stake[i]),
+                    worst_case_profit=float(back_worst[i]),
+                    profit_if_team_wins=float(back_win[i]),
+                    profit_if_team_not_win=float(back_not[i]),
                 )
+            )
+    return results
+
+
+def _depth_outcome(
+    direction: str, p: float, hedge: float, odds: float
+) -> tuple[float, float, float, float]:
+    """Balanced position that fills ``hedge`` at average ``odds``.
+
+    A multi-level fill pays out exactly like one bet at its volume-weighted
+    odds, so the PM stake is the one that balances that single bet.
+    Returns (stake_pm, hedge, profit_if_win, profit_if_not_win).
+    """
+    commission = BETDEX_COMMISSION
+    if direction == "PM_YES_vs_BDX_LAY":
+        stake_pm = hedge * (odds - commission)
+        solved, profit_win, profit_not = _lay_outcome(stake_pm, p, odds)
+    else:
+        stake_pm = hedge * ((odds - 1.0) * (1.0 - commission) + 1.0)
+        solved, profit_win, profit_not = _back_outcome(stake_pm, p, odds)
+    return stake_pm, solved, profit_win, profit_not
+
+
+def _last_true(lo: int, hi: int, pred) -> int:
+    """Largest i in [lo, hi] with pred(i), assuming pred is true then false; lo - 1 if none."""
+    found = lo - 1
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        if pred(mid):
+            found = mid
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return found
+
+
+def _size_with_depth(result: ArbResult, ladder: Ladder, min_profit: float) -> Optional[ArbResult]:
+    """Largest stake whose worst case stays >= ``min_profit`` given ``ladder``.
+
+    Worst-case profit grows while the marginal level still carries edge and
+    shrinks afterwards, so two binary searches over the cumulative levels
+    find the peak and then the last level still above the threshold. The
+    partial fill into the next level is bisected a fixed number of times.
+    """
+    direction = result.direction
+    p = result.pm_price
+    outcome = _lay_outcome if direction == "PM_YES_vs_BDX_LAY" else _back_outcome
+
+    def worst_at(hedge: float, odds: float) -> float:
+        _stake, _solved, win, lose = _depth_outcome(direction, p, hedge, odds)
+        return min(win, lose)
+
+    def level_has_edge(k: int) -> bool:
+        _solved, win, lose = outcome(1.0, p, ladder.prices[k])
+        return ladder.prices[k] > 1.01 and min(win, lose) > 0
+
+    def level_ok(k: int) -> bool:
+        return worst_at(ladder.cum_size[k], ladder.level_vwap(k)) >= min_profit
+
+    last = len(ladder) - 1
+    peak = _last_true(0, last, level_has_edge)
+    if peak < 0 or not level_ok(peak):
+        return None
+    k = _last_true(peak, last, level_ok)
+
+    hedge = ladder.cum_size[k]
+    if k < last:
+        lo, hi = hedge, ladder.cum_size[k + 1]
+        for _ in range(DEPTH_BISECT_STEPS):
+            mid = (lo + hi) / 2.0
+            if worst_at(mid, ladder.vwap(mid)) >= min_profit:
+                lo = mid
+            else:
+                hi = mid
+        hedge = lo
+
+    odds = ladder.vwap(hedge)
+    stake_pm, solved, profit_win, profit_not = _depth_outcome(direction, p, hedge, odds)
+    return ArbResult(
+        event_key=result.event_key,
+        team=result.team,
+        poly_market_id=result.poly_market_id,
+        betdex_market_id=result.betdex_market_id,
+        betdex_selection_id=result.betdex_selection_id,
+        direction=direction,
+        pm_price=p,
+        bdx_odds=odds,
+        stake_pm=stake_pm,
+        lay_stake_or_back_stake=solved,
+        worst_case_profit=min(profit_win, profit_not),
+        profit_if_team_wins=profit_win,
+        profit_if_team_not_win=profit_not,
+        event_uid=result.event_uid,
+    )
+
+
+def evaluate_pairs(
+    pairs: list[_Pair],
+    *,
+    vectorized: Optional[bool] = None,
+    ladders: Optional[dict[tuple[int, str], tuple[Optional[Ladder], Optional[Ladder]]]] = None,
+) -> list[ArbResult]:
+    """Evaluate matched (PM, exchange) pairs; results are in pair order.
+
+    ``vectorized=None`` picks the NumPy path when NumPy is installed and the
+    batch is at least ``VECTORIZE_MIN_PAIRS`` long.
+
+    ``ladders`` maps (event_key, team) to (back, lay) ladders. Pairs with
+    positive edge at the best price are then re-sized against the ladder
+    instead of using ``BASE_STAKE_EUR``; pairs without one keep the fixed
+    stake.
+    """
+    if vectorized is None:
+        vectorized = np is not None and len(pairs) >= VECTORIZE_MIN_PAIRS
+    if vectorized and np is None:
+        raise RuntimeError("Vectorized evaluation requires numpy")
+    engine = _evaluate_pairs_vectorized if vectorized else _evaluate_pairs_scalar
 
-    print(
-        f"[arb] opportunities found: {len(results)} "
-        f"(threshold: EUR {MIN_EUR_PROFIT:.2f})"
+    if ladders is None:
+        return engine(pairs)
+
+    results: list[ArbResult] = []
+    for result in engine(pairs, min_profit=0.0):
+        back_ladder, lay_ladder = ladders.get((result.event_key, result.team), (None, None))
+        ladder = lay_ladder if result.direction == "PM_YES_vs_BDX_LAY" else back_ladder
+        if ladder:
+            sized = _size_with_depth(result, ladder, MIN_EUR_PROFIT)
+            if sized is not None:
+                results.append(sized)
+        elif result.worst_case_profit >= MIN_EUR_PROFIT:
+            results.append(result)
+    return results
+
+
+_Key = tuple[int, str]
+_PmEntry = tuple[float, float, str]
+_ExEntry = tuple[str, str, Optional[float], Optional[float], Optional[Ladder], Optional[Ladder]]
+
+# Max bind parameters per IN (...) clause when reloading dirty keys.
+_IN_CHUNK = 500
+
+
+def _pair_rows(session, event_keys: Optional[list[int]] = None):
+    """Yield (key, pm_entry, ex_entry) for PM/exchange rows that meet on
+    event_key and team == selection_name. The join runs in SQL, so rows
+    without a counterpart on the other venue are never loaded."""
+    from sqlalchemy import and_, null, select
+
+    from db.models import BinaryMarket, ExchangeMarket
+
+    price_no = getattr(BinaryMarket, "price_no", None)
+    stmt = (
+        select(
+            BinaryMarket.event_key,
+            BinaryMarket.team,
+            BinaryMarket.market_id,
+            BinaryMarket.price,
+            price_no if price_no is not None else null(),
+            ExchangeMarket.market_id,
+            ExchangeMarket.selection_id,
+            ExchangeMarket.best_back_odds,
+            ExchangeMarket.best_lay_odds,
+            ExchangeMarket.back_ladder,
+            ExchangeMarket.lay_ladder,
+        )
+        .join(
+            ExchangeMarket,
+            and_(
+                ExchangeMarket.event_key == BinaryMarket.event_key,
+                ExchangeMarket.selection_name == BinaryMarket.team,
+            ),
+        )
+        .where(BinaryMarket.platform == "polymarket")
+        .where(BinaryMarket.price.isnot(None))
     )
-    for result in results:
-        row = ArbitrageEvaluation(
-            event_uid=result.event_uid,
-            team=result.team,
-            direction=result.direction,
-            poly_market_id=result.poly_market_id,
-            betdex_market_id=result.betdex_market_id,
-            betdex_selection_id=result.betdex_selection_id,
-            pm_price=result.pm_price,
-            bdx_odds=result.bdx_odds,
-            stake_pm=result.stake_pm,
-            hedge_size=result.lay_stake_or_back_stake,
-            worst_case_profit=result.worst_case_profit,
-            profit_if_team_wins=result.profit_if_team_wins,
-            profit_if_team_not_win=result.profit_if_team_not_win,
-            evaluated_at=_utcnow(),
+    if event_keys is not None:
+        stmt = stmt.where(BinaryMarket.event_key.in_(event_keys))
+
+    for (
+        event_key,
+        team,
+        pm_id,
+        p_yes,
+        p_no,
+        market_id,
+        selection_id,
+        best_back,
+        best_lay,
+        back_ladder,
+        lay_ladder,
+    ) in session.execute(stmt):
+        if event_key is None or not team:
+            continue
+        p_yes = float(p_yes)
+        if p_no is None:
+            p_no = 1.0 - p_yes
+        yield (
+            (event_key, team),
+            (p_yes, float(p_no), pm_id),
+            (
+                market_id,
+                selection_id,
+                best_back,
+                best_lay,
+                Ladder.decode(back_ladder),
+                Ladder.decode(lay_ladder),
+            ),
+        )
+
+
+def _evaluation_rows(results: list[ArbResult]) -> list[dict]:
+    evaluated_at = _utcnow()
+    return [
+        {
+            "event_uid": result.event_uid,
+            "team": result.team,
+            "direction": result.direction,
+            "poly_market_id": result.poly_market_id,
+            "betdex_market_id": result.betdex_market_id,
+            "betdex_selection_id": result.betdex_selection_id,
+            "pm_price": result.pm_price,
+            "bdx_odds": result.bdx_odds,
+            "stake_pm": result.stake_pm,
+            "hedge_size": result.lay_stake_or_back_stake,
+            "worst_case_profit": result.worst_case_profit,
+            "profit_if_team_wins": result.profit_if_team_wins,
+            "profit_if_team_not_win": result.profit_if_team_not_win,
+            "evaluated_at": evaluated_at,
+        }
+        for result in results
+    ]
+
+
+def _persist_results(
+    session,
+    results: list[ArbResult],
+    *,
+    chunk_size: int = PERSIST_CHUNK_SIZE,
+    writer=None,
+) -> None:
+    from db.bulk import bulk_insert
+    from db.models import ArbitrageEvaluation
+
+    # event_uid is required on audit rows; an event deleted or not yet
+    # visible to this session leaves it unset.
+    orphans = [r for r in results if r.event_uid is None]
+    if orphans:
+        logger.warning(
+            "Skipping evaluations without an event_uid",
+            extra={"count": len(orphans), "event_keys": sorted({r.event_key for r in orphans})[:10]},
         )
-        session.add(row)
+        results = [r for r in results if r.event_uid is not None]
+    if not results:
+        return
+    rows = _evaluation_rows(results)
+    table = ArbitrageEvaluation.__table__
+    if writer is not None:
+        writer.insert(table, rows, chunk_size)
+        return
+    bulk_insert(session, table, rows, chunk_size)
     session.commit()
-    return sorted(results, key=lambda r: r.worst_case_profit, reverse=True)
+
+
+class ArbEvaluator:
+    """Evaluator that keeps its indexes between cycles.
+
+    The first ``evaluate`` call loads every matched pair. Later calls may pass the
+    (event_key, team) keys reported by the ingestors; only those rows are
+    reloaded and only those pairs are re-solved and persisted. Opportunities
+    for untouched keys are carried over from earlier cycles.
+
+    Pairs are keyed by the integer event_key; the hex event_uid is looked
+    up only for new opportunities, for output and the audit rows.
+
+    Results are written with chunked Core inserts. Pass a
+    ``db.writer.BackgroundWriter`` to hand the writes off and return
+    without waiting on disk.
+
+    With a ``quotes.store.QuoteStore`` the evaluator reads quotes from
+    memory instead of the database, and ``changed_keys=None`` after the
+    first cycle means "whatever the store has marked dirty".
+    """
+
+    def __init__(
+        self,
+        *,
+        vectorized: Optional[bool] = None,
+        depth_sizing: bool = DEPTH_SIZING,
+        chunk_size: int = PERSIST_CHUNK_SIZE,
+        writer=None,
+        quote_store=None,
+    ):
+        self.vectorized = vectorized
+        self.depth_sizing = depth_sizing
+        self.chunk_size = chunk_size
+        self.writer = writer
+        self.quote_store = quote_store
+        self.pm_index: dict[_Key, _PmEntry] = {}
+        self.ex_index: dict[_Key, _ExEntry] = {}
+        self._results: dict[_Key, list[ArbResult]] = {}
+        self._pm_events: Counter[int] = Counter()
+        self._ex_events: Counter[int] = Counter()
+        self._overlap: set[int] = set()
+        self._event_uids: dict[int, str] = {}
+        self._loaded = False
+
+    def evaluate(
+        self, session, changed_keys: Optional[Iterable[_Key]] = None
+    ) -> list[ArbResult]:
+        if self.quote_store is not None:
+            if not self._loaded:
+                self.quote_store.drain_dirty()
+                dirty = self._load_store(None)
+            else:
+                if changed_keys is None:
+                    changed_keys = self.quote_store.drain_dirty()
+                dirty = self._load_store(set(changed_keys))
+        elif changed_keys is None or not self._loaded:
+            dirty = self._load_all(session)
+        else:
+            dirty = self._load_keys(session, set(changed_keys))
+
+        print(
+            f"[arb] matched pairs: {len(self.pm_index)} | "
+            f"overlapping event_uids: {len(self._overlap)} | re-solved: {len(dirty)}"
+        )
+
+        pairs: list[_Pair] = []
+        ladders = {} if self.depth_sizing else None
+        for key in dirty:
+            self._results.pop(key, None)
+            pm = self.pm_index.get(key)
+            ex = self.ex_index.get(key)
+            if pm is None or ex is None:
+                continue
+            event_key, team = key
+            p_yes, p_no, pm_id = pm
+            market_id, selection_id, best_back, best_lay, back_ladder, lay_ladder = ex
+            pairs.append(
+                (event_key, team, pm_id, p_yes, p_no, market_id, selection_id, best_back, best_lay)
+            )
+            if ladders is not None:
+                ladders[key] = (back_ladder, lay_ladder)
+
+        fresh = evaluate_pairs(pairs, vectorized=self.vectorized, ladders=ladders)
+        self._attach_uids(session, fresh)
+        for result in fresh:
+            self._results.setdefault((result.event_key, result.team), []).append(result)
+
+        results = [r for bucket in self._results.values() for r in bucket]
+        print(
+            f"[arb] opportunities found: {len(results)} "
+            f"(threshold: EUR {MIN_EUR_PROFIT:.2f})"
+        )
+        _persist_results(session, fresh, chunk_size=self.chunk_size, writer=self.writer)
+        return sorted(results, key=lambda r: r.worst_case_profit, reverse=True)
+
+    def _load_all(self, session) -> list[_Key]:
+        self.pm_index.clear()
+        self.ex_index.clear()
+        self._results.clear()
+        self._pm_events.clear()
+        self._ex_events.clear()
+        self._overlap.clear()
+
+        for key, pm, ex in _pair_rows(session):
+            self._set(self.pm_index, self._pm_events, key, pm)
+            self._set(self.ex_index, self._ex_events, key, ex)
+
+        self._loaded = True
+        return list(self.pm_index)
+
+    def _load_store(self, keys: Optional[set[_Key]]) -> list[_Key]:
+        if keys is None:
+            self.pm_index.clear()
+            self.ex_index.clear()
+            self._results.clear()
+            self._pm_events.clear()
+            self._ex_events.clear()
+            self._overlap.clear()
+            self._loaded = True
+            dirty = []
+            for key, quote in self.quote_store.items():
+                pm, ex = quote.pm_entry(), quote.ex_entry()
+                if pm is not None and ex is not None:
+                    self._set(self.pm_index, self._pm_events, key, pm)
+                    self._set(self.ex_index, self._ex_events, key, ex)
+                    dirty.append(key)
+            return dirty
+
+        for key in keys:
+            quote = self.quote_store.get(key)
+            pm = quote.pm_entry() if quote is not None else None
+            ex = quote.ex_entry() if quote is not None else None
+            if pm is None or ex is None:
+                pm = ex = None
+            self._set(self.pm_index, self._pm_events, key, pm)
+            self._set(self.ex_index, self._ex_events, key, ex)
+        return list(keys)
+
+    def _load_keys(self, session, keys: set[_Key]) -> list[_Key]:
+        if not keys:
+            return []
+
+        event_keys = sorted({event_key for (event_key, _team) in keys})
+        pm_fresh: dict[_Key, _PmEntry] = {}
+        ex_fresh: dict[_Key, _ExEntry] = {}
+        for start in range(0, len(event_keys), _IN_CHUNK):
+            for key, pm, ex in _pair_rows(session, event_keys[start : start + _IN_CHUNK]):
+                if key in keys:
+                    pm_fresh[key] = pm
+                    ex_fresh[key] = ex
+
+        for key in keys:
+            self._set(self.pm_index, self._pm_events, key, pm_fresh.get(key))
+            self._set(self.ex_index, self._ex_events, key, ex_fresh.get(key))
+        return list(keys)
+
+    def _attach_uids(self, session, results: list[ArbResult]) -> None:
+        from sqlalchemy import select
+
+        from db.models import Event
+
+        missing = sorted({r.event_key for r in results} - self._event_uids.keys())
+        for start in range(0, len(missing), _IN_CHUNK):
+            stmt = select(Event.event_key, Event.event_uid).where(
+                Event.event_key.in_(missing[start : start + _IN_CHUNK])
+            )
+            self._event_uids.update((key, uid) for key, uid in session.execute(stmt))
+        for result in results:
+            result.event_uid = self._event_uids.get(result.event_key)
+
+    def _set(self, index: dict, event_counts: Counter, key: _Key, entry) -> None:
+        event_key = key[0]
+        had = key in index
+        if entry is None:
+            if not had:
+                return
+            del index[key]
+            event_counts[event_key] -= 1
+            if event_counts[event_key] <= 0:
+                del event_counts[event_key]
+        else:
+            index[key] = entry
+            if had:
+                return
+            event_counts[event_key] += 1
+
+        if event_key in self._pm_events and event_key in self._ex_events:
+            self._overlap.add(event_key)
+        else:
+            self._overlap.discard(event_key)
+
+
+def evaluate_arbs(
+    session, *, vectorized: Optional[bool] = None, writer=None, quote_store=None
+) -> list[ArbResult]:
+    return ArbEvaluator(
+        vectorized=vectorized, writer=writer, quote_store=quote_store
+    ).evaluate(session)
@@ -0,0 +1,100 @@
+"""Alias index build and lookup speed on a synthetic 50k-alias table.
+
+Usage: python -m bench.alias_index [aliases] [queries]
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import sys
+import time
+
+from config.settings import ALIAS_FUZZY_MARGIN, ALIAS_FUZZY_MIN_SCORE
+from normalization.teams import TeamNormalizer
+
+_SYLLABLES = [
+    onset + vowel + coda
+    for onset in ("b", "br", "c", "ch", "d", "f", "g", "gr", "h", "j", "k", "l", "m", "n", "p", "r", "s", "st", "t", "v", "w", "z")
+    for vowel in ("a", "e", "i", "o", "u", "ie", "ou")
+    for coda in ("", "", "n", "r", "s", "l", "ck")
+]
+_ACCENTS = str.maketrans({"a": "á", "e": "é", "o": "ö", "u": "ü"})
+
+
+def _club(rng: random.Random) -> str:
+    word = "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(3, 4)))
+    second = "".join(rng.choice(_SYLLABLES) for _ in range(2))
+    return f"{word.capitalize()} {second.capitalize()}"
+
+
+def _typo(rng: random.Random, name: str) -> str:
+    i = rng.randrange(1, len(name) - 1)
+    return name[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + name[i + 1 :]
+
+
+def _mapping(n_aliases: int, rng: random.Random) -> dict[str, str]:
+    mapping: dict[str, str] = {}
+    clubs: set[str] = set()
+    while len(mapping) < n_aliases:
+        club = _club(rng)
+        if club in clubs:
+            continue
+        clubs.add(club)
+        for alias in (club, f"{club} FC", club.upper(), f"FC {club.split()[0]} {club.split()[1]}", club.split()[0]):
+            mapping.setdefault(alias, club)
+    return mapping
+
+
+def _timed(label: str, normalizer: TeamNormalizer, queries: list[tuple[str, str | None]]) -> None:
+    start = time.perf_counter()
+    correct = wrong = missed = 0
+    for raw, expected in queries:
+        try:
+            canonical = normalizer.normalize(raw)
+        except KeyError:
+            missed += 1
+            continue
+        if expected is not None and canonical == expected:
+            correct += 1
+        else:
+            wrong += 1
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<14} {len(queries) / elapsed:>10,.0f} lookups/s  "
+        f"correct={correct} wrong={wrong} none={missed}"
+    )
+
+
+def main() -> None:
+    n_aliases = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    n_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    rng = random.Random(11)
+    mapping = _mapping(n_aliases, rng)
+
+    start = time.perf_counter()
+    normalizer = TeamNormalizer(
+        mapping, fuzzy=True, min_score=ALIAS_FUZZY_MIN_SCORE, margin=ALIAS_FUZZY_MARGIN
+    )
+    print(
+        f"built {len(mapping)} aliases -> {len(normalizer.index)} keys "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+    logging.getLogger("normalization.alias_index").setLevel(logging.WARNING)
+
+    aliases = list(mapping.items())
+    sample = [rng.choice(aliases) for _ in range(n_queries)]
+    exact = [(alias, canonical) for alias, canonical in sample]
+    folded = [(f"{alias.lower().translate(_ACCENTS)} f.c.", canonical) for alias, canonical in sample]
+    typos = [(_typo(rng, canonical), canonical) for _alias, canonical in sample]
+    unknown = [(_club(rng) + " Rovers", None) for _ in range(n_queries)]
+
+    for label, queries in (("exact", exact), ("folded", folded), ("unknown", unknown), ("typo", typos)):
+        normalizer.index.cache_clear()
+        _timed(label, normalizer, queries)
+    _timed("typo (cached)", normalizer, typos)
+    print(f"cache: {normalizer.index.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Serial vs concurrent exchange fetch against the mock adapter.
+
+Usage: python -m bench.exchange_fetch [events] [latency_seconds]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from types import SimpleNamespace
+
+from exchanges.betdex_mock_adapter import MockBetDEXAdapter
+from ingest.exchange_markets import fetch_market_books
+
+
+def main() -> None:
+    n_events = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+
+    adapter = MockBetDEXAdapter(latency=latency)
+    provider_ids = [ev["id"] for ev in adapter.list_events()]
+    event_rows = [
+        SimpleNamespace(
+            event_key=i,
+            betdex_id=provider_ids[i % len(provider_ids)],
+            betfair_id=None,
+        )
+        for i in range(n_events)
+    ]
+
+    for workers in (1, 4, 8):
+        start = time.perf_counter()
+        books = fetch_market_books(adapter, event_rows, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        print(
+            f"workers={workers} events={n_events} latency={latency:.3f}s "
+            f"books={len(books)} elapsed={elapsed:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
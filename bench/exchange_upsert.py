@@ -0,0 +1,75 @@
+"""Per-row ORM writes vs bulk upsert for exchange runner quotes.
+
+Usage: python -m bench.exchange_upsert [runners]
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+from datetime import datetime, timezone
+
+from db.models import ExchangeMarket
+from db.session import create_engine_and_session
+from ingest.exchange_markets import write_exchange_quotes
+
+
+def _synthetic_rows(n_runners: int, seed: int) -> dict[str, dict]:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    rows: dict[str, dict] = {}
+    for i in range(n_runners):
+        market, selection = divmod(i, 3)
+        back = round(rng.uniform(1.2, 8.0), 2)
+        row_id = f"bench:{market}:{selection}"
+        rows[row_id] = {
+            "id": row_id,
+            "platform": "bench",
+            "event_key": market,
+            "market_id": str(market),
+            "market_name": "Match Odds",
+            "selection_id": str(selection),
+            "selection_name": f"team-{selection}",
+            "best_back_odds": back,
+            "best_lay_odds": back + 0.02,
+            "back_ladder": f"{back!r}@100.0",
+            "lay_ladder": f"{back + 0.02!r}@100.0",
+            "last_updated": now,
+        }
+    return rows
+
+
+def _orm_write(session, rows: dict[str, dict]) -> None:
+    # The pre-bulk path: one SELECT per runner, then ORM add/update.
+    for row_id, data in rows.items():
+        row = session.query(ExchangeMarket).filter(ExchangeMarket.id == row_id).one_or_none()
+        if row is None:
+            row = ExchangeMarket(**data)
+            session.add(row)
+            continue
+        for column in ("best_back_odds", "best_lay_odds", "back_ladder", "lay_ladder", "last_updated"):
+            setattr(row, column, data[column])
+
+
+def _timed(label: str, session_local, write, rows) -> None:
+    session = session_local()
+    start = time.perf_counter()
+    write(session, rows)
+    session.commit()
+    elapsed = time.perf_counter() - start
+    session.close()
+    print(f"{label:<14} runners={len(rows)} elapsed={elapsed:.3f}s rows/sec={len(rows) / elapsed:,.0f}")
+
+
+def main() -> None:
+    n_runners = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+
+    for label, write in (("orm-per-row", _orm_write), ("bulk-upsert", write_exchange_quotes)):
+        _engine, session_local = create_engine_and_session("sqlite://")
+        _timed(f"{label} ins", session_local, write, _synthetic_rows(n_runners, seed=1))
+        _timed(f"{label} upd", session_local, write, _synthetic_rows(n_runners, seed=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""BetDEX REST client over the shared transport against a local HTTP stand-in.
+
+The stand-in serves the mock adapter's data gzipped, and can fail a share of
+requests with 503 to exercise retries.
+
+Usage: python -m bench.http_transport [events] [failure_rate]
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+from exchanges.betdex_adapter import BetDEXAdapter
+from exchanges.betdex_mock_adapter import MockBetDEXAdapter
+from ingest.exchange_markets import fetch_market_books
+from utils.http import HttpTransport
+from utils.ratelimit import TokenBucket
+
+
+class StandInServer:
+    """Serves /events, /events/<id>/markets and /markets/<id>/book on localhost."""
+
+    def __init__(self, failure_rate: float = 0.0, seed: int = 7):
+        self.source = MockBetDEXAdapter()
+        self.failure_rate = failure_rate
+        self.connections = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandInServer":
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _route(self, path: str):
+        parts = path.strip("/").split("/")
+        if parts == ["events"]:
+            return self.source.list_events()
+        if len(parts) == 3 and parts[0] == "events" and parts[2] == "markets":
+            return self.source.list_markets(parts[1])
+        if len(parts) == 3 and parts[0] == "markets" and parts[2] == "book":
+            return self.source.list_market_book(parts[1])
+        return None
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            return self._rng.random() < self.failure_rate
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_GET(self):
+                if server._should_fail():
+                    self._send(503, b"", {"Retry-After": "0"})
+                    return
+                payload = server._route(self.path)
+                if payload is None:
+                    self._send(404, b"")
+                    return
+                body = json.dumps(payload).encode()
+                headers = {"Content-Type": "application/json"}
+                if "gzip" in self.headers.get("Accept-Encoding", ""):
+                    body = gzip.compress(body)
+                    headers["Content-Encoding"] = "gzip"
+                self._send(200, body, headers)
+
+            def _send(self, status: int, body: bytes, headers: dict | None = None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def _run(label: str, adapter, event_rows, server: StandInServer) -> None:
+    before = server.connections
+    start = time.perf_counter()
+    books = fetch_market_books(adapter, event_rows, max_workers=8)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label}: books={len(books)} elapsed={elapsed:.2f}s "
+        f"connections={server.connections - before}"
+    )
+
+
+def main() -> None:
+    n_events = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    failure_rate = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+
+    server = StandInServer(failure_rate=failure_rate).start()
+    try:
+        provider_ids = [ev["id"] for ev in MockBetDEXAdapter().list_events()]
+        event_rows = [
+            SimpleNamespace(
+                event_key=i,
+                betdex_id=provider_ids[i % len(provider_ids)],
+                betfair_id=None,
+            )
+            for i in range(n_events)
+        ]
+
+        transport = HttpTransport(pool_size=8)
+        limiter = TokenBucket(1000.0, 50.0)
+        adapter = BetDEXAdapter(server.url, transport=transport, limiter=limiter)
+        _run("shared transport", adapter, event_rows, server)
+        for host, stats in transport.stats().items():
+            print(f"  {host}: {stats}")
+        print(f"  limiter: {limiter.stats()}")
+        transport.close()
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
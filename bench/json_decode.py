@@ -0,0 +1,122 @@
+"""Venue payload decoding: resp.json() + per-field parsing vs utils.jsoncodec.
+
+Decodes the bodies of a replay recording (see replay/), or synthetic gamma
+/markets pages and Betfair listMarketBook responses when none is given.
+
+Usage: python -m bench.json_decode [recording.jsonl.gz] [rounds]
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import sys
+import time
+
+import utils.jsoncodec as jsoncodec
+from replay.recorder import read_records
+
+
+def _gamma_page(rng: random.Random, size: int = 500) -> bytes:
+    markets = []
+    for i in range(size):
+        yes = rng.random()
+        markets.append(
+            {
+                "id": str(500000 + i),
+                "question": f"Will Team {i} win?",
+                "outcomes": json.dumps(["Yes", "No"]),
+                "outcomePrices": json.dumps([f"{yes:.3f}", f"{1 - yes:.3f}"]),
+                "liquidityNum": rng.uniform(100, 50000),
+                "category": "Sports",
+                "events": [{"startDate": "2025-01-10T20:00:00Z", "league": "Premier League"}],
+            }
+        )
+    return json.dumps(markets).encode("utf-8")
+
+
+def _market_book(rng: random.Random, markets: int = 40) -> bytes:
+    def ladder(base: float) -> list[dict]:
+        return [
+            {"price": round(base + 0.02 * level, 2), "size": round(rng.uniform(2, 500), 2)}
+            for level in range(3)
+        ]
+
+    books = [
+        {
+            "marketId": f"1.{200000000 + m}",
+            "runners": [
+                {
+                    "selectionId": 1000 + r,
+                    "ex": {
+                        "availableToBack": ladder(rng.uniform(1.5, 6.0)),
+                        "availableToLay": ladder(rng.uniform(1.5, 6.0)),
+                    },
+                }
+                for r in range(3)
+            ],
+        }
+        for m in range(markets)
+    ]
+    return json.dumps([{"jsonrpc": "2.0", "id": 1, "result": books}]).encode("utf-8")
+
+
+def _bodies(path: str | None) -> list[bytes]:
+    if path:
+        return [record["body"].encode("utf-8") for record in read_records(path) if record["body"]]
+    rng = random.Random(3)
+    return [_gamma_page(rng) for _ in range(10)] + [_market_book(rng) for _ in range(40)]
+
+
+def _baseline(body: bytes) -> None:
+    payload = json.loads(body.decode("utf-8"))
+    if isinstance(payload, list):
+        for item in payload:
+            if isinstance(item, dict):
+                for field in ("outcomes", "outcomePrices"):
+                    value = item.get(field)
+                    if isinstance(value, str):
+                        json.loads(value)
+
+
+def _codec(body: bytes) -> None:
+    payload = jsoncodec.loads(body)
+    if isinstance(payload, list):
+        jsoncodec.parse_json_lists(
+            item.get(field)
+            for item in payload
+            if isinstance(item, dict)
+            for field in ("outcomes", "outcomePrices")
+        )
+
+
+def _time(label: str, fn, bodies: list[bytes], rounds: int, total_bytes: int) -> None:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for body in bodies:
+            fn(body)
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<22} {best * 1000:8.2f}ms  {total_bytes / best / 1e6:7.1f} MB/s")
+
+
+def main() -> None:
+    path = sys.argv[1] if len(sys.argv) > 1 else None
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    bodies = _bodies(path)
+    total_bytes = sum(len(body) for body in bodies)
+    print(f"{len(bodies)} payloads, {total_bytes / 1e6:.2f} MB")
+
+    _time("baseline json", _baseline, bodies, rounds, total_bytes)
+    _time(f"jsoncodec {jsoncodec.BACKEND}", _codec, bodies, rounds, total_bytes)
+    if jsoncodec.orjson is not None:
+        fast, jsoncodec.orjson = jsoncodec.orjson, None
+        try:
+            _time("jsoncodec json", _codec, bodies, rounds, total_bytes)
+        finally:
+            jsoncodec.orjson = fast
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Replay a recorded BetDEX ingest cycle and time the ingest/evaluate stages.
+
+Without a recording, one cycle is first recorded from the local HTTP
+stand-in in bench.http_transport.
+
+Usage: python -m bench.replay_cycle [recording.jsonl.gz] [base_url] [speed]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+
+from arb_evaluator import evaluate_arbs
+from bench.http_transport import StandInServer
+from config.loaders import load_league_normalizer, load_team_normalizer
+from db.models import Event
+from db.session import create_engine_and_session
+from exchanges.betdex_adapter import BetDEXAdapter
+from ingest.event_resolution import PayloadHashCache
+from ingest.events import ingest_events
+from ingest.exchange_markets import ingest_exchange_markets
+from replay.recorder import TrafficRecorder
+from replay.transport import ReplayTransport
+from utils.http import HttpTransport
+from utils.ratelimit import TokenBucket
+
+
+def _cycle(adapter, label: str) -> None:
+    _engine, session_local = create_engine_and_session("sqlite://")
+    session = session_local()
+    timings = {}
+
+    start = time.perf_counter()
+    ingest_events(
+        session=session,
+        adapter=adapter,
+        team_normalizer=load_team_normalizer(),
+        league_normalizer=load_league_normalizer(),
+        cache=PayloadHashCache(),
+    )
+    timings["events"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    event_rows = session.query(Event).filter(Event.betdex_id.isnot(None)).all()
+    ingest_exchange_markets(session, adapter, event_rows)
+    timings["books"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    evaluate_arbs(session)
+    timings["evaluate"] = time.perf_counter() - start
+    session.close()
+
+    print(f"{label}: " + " ".join(f"{stage}={seconds * 1000:.1f}ms" for stage, seconds in timings.items()))
+
+
+def _record_standin(path: str) -> str:
+    server = StandInServer().start()
+    try:
+        transport = HttpTransport(recorder=TrafficRecorder(path))
+        adapter = BetDEXAdapter(server.url, transport=transport, limiter=TokenBucket(1000.0, 50.0))
+        _cycle(adapter, "record (stand-in)")
+        transport.close()
+    finally:
+        server.close()
+    return server.url
+
+
+def main() -> None:
+    path = sys.argv[1] if len(sys.argv) > 1 else None
+    base_url = sys.argv[2] if len(sys.argv) > 2 else None
+    speed = float(sys.argv[3]) if len(sys.argv) > 3 else 1.0
+
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(prefix="arb-replay-"), "betdex.jsonl.gz")
+        base_url = _record_standin(path)
+        print(f"recorded {path} ({os.path.getsize(path)} bytes)")
+    if base_url is None:
+        raise SystemExit("base_url is required when replaying an existing recording")
+
+    unlimited = TokenBucket(1e9, 1e9)
+    for label, replay_speed in (("replay fast", None), (f"replay x{speed:g}", speed)):
+        transport = ReplayTransport(path, speed=replay_speed)
+        adapter = BetDEXAdapter(base_url, transport=transport, limiter=unlimited)
+        _cycle(adapter, label)
+        print(f"  {transport.stats()['replay']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Quote-to-detection latency: streamed book deltas vs kickoff-tier book polling.
+
+Seeds a database and QuoteStore from the mock venues, then streams synthetic
+deltas from the local stand-in server (streaming.server). Each delta is
+timed from the server's send timestamp to the end of the evaluation that
+sees it. Polling latency uses the same update times: an update waits for
+the next poll at ``poll_seconds`` and then one measured poll-and-evaluate
+cycle.
+
+Usage: python -m bench.stream_latency [updates] [poll_seconds] [venue_latency]
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import queue
+import random
+import sys
+import time
+
+from arb_evaluator import ArbEvaluator
+from config.loaders import load_league_normalizer, load_team_normalizer
+from db.models import Event
+from db.session import create_engine_and_session
+from exchanges.betdex_mock_adapter import MockBetDEXAdapter
+from ingest.event_resolution import PayloadHashCache
+from ingest.events import ingest_events
+from ingest.exchange_markets import ingest_exchange_markets
+from ingestion.polymarket import PolymarketIngestor
+from polymarket.mock_client import MockPolymarketClient
+from quotes.store import QuoteStore
+from scheduling.priorities import LIVE_BOOK_POLL_SECONDS
+from streaming.cache import OrderBookCache
+from streaming.client import StreamClient
+from streaming.ingest import publish_stream_quotes, register_runners
+from streaming.server import StreamServer, synthetic_messages
+
+
+def _percentiles(label: str, values: list[float]) -> None:
+    values = sorted(values)
+    pick = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+    print(
+        f"{label:<8} n={len(values):<6} p50={pick(0.5):9.2f}ms p90={pick(0.9):9.2f}ms "
+        f"p99={pick(0.99):9.2f}ms max={values[-1]:9.2f}ms"
+    )
+
+
+def main() -> None:
+    updates = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    poll_seconds = float(sys.argv[2]) if len(sys.argv) > 2 else LIVE_BOOK_POLL_SECONDS
+    venue_latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+
+    _engine, session_local = create_engine_and_session("sqlite://")
+    session = session_local()
+    teams, leagues = load_team_normalizer(), load_league_normalizer()
+    adapter = MockBetDEXAdapter(latency=venue_latency)
+    store = QuoteStore()
+    ingest_events(
+        session=session,
+        adapter=adapter,
+        team_normalizer=teams,
+        league_normalizer=leagues,
+        cache=PayloadHashCache(),
+    )
+    event_rows = session.query(Event).filter(Event.betdex_id.isnot(None)).all()
+    ingest_exchange_markets(session, adapter, event_rows, quote_store=store)
+    PolymarketIngestor(MockPolymarketClient(), teams, leagues, quote_store=store).ingest(session)
+    evaluator = ArbEvaluator(quote_store=store)
+    quiet = io.StringIO()
+    with contextlib.redirect_stdout(quiet):
+        evaluator.evaluate(session)
+
+    # Polling: one full book poll and evaluation, timed.
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(quiet):
+        ingest_exchange_markets(session, adapter, event_rows, quote_store=store)
+        evaluator.evaluate(session)
+    poll_cycle_ms = (time.perf_counter() - start) * 1000.0
+
+    # Streaming: deltas go cache -> QuoteStore -> evaluator as they arrive.
+    arrivals: queue.Queue = queue.Queue()
+    cache = OrderBookCache(
+        on_change=lambda _keys: arrivals.put((time.perf_counter(), cache.last_latency_ms))
+    )
+    market_ids = register_runners(session, cache, adapter.platform)
+    server = StreamServer(synthetic_messages(adapter._books, updates=updates, interval=0.002)).start()
+    host, port = server.address
+    client = StreamClient(host, port, cache, market_ids).start()
+
+    streamed: list[float] = []
+    seen_at: list[float] = []
+    try:
+        while not (client.done.is_set() and arrivals.empty()):
+            try:
+                batch = [arrivals.get(timeout=0.2)]
+            except queue.Empty:
+                continue
+            while not arrivals.empty():
+                batch.append(arrivals.get_nowait())
+            publish_stream_quotes(cache, store)
+            with contextlib.redirect_stdout(quiet):
+                evaluator.evaluate(session)
+            done = time.perf_counter()
+            for arrived, wire_ms in batch:
+                streamed.append((wire_ms or 0.0) + (done - arrived) * 1000.0)
+                seen_at.append(arrived)
+    finally:
+        client.stop()
+        server.stop()
+
+    phase = random.Random(3).uniform(0.0, poll_seconds)
+    polled = [
+        (poll_seconds - (t - phase) % poll_seconds) * 1000.0 + poll_cycle_ms for t in seen_at
+    ]
+
+    print(
+        f"updates={len(streamed)} poll_interval={poll_seconds:g}s "
+        f"venue_latency={venue_latency * 1000:.0f}ms poll_cycle={poll_cycle_ms:.1f}ms"
+    )
+    _percentiles("stream", streamed)
+    _percentiles("polling", polled)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,34 @@
 """Config loaders for normalization tables."""
 
 import json
+from functools import lru_cache
 from pathlib import Path
 
+from config.settings import ALIAS_FUZZY, ALIAS_FUZZY_MARGIN, ALIAS_FUZZY_MIN_SCORE
 from normalization.leagues import LeagueNormalizer
 from normalization.teams import TeamNormalizer
 
 BASE_DIR = Path(__file__).resolve().parent
 
 
+# Loaders return one shared instance per process, so every ingestor reuses
+# the same compiled index and its lookup cache. Fuzzy matches are gated by
+# the ALIAS_FUZZY_* settings.
+@lru_cache(maxsize=None)
 def load_team_normalizer() -> TeamNormalizer:
     path = BASE_DIR / "teams.json"
     with open(path, "r", encoding="utf-8") as handle:
         mapping = json.load(handle)
-    return TeamNormalizer(mapping)
+    return TeamNormalizer(
+        mapping, fuzzy=ALIAS_FUZZY, min_score=ALIAS_FUZZY_MIN_SCORE, margin=ALIAS_FUZZY_MARGIN
+    )
 
 
+@lru_cache(maxsize=None)
 def load_league_normalizer() -> LeagueNormalizer:
     path = BASE_DIR / "leagues.json"
     with open(path, "r", encoding="utf-8") as handle:
         mapping = json.load(handle)
-    return LeagueNormalizer(mapping)
+    return LeagueNormalizer(
+        mapping, fuzzy=ALIAS_FUZZY, min_score=ALIAS_FUZZY_MIN_SCORE, margin=ALIAS_FUZZY_MARGIN
+    )
@@ -11,6 +11,53 @@ ENABLE_POLYMARKET = os.getenv("ENABLE_POLYMARKET", "0") == "1"
 ENABLE_BETDEX_MOCK = os.getenv("ENABLE_BETDEX_MOCK", "0") == "1"
 ENABLE_POLYMARKET_MOCK = os.getenv("ENABLE_POLYMARKET_MOCK", "0") == "1"
 
+# Keep running and poll on a schedule instead of one ingest/evaluate pass.
+RUN_DAEMON = os.getenv("ARB_DAEMON", "0") == "1"
+
+# Daemon mode only: take exchange books from this stream endpoint
+# ("host:port", e.g. the stand-in ``python -m streaming.server``) instead of
+# polling them.
+STREAM_ADDRESS = os.getenv("ARB_STREAM") or None
+
+# Move quotes between stages in memory; the database becomes an async sink.
+ENABLE_QUOTE_STORE = os.getenv("ENABLE_QUOTE_STORE", "0") == "1"
+
+# Upper bound on concurrent exchange requests per ingest cycle; adapters
+# may declare a lower per-venue max_concurrency.
+EXCHANGE_MAX_CONCURRENCY = int(os.getenv("EXCHANGE_MAX_CONCURRENCY", "8"))
+
+# Polymarket /markets pages requested in parallel while streaming.
+POLYMARKET_PAGE_CONCURRENCY = int(os.getenv("POLYMARKET_PAGE_CONCURRENCY", "4"))
+
+# Betfair catalogue fetches only ask for events starting within this many
+# hours (events already kicked off within the last match window included).
+BETFAIR_EVENT_HORIZON_HOURS = float(os.getenv("BETFAIR_EVENT_HORIZON_HOURS", "72"))
+
+# Venues' kickoff times for one fixture may differ by up to this much and
+# still resolve to the same event.
+EVENT_KICKOFF_TOLERANCE_MINUTES = float(os.getenv("EVENT_KICKOFF_TOLERANCE_MINUTES", "60"))
+
+# Ingest accepts a fuzzy team/league alias match only when it scores at
+# least ALIAS_FUZZY_MIN_SCORE and beats the runner-up canonical by
+# ALIAS_FUZZY_MARGIN; set ALIAS_FUZZY=0 for exact (folded) aliases only.
+ALIAS_FUZZY = os.getenv("ALIAS_FUZZY", "1") == "1"
+ALIAS_FUZZY_MIN_SCORE = float(os.getenv("ALIAS_FUZZY_MIN_SCORE", "0.8"))
+ALIAS_FUZZY_MARGIN = float(os.getenv("ALIAS_FUZZY_MARGIN", "0.1"))
+
+# Shared HTTP transport: connections kept per host, request timeout in
+# seconds, and retries for idempotent requests.
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+
+# Append every venue HTTP response to this .jsonl.gz file (see replay/).
+RECORD_TRAFFIC_PATH = os.getenv("ARB_RECORD_TRAFFIC") or None
+
+# Serve venue HTTP calls from a recording instead of the network. Speed 0
+# answers immediately; 1 reproduces the recorded timing, 2 runs twice as fast.
+REPLAY_TRAFFIC_PATH = os.getenv("ARB_REPLAY_TRAFFIC") or None
+REPLAY_SPEED = float(os.getenv("ARB_REPLAY_SPEED", "0"))
+
 
 @dataclass(frozen=True)
 class Settings:
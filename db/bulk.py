@@ -0,0 +1,58 @@
+"""Bulk write helpers (SQLAlchemy Core, no unit of work)."""
+
+from __future__ import annotations
+
+from typing import Iterator, Sequence
+
+from sqlalchemy import insert
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def chunked(rows: Sequence, size: int) -> Iterator[Sequence]:
+    if size <= 0:
+        raise ValueError("chunk size must be positive")
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+def bulk_insert(session, table, rows: Sequence[dict], chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Insert ``rows`` into ``table`` as executemany batches; does not commit."""
+    for chunk in chunked(rows, chunk_size):
+        session.execute(insert(table), list(chunk))
+    return len(rows)
+
+
+def _dialect_insert(session):
+    name = session.get_bind().dialect.name
+    if name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        raise NotImplementedError(f"Bulk upsert not supported for dialect {name!r}")
+    return dialect_insert
+
+
+def bulk_upsert(
+    session,
+    table,
+    rows: Sequence[dict],
+    *,
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """INSERT ... ON CONFLICT DO UPDATE for SQLite and PostgreSQL; does not commit.
+
+    Rows in one call must share the same keys and must not repeat a
+    conflict key (PostgreSQL rejects touching a row twice per statement).
+    """
+    stmt = _dialect_insert(session)(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(conflict_columns),
+        set_={column: stmt.excluded[column] for column in update_columns},
+    )
+    for chunk in chunked(rows, chunk_size):
+        session.execute(stmt, list(chunk))
+    return len(rows)
@@ -1,6 +1,7 @@
 """Database models (SQLAlchemy)."""
 
 from sqlalchemy import (
+    BigInteger,
     Column,
     String,
     Float,
@@ -8,6 +9,7 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Enum,
+    Index,
     UniqueConstraint,
 )
 from sqlalchemy.orm import declarative_base, relationship
@@ -15,11 +17,17 @@ from sqlalchemy.sql import func
 
 Base = declarative_base()
 
+# Event surrogate key (normalization.cache.event_key_for). On SQLite an
+# INTEGER primary key is the rowid itself, so no separate index is kept.
+EventKey = BigInteger().with_variant(Integer, "sqlite")
+
 
 class Event(Base):
     __tablename__ = "events"
 
-    event_uid = Column(String, primary_key=True)
+    event_key = Column(EventKey, primary_key=True, autoincrement=False)
+    # Full SHA-256 hex, kept for audit rows and logs.
+    event_uid = Column(String, nullable=False, unique=True)
 
     sport = Column(String, nullable=False)
     league = Column(String, nullable=False)
@@ -60,7 +68,7 @@ class BinaryMarket(Base):
     )
     market_id = Column(String, nullable=False)
 
-    event_uid = Column(String, ForeignKey("events.event_uid"), nullable=False)
+    event_key = Column(EventKey, ForeignKey("events.event_key"), nullable=False)
 
     team = Column(String, nullable=False)
     question = Column(String, nullable=False)
@@ -81,6 +89,12 @@ class BinaryMarket(Base):
             "market_id",
             name="uq_platform_market",
         ),
+        Index(
+            "ix_binary_markets_platform_event_team",
+            "platform",
+            "event_key",
+            "team",
+        ),
     )
 
 
@@ -89,7 +103,7 @@ class Equivalence(Base):
 
     id = Column(Integer, primary_key=True)
 
-    event_uid = Column(String, ForeignKey("events.event_uid"), nullable=False)
+    event_key = Column(EventKey, ForeignKey("events.event_key"), nullable=False)
 
     team = Column(String, nullable=False)
 
@@ -105,7 +119,7 @@ class Equivalence(Base):
 
     __table_args__ = (
         UniqueConstraint(
-            "event_uid",
+            "event_key",
             "team",
             name="uq_event_team_equivalence",
         ),
@@ -183,7 +197,7 @@ class ExchangeMarket(Base):
 
     id = Column(String, primary_key=True)
     platform = Column(String, nullable=False)
-    event_uid = Column(String, nullable=False, index=True)
+    event_key = Column(EventKey, nullable=False, index=True)
 
     market_id = Column(String, nullable=False)
     market_name = Column(String, nullable=True)
@@ -194,4 +208,16 @@ class ExchangeMarket(Base):
     best_back_odds = Column(Float, nullable=True)
     best_lay_odds = Column(Float, nullable=True)
 
+    # Full depth as encoded exchanges.ladder.Ladder strings, best price first.
+    back_ladder = Column(String, nullable=True)
+    lay_ladder = Column(String, nullable=True)
+
     last_updated = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index(
+            "ix_exchange_markets_event_selection",
+            "event_key",
+            "selection_name",
+        ),
+    )
@@ -1,6 +1,6 @@
 """Database session/engine initialization."""
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.orm import sessionmaker
 
 from db.models import Base
@@ -13,7 +13,13 @@ def create_engine_and_session(db_url: str):
         echo=False,
     )
 
+    _check_event_keys(engine)
     Base.metadata.create_all(engine)
+    # create_all skips tables that already exist, so indexes added to the
+    # models later would never reach an existing database.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
 
     session_local = sessionmaker(
         bind=engine,
@@ -23,3 +29,18 @@ def create_engine_and_session(db_url: str):
     )
 
     return engine, session_local
+
+
+def _check_event_keys(engine) -> None:
+    # Events used to be keyed by the hex event_uid; create_all cannot
+    # rewrite those tables, so fail early instead of on the first query.
+    inspector = inspect(engine)
+    if not inspector.has_table("events"):
+        return
+    columns = {column["name"] for column in inspector.get_columns("events")}
+    if "event_key" not in columns:
+        raise RuntimeError(
+            "Database predates integer event keys; recreate it or add "
+            "event_key columns to events, binary_markets, equivalences "
+            "and exchange_markets"
+        )
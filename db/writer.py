@@ -0,0 +1,74 @@
+"""Background database writer."""
+
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Callable, Sequence
+
+from db.bulk import DEFAULT_CHUNK_SIZE, bulk_insert
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+_STOP = object()
+
+
+class BackgroundWriter:
+    """Runs write jobs on a dedicated thread with its own session.
+
+    Callers hand off work with ``submit`` and return immediately. Each job
+    runs in its own transaction; a failing job is rolled back and logged,
+    and does not stop the writer.
+    """
+
+    def __init__(self, session_factory, *, max_pending: int = 0):
+        self._session_factory = session_factory
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self.failed = 0
+        self._thread = threading.Thread(
+            target=self._run, name="db-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, job: Callable) -> None:
+        self._queue.put(job)
+
+    def insert(self, table, rows: Sequence[dict], chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        if not rows:
+            return
+        rows = list(rows)
+        self.submit(lambda session: bulk_insert(session, table, rows, chunk_size))
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def flush(self) -> None:
+        """Block until every submitted job has run."""
+        self._queue.join()
+
+    def close(self) -> None:
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                self._run_job(job)
+            finally:
+                self._queue.task_done()
+
+    def _run_job(self, job: Callable) -> None:
+        session = self._session_factory()
+        try:
+            job(session)
+            session.commit()
+        except Exception:
+            session.rollback()
+            self.failed += 1
+            logger.exception("Background write failed")
+        finally:
+            session.close()
@@ -5,6 +5,12 @@ from typing import Protocol
 
 class ExchangeAdapter(Protocol):
     platform: str
+    # Max requests this venue should see in flight at once; ingestion caps
+    # its worker pool to this. Methods must be safe to call from threads.
+    max_concurrency: int
+    # Optional ``utils.http.RequestCounter`` of requests sent; the daemon
+    # charges venue budgets from it.
+    requests: object
 
     def list_events(self) -> list[dict]:
         """Return provider events."""
@@ -18,6 +24,14 @@ class ExchangeAdapter(Protocol):
         """Return market book snapshot for a market."""
         ...
 
+    def list_market_books(self, market_ids: list[str]) -> dict[str, dict]:
+        """Optional batch form of list_market_book, keyed by market id.
+
+        Ingestion uses it when present, so venues that accept many ids per
+        request can fetch every book in a few round trips.
+        """
+        ...
+
     def place_order(self, order: dict) -> dict:
         """Optional execution entry point."""
         raise NotImplementedError
@@ -1,33 +1,51 @@
 from __future__ import annotations
 
-import requests
+from utils.http import HttpTransport, RequestCounter, default_transport
+from utils.jsoncodec import decode_response
+from utils.ratelimit import PRIORITY_BOOK, PRIORITY_CATALOGUE, TokenBucket, venue_limiter
 
 
 class BetDEXAdapter:
     platform = "betdex"
-
-    def __init__(self, base_url: str, api_key: str | None = None):
+    max_concurrency = 8
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str | None = None,
+        transport: HttpTransport | None = None,
+        limiter: TokenBucket | None = None,
+    ):
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
-        self.session = requests.Session()
+        self.transport = transport or default_transport()
+        self.limiter = limiter or venue_limiter(self.platform)
+        self.requests = RequestCounter()
+        self.headers = {"Accept": "application/json"}
         if api_key:
-            self.session.headers.update({"Authorization": f"Bearer {api_key}"})
-        self.session.headers.update({"Accept": "application/json"})
+            self.headers["Authorization"] = f"Bearer {api_key}"
+
+    def _get(self, path: str, priority: int = PRIORITY_CATALOGUE):
+        if self.limiter is not None:
+            self.limiter.acquire(1, priority)
+        self.requests.add()
+        resp = self.transport.get(
+            f"{self.base_url}{path}",
+            headers=self.headers,
+            limiter=self.limiter,
+            priority=priority,
+        )
+        resp.raise_for_status()
+        return decode_response(resp)
 
     def list_events(self) -> list[dict]:
-        resp = self.session.get(f"{self.base_url}/events", timeout=10)
-        resp.raise_for_status()
-        return resp.json()
+        return self._get("/events")
 
     def list_markets(self, event_id: str) -> list[dict]:
-        resp = self.session.get(f"{self.base_url}/events/{event_id}/markets", timeout=10)
-        resp.raise_for_status()
-        return resp.json()
+        return self._get(f"/events/{event_id}/markets")
 
     def list_market_book(self, market_id: str) -> dict:
-        resp = self.session.get(f"{self.base_url}/markets/{market_id}/book", timeout=10)
-        resp.raise_for_status()
-        return resp.json()
+        return self._get(f"/markets/{market_id}/book", PRIORITY_BOOK)
 
     def place_order(self, order: dict) -> dict:
         raise NotImplementedError("Execution later")
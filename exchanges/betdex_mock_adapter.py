@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+import time
 from datetime import datetime, timezone
 
+from utils.http import RequestCounter
+
 
 class MockBetDEXAdapter:
     platform = "betdex"
+    max_concurrency = 8
 
-    def __init__(self) -> None:
+    def __init__(self, latency: float = 0.0) -> None:
+        # Seconds slept per call, to stand in for network round trips.
+        self.latency = latency
+        # One call stands for one venue request.
+        self.requests = RequestCounter()
         kickoff_1 = datetime(2025, 1, 10, 20, 0, tzinfo=timezone.utc).isoformat()
         kickoff_2 = datetime(2025, 1, 11, 18, 30, tzinfo=timezone.utc).isoformat()
         kickoff_3 = datetime(2025, 1, 12, 19, 0, tzinfo=timezone.utc).isoformat()
@@ -133,14 +141,30 @@ class MockBetDEXAdapter:
             },
         }
 
+    def _wait(self) -> None:
+        self.requests.add()
+        if self.latency:
+            time.sleep(self.latency)
+
     def list_events(self) -> list[dict]:
+        self._wait()
         return list(self._events)
 
     def list_markets(self, event_id: str) -> list[dict]:
+        self._wait()
         return list(self._markets.get(event_id, []))
 
     def list_market_book(self, market_id: str) -> dict:
+        self._wait()
         return dict(self._books.get(market_id, {"runners": []}))
 
+    def list_market_books(self, market_ids: list[str]) -> dict[str, dict]:
+        self._wait()
+        return {
+            market_id: dict(self._books[market_id])
+            for market_id in market_ids
+            if market_id in self._books
+        }
+
     def place_order(self, order: dict) -> dict:
         raise NotImplementedError("Mock adapter is read-only")
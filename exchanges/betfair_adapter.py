@@ -1,24 +1,84 @@
 from __future__ import annotations
 
+from datetime import datetime, timedelta, timezone
+
+from config.settings import BETFAIR_EVENT_HORIZON_HOURS
 from exchanges.base import ExchangeAdapter
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# How far back the start-time filter reaches, so matches in play stay listed.
+IN_PLAY_LOOKBACK = timedelta(hours=3)
 
 
 class BetfairAdapter:
     platform = "betfair"
+    max_concurrency = 4
 
-    def __init__(self, client):
+    def __init__(
+        self,
+        client,
+        league_normalizer=None,
+        horizon_hours: float | None = BETFAIR_EVENT_HORIZON_HOURS,
+        clock=None,
+    ):
+        # With a league_normalizer, only competitions matching one of its
+        # aliases exactly (after folding) are fetched; horizon_hours bounds
+        # marketStartTime server-side (None: no bound). clock returns the
+        # aware "now" the window is built from.
         self.client = client
+        self.league_normalizer = league_normalizer
+        self.horizon_hours = horizon_hours
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+
+    @property
+    def requests(self):
+        return getattr(self.client, "requests", None)
+
+    def _start_window(self) -> tuple[datetime, datetime] | None:
+        if not self.horizon_hours:
+            return None
+        now = self.clock()
+        return now - IN_PLAY_LOOKBACK, now + timedelta(hours=self.horizon_hours)
 
     def list_events(self) -> list[dict]:
         events: list[dict] = []
-        competitions = self.client.list_competitions()
+        start_window = self._start_window()
+        competitions = self.client.list_competitions(start_window)
+
+        # One listEvents call per wanted competition, sent as a single JSON-RPC batch.
+        batch = self.client.batch()
+        comp_names: list[str | None] = []
+        skipped = 0
         for comp in competitions:
             comp_obj = comp.get("competition", {})
             comp_id = comp_obj.get("id") or comp.get("competitionId") or comp.get("id")
             if not comp_id:
                 continue
             comp_name = comp_obj.get("name") or comp.get("competitionName")
-            for ev in self.client.list_events(str(comp_id)):
+            # Exact lookup: a fuzzy one lets "Welsh Premier League" through.
+            if (
+                self.league_normalizer is not None
+                and self.league_normalizer.index.exact(comp_name) is None
+            ):
+                skipped += 1
+                continue
+            comp_names.append(comp_name)
+            batch.add("listEvents", self.client.list_events_params(str(comp_id), start_window))
+        logger.info(
+            "Betfair competitions selected",
+            extra={"fetched": len(comp_names), "skipped_unknown": skipped},
+        )
+
+        for comp_name, result in zip(comp_names, batch.send()):
+            if not result.ok:
+                logger.warning(
+                    "listEvents failed for competition",
+                    extra={"competition": comp_name, "error": result.error},
+                )
+                continue
+            for ev in result.result or []:
                 if comp_name:
                     ev = dict(ev)
                     ev["competition"] = ev.get("competition") or {"name": comp_name}
@@ -29,8 +89,18 @@ class BetfairAdapter:
         return self.client.list_markets(event_id)
 
     def list_market_book(self, market_id: str) -> dict:
-        runners = self.client.list_runners(market_id)
-        return {"market_id": market_id, "runners": runners}
+        return self.list_market_books([market_id]).get(
+            market_id, {"market_id": market_id, "runners": []}
+        )
+
+    def list_market_books(self, market_ids: list[str]) -> dict[str, dict]:
+        books: dict[str, dict] = {}
+        for book in self.client.list_market_books(market_ids):
+            market_id = str(book.get("marketId") or "")
+            if not market_id:
+                continue
+            books[market_id] = {"market_id": market_id, "runners": book.get("runners") or []}
+        return books
 
     def place_order(self, order: dict) -> dict:
         raise NotImplementedError("Betfair execution not wired")
@@ -0,0 +1,87 @@
+"""Compact price ladders for exchange order-book depth."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Iterable, Optional
+
+
+class Ladder:
+    """One side of a runner's book, best price first.
+
+    Cumulative size and notional (price * size) are precomputed so the
+    volume-weighted price of any fill is an O(log n) lookup.
+    """
+
+    __slots__ = ("prices", "sizes", "cum_size", "cum_notional")
+
+    def __init__(self, levels: Iterable[tuple[float, float]]):
+        prices: list[float] = []
+        sizes: list[float] = []
+        cum_size: list[float] = []
+        cum_notional: list[float] = []
+        total = 0.0
+        notional = 0.0
+        for price, size in levels:
+            if size <= 0:
+                continue
+            total += size
+            notional += price * size
+            prices.append(price)
+            sizes.append(size)
+            cum_size.append(total)
+            cum_notional.append(notional)
+        self.prices = tuple(prices)
+        self.sizes = tuple(sizes)
+        self.cum_size = tuple(cum_size)
+        self.cum_notional = tuple(cum_notional)
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    @property
+    def depth(self) -> float:
+        return self.cum_size[-1] if self.cum_size else 0.0
+
+    def level_vwap(self, index: int) -> float:
+        """Average price of a fill that takes every level up to ``index``."""
+        return self.cum_notional[index] / self.cum_size[index]
+
+    def vwap(self, size: float) -> Optional[float]:
+        """Average price for a fill of ``size``; None if the book is too thin."""
+        if not self.prices:
+            return None
+        if size <= 0:
+            return self.prices[0]
+        index = bisect_left(self.cum_size, size)
+        if index >= len(self.cum_size):
+            return None
+        before_size = self.cum_size[index - 1] if index else 0.0
+        before_notional = self.cum_notional[index - 1] if index else 0.0
+        notional = before_notional + (size - before_size) * self.prices[index]
+        return notional / size
+
+    @classmethod
+    def from_levels(cls, raw: Iterable[dict]) -> "Ladder":
+        """Build from provider levels such as ``[{"price": 1.7, "size": 250.0}]``."""
+        levels = []
+        for level in raw or []:
+            try:
+                levels.append((float(level["price"]), float(level.get("size") or 0.0)))
+            except (KeyError, TypeError, ValueError):
+                continue
+        return cls(levels)
+
+    def encode(self) -> str:
+        """Serialize as ``price@size`` pairs, e.g. ``1.7@250;1.72@80``."""
+        return ";".join(f"{p!r}@{s!r}" for p, s in zip(self.prices, self.sizes))
+
+    @classmethod
+    def decode(cls, value: Optional[str]) -> Optional["Ladder"]:
+        if not value:
+            return None
+        levels = []
+        for part in value.split(";"):
+            price, _sep, size = part.partition("@")
+            levels.append((float(price), float(size)))
+        return cls(levels)
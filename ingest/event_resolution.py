@@ -0,0 +1,251 @@
+"""Bulk event resolution shared by the event ingestors."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import bindparam, select, update
+
+from db.bulk import bulk_insert
+from db.models import Event
+from normalization.event_index import DEFAULT_TOLERANCE, EventIndex
+from utils.hashing import stable_hash
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+PROVIDER_ID_COLUMNS = {
+    "betfair": "betfair_id",
+    "betdex": "betdex_id",
+}
+
+# Max bind parameters per IN (...) clause when loading existing events.
+_IN_CHUNK = 500
+
+# EventIndexLoader re-reads events created this long before its high-water mark.
+INDEX_OVERLAP = timedelta(minutes=5)
+
+_INDEX_COLUMNS = select(
+    Event.league, Event.home_team, Event.away_team, Event.kickoff_time, Event.event_key
+)
+
+
+class PayloadHashCache:
+    """Remembers the hash of each provider event's raw payload.
+
+    Ingestors check it before normalizing so that events which have not
+    changed since the last cycle cost one hash instead of normalization,
+    a SHA-256 uid and a database lookup.
+    """
+
+    def __init__(self) -> None:
+        self._hashes: dict[tuple[str, str], str] = {}
+
+    @staticmethod
+    def digest(raw: dict) -> str:
+        return stable_hash(json.dumps(raw, sort_keys=True, default=str))
+
+    def unchanged(self, platform: str, provider_id: str, digest: str) -> bool:
+        return self._hashes.get((platform, provider_id)) == digest
+
+    def remember(self, platform: str, seen: list[tuple[str, str]]) -> None:
+        for provider_id, digest in seen:
+            self._hashes[(platform, provider_id)] = digest
+
+    def clear(self) -> None:
+        self._hashes.clear()
+
+
+payload_cache = PayloadHashCache()
+
+
+def load_event_index(
+    session,
+    *,
+    tolerance: timedelta = DEFAULT_TOLERANCE,
+    home_teams: Optional[Iterable[str]] = None,
+) -> EventIndex:
+    """Index stored events; ``home_teams`` restricts the load to those fixtures."""
+    index = EventIndex(tolerance)
+    if home_teams is None:
+        index.add_rows(session.execute(_INDEX_COLUMNS))
+        return index
+    teams = list(dict.fromkeys(home_teams))
+    for start in range(0, len(teams), _IN_CHUNK):
+        index.add_rows(
+            session.execute(
+                _INDEX_COLUMNS.where(Event.home_team.in_(teams[start : start + _IN_CHUNK]))
+            )
+        )
+    return index
+
+
+class EventIndexLoader:
+    """Keeps an ``EventIndex`` current across cycles.
+
+    Each ``refresh`` reads only events whose ``created_at`` is at or after
+    the newest one seen, minus ``INDEX_OVERLAP`` so rows committed late by
+    slower transactions (or stored with second precision) are not missed;
+    rows already indexed are skipped. An event's key hashes its fixture and
+    kickoff, so indexed rows never go stale.
+    """
+
+    def __init__(self, tolerance: timedelta = DEFAULT_TOLERANCE):
+        self.index = EventIndex(tolerance)
+        self.scanned = 0
+        self._indexed: set[int] = set()
+        self._high_water: Optional[datetime] = None
+
+    def refresh(self, session) -> int:
+        """Index events created since the last refresh; return how many were added."""
+        stmt = select(
+            Event.league,
+            Event.home_team,
+            Event.away_team,
+            Event.kickoff_time,
+            Event.event_key,
+            Event.created_at,
+        )
+        if self._high_water is not None:
+            stmt = stmt.where(Event.created_at >= self._high_water - INDEX_OVERLAP)
+        added = 0
+        self.scanned = 0
+        for league, home, away, kickoff, event_key, created_at in session.execute(stmt):
+            self.scanned += 1
+            if created_at is not None and (self._high_water is None or created_at > self._high_water):
+                self._high_water = created_at
+            if event_key in self._indexed:
+                continue
+            self.index.add(league, home, away, kickoff, event_key)
+            self._indexed.add(event_key)
+            added += 1
+        return added
+
+
+def _key_collision(event_data: dict, stored_uid: str) -> None:
+    logger.warning(
+        "Event key collision; event skipped",
+        extra={
+            "event_key": event_data["event_key"],
+            "event_uid": event_data["event_uid"],
+            "stored_uid": stored_uid,
+        },
+    )
+
+
+def resolve_events(
+    session, platform: str, candidates: list[tuple[dict, str]]
+) -> tuple[int, int]:
+    """Insert or update normalized events in bulk; does not commit.
+
+    ``candidates`` holds (event_data, provider_event_id) pairs, where
+    event_data is the dict from ``normalize_event``. Existing rows are
+    loaded by event_key with one IN query per chunk; new events are
+    bulk-inserted and stale provider ids are bulk-updated. A candidate
+    whose key is unknown but whose fixture is already stored with a
+    kickoff within the tolerance (see ``EventIndex``) is merged into that
+    event instead of duplicating it; candidates in one batch that are the
+    same fixture resolve to a single event. A candidate whose key is
+    already taken by a different uid is a surrogate collision and is
+    skipped.
+    Returns (inserted, updated).
+    """
+    id_column = PROVIDER_ID_COLUMNS.get(platform)
+    by_key: dict[int, tuple[dict, str]] = {}
+    collisions = 0
+    duplicates = 0
+    for event_data, provider_id in candidates:
+        known = by_key.get(event_data["event_key"])
+        if known is not None and known[0]["event_uid"] != event_data["event_uid"]:
+            _key_collision(event_data, known[0]["event_uid"])
+            collisions += 1
+            continue
+        by_key[event_data["event_key"]] = (event_data, provider_id)
+    if not by_key:
+        return 0, 0
+
+    id_attr = getattr(Event, id_column) if id_column else None
+    columns = [Event.event_key, Event.event_uid] + ([id_attr] if id_attr is not None else [])
+    # event_key -> (stored event_uid, stored provider id)
+    existing: dict[int, tuple[str, str | None]] = {}
+
+    def load_existing(keys: list[int]) -> None:
+        for start in range(0, len(keys), _IN_CHUNK):
+            chunk = keys[start : start + _IN_CHUNK]
+            for row in session.execute(select(*columns).where(Event.event_key.in_(chunk))):
+                existing[row[0]] = (row[1], row[2] if id_attr is not None else None)
+
+    load_existing(list(by_key))
+
+    for key, (event_data, _provider_id) in list(by_key.items()):
+        stored = existing.get(key)
+        if stored is not None and stored[0] != event_data["event_uid"]:
+            _key_collision(event_data, stored[0])
+            collisions += 1
+            del by_key[key]
+
+    unknown = [data for data, _provider_id in by_key.values() if data["event_key"] not in existing]
+    if unknown:
+        index = load_event_index(session, home_teams=[data["home_team"] for data in unknown])
+        merged: list[int] = []
+        for event_data in unknown:
+            match = index.lookup(
+                event_data["league"],
+                event_data["home_team"],
+                event_data["away_team"],
+                event_data["kickoff_time"],
+            )
+            if match is None:
+                # Later candidates in this batch may be the same fixture.
+                index.add(
+                    event_data["league"],
+                    event_data["home_team"],
+                    event_data["away_team"],
+                    event_data["kickoff_time"],
+                    event_data["event_key"],
+                )
+                continue
+            candidate = by_key.pop(event_data["event_key"])
+            if match in by_key:
+                # The fixture is already being resolved under ``match``.
+                duplicates += 1
+                continue
+            by_key[match] = candidate
+            merged.append(match)
+        load_existing(merged)
+
+    inserts: list[dict] = []
+    updates: list[dict] = []
+    for key, (event_data, provider_id) in by_key.items():
+        if key not in existing:
+            row = dict(event_data)
+            if id_column:
+                row[id_column] = provider_id
+            inserts.append(row)
+        elif id_column and existing[key][1] != provider_id:
+            updates.append({"b_key": key, "b_provider_id": provider_id})
+
+    if inserts:
+        bulk_insert(session, Event.__table__, inserts)
+    if updates:
+        table = Event.__table__
+        session.execute(
+            update(table)
+            .where(table.c.event_key == bindparam("b_key"))
+            .values({id_column: bindparam("b_provider_id")}),
+            updates,
+        )
+
+    logger.info(
+        "Resolved events",
+        extra={
+            "platform": platform,
+            "inserted": len(inserts),
+            "updated": len(updates),
+            "collisions": collisions,
+            "duplicates": duplicates,
+        },
+    )
+    return len(inserts), len(updates)
@@ -1,22 +1,13 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
-
-from db.models import Event
+from ingest.event_resolution import PayloadHashCache, payload_cache, resolve_events
+from normalization.cache import parse_kickoff_utc
 from normalization.events import normalize_event
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 
-def _parse_iso_utc(value: str) -> datetime:
-    value = value.replace("Z", "+00:00")
-    dt = datetime.fromisoformat(value)
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc)
-
-
 def _split_teams(name: str) -> tuple[str, str] | None:
     if " v " in name:
         home, away = name.split(" v ", 1)
@@ -24,8 +15,12 @@ def _split_teams(name: str) -> tuple[str, str] | None:
     return None
 
 
-def ingest_events(session, adapter, team_normalizer, league_normalizer) -> None:
+def ingest_events(
+    session, adapter, team_normalizer, league_normalizer, cache: PayloadHashCache = payload_cache
+) -> None:
     raw_events = adapter.list_events()
+    candidates: list[tuple[dict, str]] = []
+    seen: list[tuple[str, str]] = []
 
     for ev in raw_events:
         provider_event_id = str(
@@ -34,6 +29,11 @@ def ingest_events(session, adapter, team_normalizer, league_normalizer) -> None:
             or ev.get("eventId")
             or ""
         )
+        if provider_event_id:
+            digest = cache.digest(ev)
+            if cache.unchanged(adapter.platform, provider_event_id, digest):
+                continue
+            seen.append((provider_event_id, digest))
         name = ev.get("name") or ev.get("event", {}).get("name") or ev.get("eventName") or ""
         open_date = (
             ev.get("openDate")
@@ -69,7 +69,7 @@ def ingest_events(session, adapter, team_normalizer, league_normalizer) -> None:
         except KeyError:
             continue
 
-        kickoff = _parse_iso_utc(str(open_date))
+        kickoff = parse_kickoff_utc(str(open_date))
 
         event_data = normalize_event(
             sport="SOCCER",
@@ -83,14 +83,8 @@ def ingest_events(session, adapter, team_normalizer, league_normalizer) -> None:
             league_normalizer=league_normalizer,
         )
 
-        existing = session.get(Event, event_data["event_uid"])
-        if existing is None:
-            existing = Event(**event_data)
-            session.add(existing)
-
-        if adapter.platform == "betfair":
-            existing.betfair_id = provider_event_id
-        elif adapter.platform == "betdex":
-            existing.betdex_id = provider_event_id
+        candidates.append((event_data, provider_event_id))
 
+    resolve_events(session, adapter.platform, candidates)
     session.commit()
+    cache.remember(adapter.platform, seen)
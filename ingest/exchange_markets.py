@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
+from sqlalchemy import select
+
+from config.settings import EXCHANGE_MAX_CONCURRENCY
+from db.bulk import bulk_upsert
 from db.models import Event, ExchangeMarket
+from exchanges.ladder import Ladder
 
 
 def _utcnow() -> datetime:
@@ -21,27 +27,123 @@ def _pick_match_odds_market(markets: list[dict]) -> dict | None:
     return markets[0] if markets else None
 
 
-def ingest_exchange_markets(session, adapter, event_rows: list[Event]) -> None:
+def _fetch_event_market(adapter, provider_event_id: str) -> tuple[str, str | None] | None:
+    markets = adapter.list_markets(provider_event_id)
+    market = _pick_match_odds_market(markets)
+    if not market:
+        return None
+
+    market_id = str(
+        market.get("marketId") or market.get("id") or market.get("market_id") or ""
+    )
+    if not market_id:
+        return None
+
+    return market_id, market.get("marketName") or market.get("name")
+
+
+def _pool_map(adapter, workers: int, fn, items: list) -> list:
+    if workers <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(
+        max_workers=min(workers, len(items)),
+        thread_name_prefix=f"{adapter.platform}-fetch",
+    ) as pool:
+        return list(pool.map(fn, items))
+
+
+def _workers(adapter, max_workers: int | None) -> int:
+    workers = max_workers or EXCHANGE_MAX_CONCURRENCY
+    venue_limit = getattr(adapter, "max_concurrency", None)
+    if venue_limit:
+        workers = min(workers, venue_limit)
+    return workers
+
+
+def fetch_event_markets(
+    adapter, event_rows: list[Event], max_workers: int | None = None
+) -> list[tuple[Event, str, str | None]]:
+    """Look up the match-odds market of every event concurrently.
+
+    Returns (event, market_id, market_name) for events that have one, in
+    the order of ``event_rows``. Concurrency is ``max_workers`` (default
+    ``EXCHANGE_MAX_CONCURRENCY``), capped by the adapter's own
+    ``max_concurrency`` when it declares one.
+    """
+    targets: list[tuple[Event, str]] = []
     for ev in event_rows:
         provider_event_id = (
             ev.betfair_id if adapter.platform == "betfair" else ev.betdex_id
         )
-        if not provider_event_id:
-            continue
+        if provider_event_id:
+            targets.append((ev, str(provider_event_id)))
+    if not targets:
+        return []
 
-        markets = adapter.list_markets(str(provider_event_id))
-        market = _pick_match_odds_market(markets)
-        if not market:
-            continue
+    catalogues = _pool_map(
+        adapter,
+        _workers(adapter, max_workers),
+        lambda t: _fetch_event_market(adapter, t[1]),
+        targets,
+    )
+    found: list[tuple[Event, str, str | None]] = []
+    for (ev, _event_id), item in zip(targets, catalogues):
+        if item is not None:
+            found.append((ev, *item))
+    return found
 
-        market_id = str(
-            market.get("marketId") or market.get("id") or market.get("market_id") or ""
-        )
-        if not market_id:
-            continue
 
-        market_name = market.get("marketName") or market.get("name")
-        book = adapter.list_market_book(market_id)
+def fetch_books(
+    adapter, markets: list[tuple[Event, str, str | None]], max_workers: int | None = None
+) -> list[tuple[Event, str, str | None, dict]]:
+    """Fetch books for markets from ``fetch_event_markets``.
+
+    Uses the adapter's ``list_market_books`` batch call when it has one,
+    otherwise one ``list_market_book`` call per market.
+    """
+    market_ids = list(dict.fromkeys(market_id for _ev, market_id, _name in markets))
+    if not market_ids:
+        return []
+
+    list_market_books = getattr(adapter, "list_market_books", None)
+    if list_market_books is not None:
+        books = list_market_books(market_ids)
+    else:
+        workers = _workers(adapter, max_workers)
+        books = dict(zip(market_ids, _pool_map(adapter, workers, adapter.list_market_book, market_ids)))
+
+    return [
+        (ev, market_id, market_name, books.get(market_id) or {"runners": []})
+        for ev, market_id, market_name in markets
+    ]
+
+
+def fetch_market_books(
+    adapter, event_rows: list[Event], max_workers: int | None = None
+) -> list[tuple[Event, str, str | None, dict]]:
+    """Fetch the match-odds catalogue and book for every event.
+
+    ``fetch_event_markets`` followed by ``fetch_books``; results keep the
+    order of ``event_rows``.
+    """
+    markets = fetch_event_markets(adapter, event_rows, max_workers)
+    return fetch_books(adapter, markets, max_workers)
+
+
+_QUOTE_COLUMNS = ("best_back_odds", "best_lay_odds", "back_ladder", "lay_ladder")
+
+# Max bind parameters per IN (...) clause when prefetching existing rows.
+_IN_CHUNK = 500
+
+
+def _runner_rows(platform: str, fetched, quote_store=None) -> dict[str, dict]:
+    """Flatten fetched books into ExchangeMarket rows keyed by row id.
+
+    Each runner is also pushed to ``quote_store`` when one is given.
+    """
+    now = _utcnow()
+    rows: dict[str, dict] = {}
+    for ev, market_id, market_name, book in fetched:
         runners = book.get("runners") or book.get("selections") or []
 
         for runner in runners:
@@ -63,25 +165,122 @@ def ingest_exchange_markets(session, adapter, event_rows: list[Event]) -> None:
             back = runner.get("ex", {}).get("availableToBack") or runner.get("back") or []
             lay = runner.get("ex", {}).get("availableToLay") or runner.get("lay") or []
 
+            back_ladder = Ladder.from_levels(back)
+            lay_ladder = Ladder.from_levels(lay)
             best_back = float(back[0]["price"]) if back and "price" in back[0] else None
             best_lay = float(lay[0]["price"]) if lay and "price" in lay[0] else None
-
-            row_id = f"{adapter.platform}:{market_id}:{selection_id}"
-            row = session.query(ExchangeMarket).filter(ExchangeMarket.id == row_id).one_or_none()
-            if row is None:
-                row = ExchangeMarket(
-                    id=row_id,
-                    platform=adapter.platform,
-                    event_uid=ev.event_uid,
-                    market_id=market_id,
-                    market_name=market_name,
-                    selection_id=selection_id,
-                    selection_name=selection_name,
+            row_id = f"{platform}:{market_id}:{selection_id}"
+            rows[row_id] = {
+                "id": row_id,
+                "platform": platform,
+                "event_key": ev.event_key,
+                "market_id": market_id,
+                "market_name": market_name,
+                "selection_id": selection_id,
+                "selection_name": selection_name,
+                "best_back_odds": best_back,
+                "best_lay_odds": best_lay,
+                "back_ladder": back_ladder.encode() or None,
+                "lay_ladder": lay_ladder.encode() or None,
+                "last_updated": now,
+            }
+            if quote_store is not None:
+                quote_store.update_exchange(
+                    (ev.event_key, selection_name),
+                    market_id,
+                    selection_id,
+                    back_ladder,
+                    lay_ladder,
+                    best_back=best_back,
+                    best_lay=best_lay,
                 )
-                session.add(row)
+    return rows
+
+
+def write_exchange_quotes(session, rows: dict[str, dict]) -> set[tuple[int, str]]:
+    """Upsert runner quotes in one pass; return the keys whose quotes moved.
+
+    Existing rows keep their identity columns and only get fresh quotes,
+    matching the old per-row update.
+    """
+    if not rows:
+        return set()
+
+    ids = list(rows)
+    existing: dict[str, tuple] = {}
+    for start in range(0, len(ids), _IN_CHUNK):
+        stmt = select(
+            ExchangeMarket.id,
+            ExchangeMarket.event_key,
+            ExchangeMarket.selection_name,
+            *(getattr(ExchangeMarket, column) for column in _QUOTE_COLUMNS),
+        ).where(ExchangeMarket.id.in_(ids[start : start + _IN_CHUNK]))
+        for row_id, event_key, selection_name, *quotes in session.execute(stmt):
+            existing[row_id] = (event_key, selection_name, tuple(quotes))
+
+    changed: set[tuple[int, str]] = set()
+    for row_id, row in rows.items():
+        quotes = tuple(row[column] for column in _QUOTE_COLUMNS)
+        old = existing.get(row_id)
+        if old is None:
+            if any(quote is not None for quote in quotes):
+                changed.add((row["event_key"], row["selection_name"]))
+        elif old[2] != quotes:
+            changed.add((old[0], old[1]))
+
+    bulk_upsert(
+        session,
+        ExchangeMarket.__table__,
+        list(rows.values()),
+        conflict_columns=["id"],
+        update_columns=[*_QUOTE_COLUMNS, "last_updated"],
+    )
+    return changed
+
+
+def ingest_exchange_markets(
+    session,
+    adapter,
+    event_rows: list[Event],
+    max_workers: int | None = None,
+    *,
+    quote_store=None,
+    writer=None,
+) -> set[tuple[int, str]]:
+    """Refresh exchange quotes; return the (event_key, selection_name) keys that moved.
+
+    All catalogues and books are fetched first (see ``fetch_market_books``),
+    then every runner is written with one bulk upsert.
+
+    With a ``quote_store`` the quotes go to memory first and the change set
+    comes from the store; pass a ``writer`` (``db.writer.BackgroundWriter``)
+    as well to make the database write an asynchronous audit snapshot.
+    """
+    markets = fetch_event_markets(adapter, event_rows, max_workers)
+    return ingest_market_books(
+        session, adapter, markets, max_workers, quote_store=quote_store, writer=writer
+    )
+
 
-            row.best_back_odds = best_back
-            row.best_lay_odds = best_lay
-            row.last_updated = _utcnow()
+def ingest_market_books(
+    session,
+    adapter,
+    markets: list[tuple[Event, str, str | None]],
+    max_workers: int | None = None,
+    *,
+    quote_store=None,
+    writer=None,
+) -> set[tuple[int, str]]:
+    """Like ``ingest_exchange_markets`` for markets already looked up.
 
+    Callers that cache ``fetch_event_markets`` results (the daemon) poll
+    books without re-reading the catalogue.
+    """
+    fetched = fetch_books(adapter, markets, max_workers)
+    rows = _runner_rows(adapter.platform, fetched, quote_store)
+    if writer is not None:
+        writer.submit(lambda s: write_exchange_quotes(s, rows))
+        return set()
+    changed = write_exchange_quotes(session, rows)
     session.commit()
+    return changed
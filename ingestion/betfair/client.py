@@ -3,18 +3,83 @@
 from __future__ import annotations
 
 import os
-import requests
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
 
+from utils.http import HttpTransport, RequestCounter, default_transport
+from utils.jsoncodec import decode_response
 from utils.logging import get_logger
+from utils.ratelimit import PRIORITY_BOOK, PRIORITY_CATALOGUE, TokenBucket, venue_limiter
 
 logger = get_logger(__name__)
 
 
+@dataclass
+class RpcResult:
+    method: str
+    result: Any = None
+    error: Any = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def value(self) -> Any:
+        if self.error is not None:
+            raise RuntimeError(self.error)
+        return self.result
+
+
+class RpcBatch:
+    """Queue several API calls and send them in as few POSTs as possible."""
+
+    def __init__(self, client: "BetfairClient"):
+        self._client = client
+        self._calls: list[tuple[str, dict]] = []
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def add(self, method: str, params: dict) -> int:
+        """Queue a call; returns its index in the list ``send`` returns."""
+        self._calls.append((method, params))
+        return len(self._calls) - 1
+
+    def send(self) -> list[RpcResult]:
+        calls, self._calls = self._calls, []
+        if not calls:
+            return []
+        return self._client._rpc_batch(calls)
+
+
 class BetfairClient:
     IDENTITY_URL = "https://identitysso-cert.betfair.com/api/certlogin"
     API_URL = "https://api.betfair.com/exchange/betting/json-rpc/v1"
 
-    def __init__(self):
+    # Calls per JSON-RPC array POST.
+    MAX_BATCH_CALLS = 50
+
+    # listMarketBook data-weight limits: each market costs the sum of its
+    # priceData weights and one request may not exceed MAX_DATA_WEIGHT.
+    MAX_DATA_WEIGHT = 200
+    PRICE_DATA_WEIGHTS = {
+        "SP_AVAILABLE": 3,
+        "SP_TRADED": 7,
+        "EX_BEST_OFFERS": 5,
+        "EX_ALL_OFFERS": 17,
+        "EX_TRADED": 17,
+    }
+
+    # A POST takes one limiter token however many calls it carries; calls
+    # in any of these methods make it a book request.
+    BOOK_METHODS = frozenset({"listMarketBook"})
+
+    def __init__(
+        self,
+        transport: HttpTransport | None = None,
+        limiter: TokenBucket | None = None,
+    ):
         self.app_key = os.getenv("BETFAIR_APP_KEY")
         self.username = os.getenv("BETFAIR_USERNAME")
         self.password = os.getenv("BETFAIR_PASSWORD")
@@ -26,22 +91,22 @@ class BetfairClient:
         if not all([self.app_key, self.username, self.password, *self.cert]):
             raise RuntimeError("Missing Betfair credentials")
 
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "X-Application": self.app_key,
-                "Content-Type": "application/json",
-            }
-        )
+        self.transport = transport or default_transport()
+        self.limiter = limiter or venue_limiter("betfair")
+        self.requests = RequestCounter()
+        self.headers = {
+            "X-Application": self.app_key,
+            "Content-Type": "application/json",
+        }
 
         self._login()
 
     def _login(self) -> None:
-        resp = self.session.post(
+        resp = self.transport.post(
             self.IDENTITY_URL,
             data={"username": self.username, "password": self.password},
             cert=self.cert,
-            timeout=10,
+            headers={"X-Application": self.app_key},
         )
         resp.raise_for_status()
         data = resp.json()
@@ -50,51 +115,98 @@ class BetfairClient:
             raise RuntimeError(f"Betfair login failed: {data}")
 
         token = data["sessionToken"]
-        self.session.headers.update({"X-Authentication": token})
+        self.headers["X-Authentication"] = token
         logger.info("Betfair login successful")
 
     def _rpc(self, method: str, params: dict) -> list[dict]:
-        payload = [
-            {
-                "jsonrpc": "2.0",
-                "method": f"SportsAPING/v1.0/{method}",
-                "params": params,
-                "id": 1,
-            }
-        ]
-
-        resp = self.session.post(
-            self.API_URL,
-            json=payload,
-            timeout=10,
-        )
-        resp.raise_for_status()
-        result = resp.json()[0]
-
-        if "error" in result:
-            raise RuntimeError(result["error"])
+        return self._rpc_batch([(method, params)])[0].value()
 
-        return result["result"]
+    def _rpc_batch(self, calls: list[tuple[str, dict]]) -> list[RpcResult]:
+        """Send ``calls`` as JSON-RPC arrays (see ``_chunks``).
 
-    def list_competitions(self) -> list[dict]:
-        return self._rpc(
-            "listCompetitions",
-            {
-                "filter": {
-                    "eventTypeIds": ["1"],
+        Responses are matched back to calls by id, so the returned list is
+        in call order. A failed call carries its error instead of raising;
+        a non-array response fails every call of its POST.
+        """
+        results: list[RpcResult] = []
+        for chunk in self._chunks(calls):
+            payload = [
+                {
+                    "jsonrpc": "2.0",
+                    "method": f"SportsAPING/v1.0/{method}",
+                    "params": params,
+                    "id": call_id,
                 }
-            },
-        )
+                for call_id, (method, params) in enumerate(chunk, start=1)
+            ]
 
-    def list_events(self, competition_id: str) -> list[dict]:
-        return self._rpc(
-            "listEvents",
-            {
-                "filter": {
-                    "competitionIds": [competition_id],
-                }
-            },
-        )
+            priority = self._batch_priority(chunk)
+            if self.limiter is not None:
+                self.limiter.acquire(1, priority)
+
+            self.requests.add()
+            # Every call sent here is a read, so it is safe to retry.
+            resp = self.transport.post(
+                self.API_URL,
+                json=payload,
+                headers=self.headers,
+                idempotent=True,
+                limiter=self.limiter,
+                priority=priority,
+            )
+            resp.raise_for_status()
+            body = decode_response(resp)
+            if not isinstance(body, list):
+                # A top-level error (e.g. an invalid session) fails the whole POST.
+                error = body.get("error", body) if isinstance(body, dict) else body
+                error = error or {"message": "empty response"}
+                results.extend(RpcResult(method, error=error) for method, _params in chunk)
+                continue
+            by_id = {item.get("id"): item for item in body if isinstance(item, dict)}
+
+            for call_id, (method, _params) in enumerate(chunk, start=1):
+                item = by_id.get(call_id)
+                if item is None:
+                    results.append(RpcResult(method, error={"message": "missing response"}))
+                elif "error" in item:
+                    results.append(RpcResult(method, error=item["error"]))
+                else:
+                    results.append(RpcResult(method, result=item.get("result")))
+        return results
+
+    def _chunks(self, calls: list[tuple[str, dict]]):
+        """Split ``calls`` into POSTs of at most MAX_BATCH_CALLS calls."""
+        for start in range(0, len(calls), self.MAX_BATCH_CALLS):
+            yield calls[start : start + self.MAX_BATCH_CALLS]
+
+    def _batch_priority(self, calls: list[tuple[str, dict]]) -> int:
+        """Limiter priority for one POST of ``calls``."""
+        if any(method in self.BOOK_METHODS for method, _params in calls):
+            return PRIORITY_BOOK
+        return PRIORITY_CATALOGUE
+
+    def batch(self) -> "RpcBatch":
+        return RpcBatch(self)
+
+    def list_competitions(self, start_window: tuple[datetime, datetime] | None = None) -> list[dict]:
+        market_filter: dict = {"eventTypeIds": ["1"]}
+        if start_window is not None:
+            market_filter["marketStartTime"] = _time_range(start_window)
+        return self._rpc("listCompetitions", {"filter": market_filter})
+
+    def list_events(
+        self, competition_id: str, start_window: tuple[datetime, datetime] | None = None
+    ) -> list[dict]:
+        return self._rpc("listEvents", self.list_events_params(competition_id, start_window))
+
+    @staticmethod
+    def list_events_params(
+        competition_id: str, start_window: tuple[datetime, datetime] | None = None
+    ) -> dict:
+        market_filter: dict = {"competitionIds": [competition_id]}
+        if start_window is not None:
+            market_filter["marketStartTime"] = _time_range(start_window)
+        return {"filter": market_filter}
 
     def list_markets(self, event_id: str) -> list[dict]:
         return self._rpc(
@@ -119,3 +231,41 @@ class BetfairClient:
                 },
             },
         )
+
+    def market_book_chunk_size(self, price_data: list[str]) -> int:
+        weight = sum(self.PRICE_DATA_WEIGHTS.get(item, 0) for item in price_data)
+        if weight <= 0:
+            return self.MAX_DATA_WEIGHT
+        return max(1, self.MAX_DATA_WEIGHT // weight)
+
+    def list_market_books(
+        self, market_ids: list[str], price_data: list[str] | None = None
+    ) -> list[dict]:
+        """listMarketBook for many markets, chunked to stay within the data-weight cap."""
+        price_data = price_data or ["EX_BEST_OFFERS"]
+        chunk_size = self.market_book_chunk_size(price_data)
+        batch = self.batch()
+        for start in range(0, len(market_ids), chunk_size):
+            batch.add(
+                "listMarketBook",
+                {
+                    "marketIds": market_ids[start : start + chunk_size],
+                    "priceProjection": {"priceData": price_data},
+                },
+            )
+
+        books: list[dict] = []
+        for result in batch.send():
+            if not result.ok:
+                logger.warning("listMarketBook chunk failed", extra={"error": result.error})
+                continue
+            books.extend(result.result or [])
+        return books
+
+
+def _time_range(window: tuple[datetime, datetime]) -> dict:
+    start, end = window
+    return {
+        "from": start.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "to": end.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
@@ -1,14 +1,18 @@
 """Betfair events ingestion."""
 
-from db.models import Event
+from ingest.event_resolution import PayloadHashCache, payload_cache, resolve_events
 from normalization.events import normalize_event
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 
-def ingest_events(session, client, team_normalizer, league_normalizer) -> None:
+def ingest_events(
+    session, client, team_normalizer, league_normalizer, cache: PayloadHashCache = payload_cache
+) -> None:
     competitions = client.list_competitions()
+    candidates: list[tuple[dict, str]] = []
+    seen: list[tuple[str, str]] = []
 
     for comp in competitions:
         comp_id = comp["competition"]["id"]
@@ -23,6 +27,10 @@ def ingest_events(session, client, team_normalizer, league_normalizer) -> None:
 
         for item in events:
             raw_event = item["event"]
+            digest = cache.digest(raw_event)
+            if cache.unchanged("betfair", raw_event["id"], digest):
+                continue
+            seen.append((raw_event["id"], digest))
             raw_name = raw_event["name"]
 
             try:
@@ -51,16 +59,8 @@ def ingest_events(session, client, team_normalizer, league_normalizer) -> None:
                 league_normalizer=league_normalizer,
             )
 
-            existing = session.get(Event, event_data["event_uid"])
-            if existing:
-                existing.betfair_id = raw_event["id"]
-                continue
-
-            event = Event(**event_data, betfair_id=raw_event["id"])
-            session.add(event)
-            logger.info(
-                "Inserted Betfair event",
-                extra={"home_team": home_team, "away_team": away_team, "kickoff": kickoff},
-            )
+            candidates.append((event_data, raw_event["id"]))
 
+    resolve_events(session, "betfair", candidates)
     session.commit()
+    cache.remember("betfair", seen)
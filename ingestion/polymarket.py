@@ -3,43 +3,119 @@
 from collections import Counter
 from datetime import datetime, timezone
 
-from db.models import BinaryMarket, Event
-from normalization.events import build_event_uid
+from sqlalchemy import select
+
+from db.bulk import DEFAULT_CHUNK_SIZE, bulk_upsert
+from db.models import BinaryMarket
+from ingest.event_resolution import EventIndexLoader
+from normalization.cache import parse_kickoff_utc
+from normalization.questions import INTENT_WIN, QuestionParser
 from utils.logging import get_logger
-from utils.time import to_utc
 
 logger = get_logger(__name__)
 
 SKIP_NOT_SPORTS = "not_sports"
 SKIP_NOT_BINARY = "not_binary"
+SKIP_NOT_WIN_MARKET = "not_win_market"
 SKIP_NO_EVENT_FIELDS = "missing_event_fields"
 SKIP_NO_MATCHING_EVENT = "no_matching_event"
 SKIP_UNKNOWN_TEAM = "unknown_team"
 SKIP_UNKNOWN_LEAGUE = "unknown_league"
 SKIP_OTHER = "other_error"
 
+# Pending markets written per upsert statement.
+UPSERT_CHUNK_SIZE = DEFAULT_CHUNK_SIZE
+
 
 class PolymarketIngestor:
-    def __init__(self, client, team_normalizer, league_normalizer):
+    def __init__(
+        self, client, team_normalizer, league_normalizer, *, quote_store=None, writer=None
+    ):
+        # With a quote_store, prices are published to memory as they are
+        # parsed; with a writer, the database upserts run in the background.
         self.client = client
+        self.quote_store = quote_store
+        self.writer = writer
         self.team_norm = team_normalizer
         self.league_norm = league_normalizer
+        # Built once; fills in teams the structured fields leave out.
+        self.questions = QuestionParser.from_normalizer(team_normalizer)
         self.stats = Counter()
         self.missing_field_stats = Counter()
+        self.changed_keys: set[tuple[int, str]] = set()
+        # Kept across cycles; each prefetch reads only newly stored events.
+        self._event_loader = EventIndexLoader()
+        self._events = self._event_loader.index
+        self._existing: dict[str, tuple[int, int, str, float]] = {}
+        self._pending: dict[str, dict] = {}
+
+    def ingest(self, session) -> set[tuple[int, str]]:
+        """Ingest markets; return the (event_key, team) keys whose price moved.
+
+        Known events (indexed by fixture and kickoff, extended with new
+        events only) and existing markets are prefetched once, and
+        accepted markets are written with chunked INSERT ... ON CONFLICT
+        upserts.
+        """
+        self.changed_keys = set()
+        self.stats = Counter()
+        self.missing_field_stats = Counter()
+        self._prefetch(session)
+        iter_markets = getattr(self.client, "iter_markets", None)
+        markets = iter_markets() if iter_markets else self.client.get_markets()
 
-    def ingest(self, session) -> None:
-        markets = self.client.get_markets()
-
+        total = 0
         for market in markets:
+            total += 1
             try:
-                self._process_market(session, market)
+                self._process_market(market)
             except Exception as exc:
                 self.stats[SKIP_OTHER] += 1
+            if len(self._pending) >= UPSERT_CHUNK_SIZE:
+                self._flush(session)
 
+        self._flush(session)
         session.commit()
-        self._log_stats(len(markets))
+        self._log_stats(total)
+        return self.changed_keys
+
+    def _prefetch(self, session) -> None:
+        self._event_loader.refresh(session)
+        self._existing = {
+            market_id: (row_id, event_key, team, price)
+            for row_id, market_id, event_key, team, price in session.execute(
+                select(
+                    BinaryMarket.id,
+                    BinaryMarket.market_id,
+                    BinaryMarket.event_key,
+                    BinaryMarket.team,
+                    BinaryMarket.price,
+                ).where(BinaryMarket.platform == "polymarket")
+            )
+        }
+        self._pending = {}
+
+    def _flush(self, session) -> None:
+        if not self._pending:
+            return
+        rows = list(self._pending.values())
+        self._pending = {}
+
+        def write(target_session) -> None:
+            bulk_upsert(
+                target_session,
+                BinaryMarket.__table__,
+                rows,
+                conflict_columns=["platform", "market_id"],
+                update_columns=["price", "liquidity", "last_updated"],
+            )
+
+        if self.writer is not None:
+            self.writer.submit(write)
+        else:
+            write(session)
 
-    def _process_market(self, session, raw: dict) -> None:
+    def _process_market(self, raw: dict) -> None:
         if raw.get("category") != "Sports":
             self.stats[SKIP_NOT_SPORTS] += 1
             return
@@ -48,11 +124,18 @@ class PolymarketIngestor:
             self.stats[SKIP_NOT_BINARY] += 1
             return
 
-        question = raw.get("question", "")
-        if "win" not in question.lower():
+        question = raw.get("question") or ""
+        parsed = self.questions.parse(question)
+        if parsed.intent != INTENT_WIN:
+            self.stats[SKIP_NOT_WIN_MARKET] += 1
             return
 
-        required_fields = ["league", "home_team", "away_team", "kickoff"]
+        # home/away (and the YES team) may come from the question instead.
+        required_fields = ["league", "kickoff"]
+        if len(parsed.teams) < 2:
+            required_fields += ["home_team", "away_team"]
+        if not parsed.subject:
+            required_fields.append("team")
         missing = []
         for key in required_fields:
             if key not in raw:
@@ -78,55 +161,67 @@ class PolymarketIngestor:
             return
 
         try:
-            team = self.team_norm.normalize(raw["team"])
-            home_team = self.team_norm.normalize(raw["home_team"])
-            away_team = self.team_norm.normalize(raw["away_team"])
+            team = self.team_norm.normalize(raw["team"]) if raw.get("team") else parsed.subject
+            if raw.get("home_team") and raw.get("away_team"):
+                sides = [
+                    (
+                        self.team_norm.normalize(raw["home_team"]),
+                        self.team_norm.normalize(raw["away_team"]),
+                    )
+                ]
+            else:
+                # Questions don't say who is at home; try both orders.
+                sides = [parsed.teams[:2], parsed.teams[1::-1]]
         except KeyError:
             self.stats[SKIP_UNKNOWN_TEAM] += 1
             return
 
-        kickoff_value = raw["kickoff"].replace("Z", "+00:00")
-        kickoff_dt = datetime.fromisoformat(kickoff_value)
-        kickoff_utc = to_utc(kickoff_dt)
+        kickoff_utc = parse_kickoff_utc(raw["kickoff"])
 
-        event_uid = build_event_uid(
-            league=league,
-            home_team=home_team,
-            away_team=away_team,
-            kickoff_utc=kickoff_utc,
-        )
+        # Kickoffs only need to agree with the exchange's within the
+        # EventIndex tolerance.
+        event_key = None
+        for home_team, away_team in sides:
+            event_key = self._events.lookup(league, home_team, away_team, kickoff_utc)
+            if event_key is not None:
+                break
 
-        event = session.get(Event, event_uid)
-        if not event:
+        if event_key is None:
             self.stats[SKIP_NO_MATCHING_EVENT] += 1
             return
 
-        existing = (
-            session.query(BinaryMarket)
-            .filter_by(platform="polymarket", market_id=raw["id"])
-            .one_or_none()
-        )
+        market_id = raw["id"]
+        price = raw["price"]
+        if price is None:
+            raise ValueError(f"Polymarket market {market_id} has no YES price")
 
+        existing = self._existing.get(market_id)
+        if self.quote_store is not None:
+            key = (existing[1], existing[2]) if existing else (event_key, team)
+            self.quote_store.update_pm(key, market_id, float(price))
         if existing:
-            existing.price = raw["price"]
-            existing.liquidity = raw.get("liquidity")
-            existing.last_updated = datetime.now(timezone.utc)
-            return
-
-        market = BinaryMarket(
-            platform="polymarket",
-            market_id=raw["id"],
-            event_uid=event_uid,
-            team=team,
-            question=question,
-            yes_means=f"{team} wins the match",
-            no_means=f"{team} does not win (draw or lose)",
-            price=raw["price"],
-            liquidity=raw.get("liquidity"),
-            last_updated=datetime.now(timezone.utc),
-        )
-
-        session.add(market)
+            row_id, existing_key, existing_team, existing_price = existing
+            if existing_price != price:
+                self.changed_keys.add((existing_key, existing_team))
+            self._existing[market_id] = (row_id, existing_key, existing_team, price)
+            # Only the quote columns are updated on conflict; these
+            # identity columns just satisfy the INSERT half.
+            event_key, team = existing_key, existing_team
+        else:
+            self.changed_keys.add((event_key, team))
+
+        self._pending[market_id] = {
+            "platform": "polymarket",
+            "market_id": market_id,
+            "event_key": event_key,
+            "team": team,
+            "question": question,
+            "yes_means": f"{team} wins the match",
+            "no_means": f"{team} does not win (draw or lose)",
+            "price": price,
+            "liquidity": raw.get("liquidity"),
+            "last_updated": datetime.now(timezone.utc),
+        }
 
     def _log_stats(self, total: int) -> None:
         ingested = total - sum(self.stats.values())
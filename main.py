@@ -8,9 +8,13 @@ from config.settings import (
     ENABLE_BETDEX_MOCK,
     ENABLE_POLYMARKET,
     ENABLE_POLYMARKET_MOCK,
+    ENABLE_QUOTE_STORE,
+    RUN_DAEMON,
+    STREAM_ADDRESS,
 )
 from db.models import Event
 from db.session import create_engine_and_session
+from db.writer import BackgroundWriter
 from exchanges.betdex_adapter import BetDEXAdapter
 from exchanges.betdex_mock_adapter import MockBetDEXAdapter
 from exchanges.betfair_adapter import BetfairAdapter
@@ -19,8 +23,11 @@ from ingest.exchange_markets import ingest_exchange_markets
 from ingestion.betfair.client import BetfairClient
 from ingestion.fixtures import load_fixtures
 from ingestion.polymarket import PolymarketIngestor
+from normalization.cache import CacheReport
 from polymarket.client import PolymarketClient
 from polymarket.mock_client import MockPolymarketClient
+from quotes.store import QuoteStore
+from scheduling.daemon import ArbDaemon
 from arb_evaluator import evaluate_arbs
 from utils.logging import get_logger
 
@@ -35,6 +42,10 @@ def main() -> None:
 
     team_normalizer = load_team_normalizer()
     league_normalizer = load_league_normalizer()
+    cache_report = CacheReport(team_normalizer, league_normalizer)
+
+    quote_store = QuoteStore() if ENABLE_QUOTE_STORE else None
+    writer = BackgroundWriter(session_local) if ENABLE_QUOTE_STORE else None
 
     exchange = None
     if ENABLE_BETDEX:
@@ -44,7 +55,39 @@ def main() -> None:
             exchange = BetDEXAdapter(base_url="https://betdex.example")
     elif ENABLE_BETFAIR:
         bf_client = BetfairClient()
-        exchange = BetfairAdapter(bf_client)
+        exchange = BetfairAdapter(bf_client, league_normalizer=league_normalizer)
+
+    if RUN_DAEMON:
+        pm_ingestor = None
+        if ENABLE_POLYMARKET:
+            pm_client = MockPolymarketClient() if ENABLE_POLYMARKET_MOCK else PolymarketClient()
+            pm_ingestor = PolymarketIngestor(
+                pm_client,
+                team_normalizer,
+                league_normalizer,
+                quote_store=quote_store,
+                writer=writer,
+            )
+        daemon = ArbDaemon(
+            session,
+            exchange=exchange,
+            pm_ingestor=pm_ingestor,
+            team_normalizer=team_normalizer,
+            league_normalizer=league_normalizer,
+            quote_store=quote_store,
+            writer=writer,
+            stream_address=STREAM_ADDRESS,
+        )
+        logger.info("Running in daemon mode", extra={"stream": STREAM_ADDRESS})
+        try:
+            daemon.run_forever()
+        except KeyboardInterrupt:
+            logger.info("Daemon stopped", extra=daemon.scheduler.stats())
+        finally:
+            if writer is not None:
+                writer.close()
+            session.close()
+        return
 
     if exchange:
         ingest_events(
@@ -62,12 +105,14 @@ def main() -> None:
             )
             .all()
         )
-        ingest_exchange_markets(session, exchange, event_rows)
+        ingest_exchange_markets(
+            session, exchange, event_rows, quote_store=quote_store, writer=writer
+        )
     else:
         fixtures = load_fixtures()
 
         for event_data in fixtures:
-            exists = session.get(Event, event_data["event_uid"])
+            exists = session.get(Event, event_data["event_key"])
             if exists:
                 logger.info("Event exists", extra={"event_uid": event_data["event_uid"]})
                 continue
@@ -83,10 +128,16 @@ def main() -> None:
             pm_client = MockPolymarketClient()
         else:
             pm_client = PolymarketClient()
-        pm_ingestor = PolymarketIngestor(pm_client, team_normalizer, league_normalizer)
+        pm_ingestor = PolymarketIngestor(
+            pm_client,
+            team_normalizer,
+            league_normalizer,
+            quote_store=quote_store,
+            writer=writer,
+        )
         pm_ingestor.ingest(session)
 
-    results = evaluate_arbs(session)
+    results = evaluate_arbs(session, writer=writer, quote_store=quote_store)
     for result in results[:10]:
         print(
             f"[arb] {result.event_uid} | {result.team} | {result.direction} | "
@@ -95,8 +146,11 @@ def main() -> None:
             f"stake_pm=EUR {result.stake_pm:.2f} | "
             f"hedge=EUR {result.lay_stake_or_back_stake:.2f}"
         )
+    if writer is not None:
+        writer.close()
     session.close()
 
+    logger.info("Normalization cache", extra={"caches": cache_report.cycle()})
     logger.info("Startup complete")
 
 
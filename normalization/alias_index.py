@@ -0,0 +1,240 @@
+"""Compiled alias lookup: folded exact keys plus a character n-gram fallback."""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, Iterable, Optional
+
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+NGRAM = 3
+# Fuzzy matches scoring below this (Dice coefficient on n-grams) are rejected.
+DEFAULT_MIN_SCORE = 0.8
+# A fuzzy winner must beat the best other canonical by this much.
+DEFAULT_MARGIN = 0.05
+# Postings of the rarest query n-grams are scanned, at least MIN_PROBE_GRAMS
+# of them and then more while under MAX_POSTINGS_SCANNED ids in total; this
+# bounds each fuzzy lookup regardless of table size.
+MIN_PROBE_GRAMS = 4
+MAX_PROBE_GRAMS = 12
+MAX_POSTINGS_SCANNED = 2000
+# Keys sharing the most probed grams that are scored exactly.
+MAX_CANDIDATES = 32
+DEFAULT_CACHE_SIZE = 65536
+# Every token of a fuzzy query must pair with a token of the alias: equal,
+# a prefix of at least MIN_PREFIX characters, or this similar (typos).
+TOKEN_MIN_RATIO = 0.75
+MIN_PREFIX = 3
+# Tokens that name a different side of the same club or competition
+# ("Barcelona B", "Arsenal W", "La Liga F"); both names must carry the same ones.
+QUALIFIER_TOKENS = frozenset(
+    {
+        "b", "c", "ii", "iii", "w", "f", "women", "womens", "woman", "ladies",
+        "fem", "femenino", "feminino", "feminine", "reserve", "reserves", "res",
+        "youth", "academy", "amateur", "cup", "trophy", "shield",
+    }
+)
+
+_DROP = re.compile(r"[.'’`]")
+_SPACE = re.compile(r"[^0-9a-z]+")
+_NUMBER = re.compile(r"\d+")
+
+
+@dataclass(frozen=True)
+class AliasMatch:
+    canonical: str
+    score: float
+    alias: str
+
+
+def fold(text: str) -> str:
+    """Casefold, strip accents and punctuation: 'Atlético F.C.' -> 'atletico fc'."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = _DROP.sub("", text.casefold())
+    return _SPACE.sub(" ", text).strip()
+
+
+def _token_match(a: str, b: str) -> bool:
+    if a == b:
+        return True
+    if len(a) < MIN_PREFIX or len(b) < MIN_PREFIX:
+        return False
+    if a.startswith(b) or b.startswith(a):
+        return True
+    return SequenceMatcher(None, a, b).ratio() >= TOKEN_MIN_RATIO
+
+
+def _compatible(query: str, key: str) -> bool:
+    """Whether ``key`` can be a misspelling of ``query`` rather than another
+    team or competition: same qualifiers, and no unexplained query tokens
+    ("Welsh Premier League" is not "Premier League")."""
+    query_tokens = query.split()
+    key_tokens = key.split()
+    if QUALIFIER_TOKENS.intersection(query_tokens) != QUALIFIER_TOKENS.intersection(key_tokens):
+        return False
+    return all(any(_token_match(t, other) for other in key_tokens) for t in query_tokens)
+
+
+def _grams(key: str) -> set[str]:
+    padded = f" {key} "
+    if len(padded) <= NGRAM:
+        return {padded}
+    return {padded[i : i + NGRAM] for i in range(len(padded) - NGRAM + 1)}
+
+
+class AliasIndex:
+    """Resolves raw names to canonicals from an alias -> canonical mapping.
+
+    Lookup order: the raw string itself, its folded key, the folded key
+    without ``ignore_tokens`` (e.g. "fc"), then the n-gram index. Fuzzy hits
+    need ``min_score``, the same numbers and qualifiers as the alias ("Liga
+    2", "U21", "Barcelona B"), a counterpart for every query token and a
+    ``margin`` over any other canonical, so close calls between two clubs
+    resolve to nothing rather than the wrong one. ``exact`` skips the fuzzy
+    step. Results, misses included, are memoized per raw string.
+    """
+
+    def __init__(
+        self,
+        mapping: Dict[str, str],
+        *,
+        ignore_tokens: Iterable[str] = (),
+        fuzzy: bool = True,
+        min_score: float = DEFAULT_MIN_SCORE,
+        margin: float = DEFAULT_MARGIN,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ):
+        self.mapping = mapping
+        self.ignore_tokens = frozenset(ignore_tokens)
+        self.fuzzy = fuzzy
+        self.min_score = min_score
+        self.margin = margin
+
+        self._exact: dict[str, str] = {}
+        ambiguous: set[str] = set()
+        keys: dict[str, str] = {}
+        for alias, canonical in mapping.items():
+            for key in {fold(alias), self._strip(fold(alias))}:
+                if not key:
+                    continue
+                known = self._exact.get(key)
+                if known is not None and known != canonical:
+                    ambiguous.add(key)
+                self._exact[key] = canonical
+                keys.setdefault(key, alias)
+        for key in ambiguous:
+            del self._exact[key]
+            keys.pop(key, None)
+
+        self._keys: list[str] = []
+        self._aliases: list[str] = []
+        self._canonicals: list[str] = []
+        self._grams: list[frozenset[str]] = []
+        postings: dict[str, list[int]] = defaultdict(list)
+        for key, alias in keys.items():
+            key_id = len(self._keys)
+            grams = _grams(key)
+            self._keys.append(key)
+            self._aliases.append(alias)
+            self._canonicals.append(self._exact[key])
+            self._grams.append(frozenset(grams))
+            for gram in grams:
+                postings[gram].append(key_id)
+        self._postings = dict(postings)
+        self._key_alias = keys
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+        self.exact = lru_cache(maxsize=cache_size)(self._resolve_exact)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _strip(self, key: str) -> str:
+        if not self.ignore_tokens:
+            return key
+        return " ".join(token for token in key.split() if token not in self.ignore_tokens)
+
+    def _resolve_exact(self, raw: str) -> Optional[AliasMatch]:
+        if not isinstance(raw, str):
+            return None
+        canonical = self.mapping.get(raw)
+        if canonical is not None:
+            return AliasMatch(canonical, 1.0, raw)
+        key = fold(raw)
+        for candidate in (key, self._strip(key)):
+            canonical = self._exact.get(candidate)
+            if canonical is not None:
+                return AliasMatch(canonical, 1.0, self._key_alias.get(candidate, raw))
+        return None
+
+    def _resolve(self, raw: str) -> Optional[AliasMatch]:
+        match = self.exact(raw)
+        if match is not None or not self.fuzzy or not isinstance(raw, str):
+            return match
+        key = fold(raw)
+        match = self._fuzzy(self._strip(key) or key)
+        if match is not None:
+            logger.info(
+                "Fuzzy alias match",
+                extra={"raw": raw, "alias": match.alias, "score": round(match.score, 3)},
+            )
+        return match
+
+    def _fuzzy(self, key: str) -> Optional[AliasMatch]:
+        if not key:
+            return None
+        grams = _grams(key)
+        # Candidates come from the rarest grams only, then get an exact score.
+        postings = sorted(
+            (self._postings[gram] for gram in grams if gram in self._postings), key=len
+        )
+        probes: list[list[int]] = []
+        scanned = 0
+        for posting in postings[:MAX_PROBE_GRAMS]:
+            if len(probes) >= MIN_PROBE_GRAMS and scanned + len(posting) > MAX_POSTINGS_SCANNED:
+                break
+            probes.append(posting)
+            scanned += len(posting)
+        shared = Counter(chain.from_iterable(probes))
+        if not shared:
+            return None
+        candidates = [key_id for key_id, _count in shared.most_common(MAX_CANDIDATES)]
+
+        numbers = _NUMBER.findall(key)
+        best: dict[str, tuple[float, int]] = {}
+        for key_id in candidates:
+            if _NUMBER.findall(self._keys[key_id]) != numbers:
+                continue
+            other = self._grams[key_id]
+            score = 2.0 * len(grams & other) / (len(grams) + len(other))
+            canonical = self._canonicals[key_id]
+            if score <= best.get(canonical, (0.0, -1))[0]:
+                continue
+            if score >= self.min_score and not _compatible(key, self._keys[key_id]):
+                continue
+            best[canonical] = (score, key_id)
+
+        if not best:
+            return None
+        ranked = sorted(best.items(), key=lambda item: item[1][0], reverse=True)
+        canonical, (score, key_id) = ranked[0]
+        if score < self.min_score:
+            return None
+        if len(ranked) > 1 and score - ranked[1][1][0] < self.margin:
+            return None
+        return AliasMatch(canonical, score, self._aliases[key_id])
+
+    def cache_info(self):
+        return self.resolve.cache_info()
+
+    def cache_clear(self) -> None:
+        self.resolve.cache_clear()
+        self.exact.cache_clear()
@@ -0,0 +1,93 @@
+"""Memoized kickoff parsing and event-uid hashing, with hit/miss counters."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from functools import lru_cache
+
+from utils.hashing import stable_hash
+from utils.time import to_utc
+
+KICKOFF_CACHE_SIZE = 65536
+UID_CACHE_SIZE = 131072
+
+
+@lru_cache(maxsize=KICKOFF_CACHE_SIZE)
+def _parse_kickoff_text(value: str) -> datetime:
+    return to_utc(datetime.fromisoformat(value.replace("Z", "+00:00")))
+
+
+def parse_kickoff_utc(value: datetime | str) -> datetime:
+    """ISO-8601 string (``Z`` allowed) or datetime -> aware UTC datetime."""
+    if isinstance(value, datetime):
+        return to_utc(value)
+    if isinstance(value, str):
+        return _parse_kickoff_text(value)
+    raise TypeError("kickoff_time must be datetime or ISO-8601 string")
+
+
+@lru_cache(maxsize=UID_CACHE_SIZE)
+def event_uid_for(league: str, home_team: str, away_team: str, kickoff_iso: str) -> str:
+    # Keyed on the isoformat string rather than the datetime: equal instants
+    # in different zones hash alike but produce different uids.
+    return stable_hash(f"{league}|{home_team}|{away_team}|{kickoff_iso}")
+
+
+def event_key_for(event_uid: str) -> int:
+    """Signed 64-bit surrogate for a hex ``event_uid``: its first 8 bytes.
+
+    Fits a BIGINT / SQLite INTEGER column. Distinct uids can share a key;
+    ``ingest.event_resolution.resolve_events`` refuses such collisions.
+    """
+    key = int(event_uid[:16], 16)
+    return key - (1 << 64) if key >= 1 << 63 else key
+
+
+def _counters(info) -> dict:
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+
+
+def cache_stats(team_normalizer=None, league_normalizer=None) -> dict[str, dict]:
+    """Cumulative counters for the kickoff, uid and (given) normalizer caches."""
+    stats = {
+        "kickoff": _counters(_parse_kickoff_text.cache_info()),
+        "event_uid": _counters(event_uid_for.cache_info()),
+    }
+    for name, normalizer in (("team", team_normalizer), ("league", league_normalizer)):
+        if normalizer is not None:
+            # normalize() goes through the exact-only cache unless fuzzy.
+            index = normalizer.index
+            info = index.cache_info() if normalizer.fuzzy else index.exact.cache_info()
+            stats[name] = _counters(info)
+    return stats
+
+
+class CacheReport:
+    """Turns cumulative ``cache_stats`` into per-cycle deltas."""
+
+    def __init__(self, team_normalizer=None, league_normalizer=None):
+        self.team_normalizer = team_normalizer
+        self.league_normalizer = league_normalizer
+        self._last = cache_stats(team_normalizer, league_normalizer)
+
+    def cycle(self) -> dict[str, dict]:
+        current = cache_stats(self.team_normalizer, self.league_normalizer)
+        delta = {}
+        for name, counters in current.items():
+            before = self._last.get(name, {"hits": 0, "misses": 0})
+            hits = counters["hits"] - before["hits"]
+            misses = counters["misses"] - before["misses"]
+            lookups = hits + misses
+            delta[name] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / lookups, 3) if lookups else None,
+                "size": counters["size"],
+            }
+        self._last = current
+        return delta
+
+
+def clear_caches() -> None:
+    _parse_kickoff_text.cache_clear()
+    event_uid_for.cache_clear()
@@ -0,0 +1,54 @@
+"""Fixture lookup that tolerates small kickoff-time differences between venues."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from config.settings import EVENT_KICKOFF_TOLERANCE_MINUTES
+from utils.time import to_utc
+
+DEFAULT_TOLERANCE = timedelta(minutes=EVENT_KICKOFF_TOLERANCE_MINUTES)
+
+
+class EventIndex:
+    """Maps (league, home, away, kickoff) to the event_key of a known fixture.
+
+    Events are bucketed by kickoff into slots one tolerance wide, so a
+    lookup reads at most three small buckets: O(1) however many fixtures
+    are indexed. The nearest kickoff within the tolerance wins.
+    """
+
+    def __init__(self, tolerance: timedelta = DEFAULT_TOLERANCE):
+        self.tolerance = tolerance
+        self._width = max(tolerance.total_seconds(), 1.0)
+        self._buckets: dict[tuple[str, str, str, int], list[tuple[float, int]]] = defaultdict(list)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _bucket(self, timestamp: float) -> int:
+        return int(timestamp // self._width)
+
+    def add(self, league: str, home: str, away: str, kickoff: datetime, event_key: int) -> None:
+        timestamp = to_utc(kickoff).timestamp()
+        self._buckets[(league, home, away, self._bucket(timestamp))].append((timestamp, event_key))
+        self._size += 1
+
+    def add_rows(self, rows: Iterable[tuple[str, str, str, datetime, int]]) -> None:
+        for league, home, away, kickoff, event_key in rows:
+            self.add(league, home, away, kickoff, event_key)
+
+    def lookup(self, league: str, home: str, away: str, kickoff: datetime) -> Optional[int]:
+        timestamp = to_utc(kickoff).timestamp()
+        limit = self.tolerance.total_seconds()
+        bucket = self._bucket(timestamp)
+        best: Optional[tuple[float, int]] = None
+        for slot in (bucket, bucket - 1, bucket + 1):
+            for other, event_key in self._buckets.get((league, home, away, slot), ()):
+                distance = abs(other - timestamp)
+                if distance <= limit and (best is None or distance < best[0]):
+                    best = (distance, event_key)
+        return best[1] if best else None
@@ -4,17 +4,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from utils.hashing import stable_hash
-from utils.time import to_utc
-
-
-def _parse_kickoff(kickoff_time: datetime | str) -> datetime:
-    if isinstance(kickoff_time, datetime):
-        return kickoff_time
-    if isinstance(kickoff_time, str):
-        value = kickoff_time.replace("Z", "+00:00")
-        return datetime.fromisoformat(value)
-    raise TypeError("kickoff_time must be datetime or ISO-8601 string")
+from normalization.cache import event_key_for, event_uid_for, parse_kickoff_utc
 
 
 def build_event_uid(
@@ -23,8 +13,7 @@ def build_event_uid(
     away_team: str,
     kickoff_utc: datetime,
 ) -> str:
-    payload = f"{league}|{home_team}|{away_team}|{kickoff_utc.isoformat()}"
-    return stable_hash(payload)
+    return event_uid_for(league, home_team, away_team, kickoff_utc.isoformat())
 
 
 def normalize_event(
@@ -43,8 +32,7 @@ def normalize_event(
     home_team = team_normalizer.normalize(home_team)
     away_team = team_normalizer.normalize(away_team)
 
-    kickoff_raw = _parse_kickoff(kickoff_time)
-    kickoff_utc = to_utc(kickoff_raw)
+    kickoff_utc = parse_kickoff_utc(kickoff_time)
 
     event_uid = build_event_uid(
         league=league,
@@ -54,6 +42,7 @@ def normalize_event(
     )
 
     return {
+        "event_key": event_key_for(event_uid),
         "event_uid": event_uid,
         "sport": sport,
         "league": league,
@@ -1,12 +1,26 @@
 """League name normalization."""
 
-from typing import Dict
+from typing import Dict, Optional
+
+from normalization.alias_index import DEFAULT_MARGIN, DEFAULT_MIN_SCORE, AliasIndex, AliasMatch
 
 
 class LeagueNormalizer:
-    def __init__(self, mapping: Dict[str, str]):
+    def __init__(
+        self,
+        mapping: Dict[str, str],
+        *,
+        fuzzy: bool = False,
+        min_score: float = DEFAULT_MIN_SCORE,
+        margin: float = DEFAULT_MARGIN,
+    ):
+        # ``match`` always reports fuzzy candidates that clear ``min_score``
+        # and beat the runner-up by ``margin``; ``normalize`` (and ``in``)
+        # only accepts them when ``fuzzy`` is set (see config.loaders).
         self.mapping = mapping
+        self.fuzzy = fuzzy
         self._validate_mapping()
+        self.index = AliasIndex(mapping, fuzzy=True, min_score=min_score, margin=margin)
 
     def _validate_mapping(self) -> None:
         reverse: dict[str, set[str]] = {}
@@ -19,8 +33,18 @@ class LeagueNormalizer:
                     f"League alias '{alias}' maps to multiple canonicals: {canonicals}"
                 )
 
+    def __contains__(self, league_name: object) -> bool:
+        return isinstance(league_name, str) and self._lookup(league_name) is not None
+
+    def _lookup(self, name: str) -> Optional[AliasMatch]:
+        return self.index.resolve(name) if self.fuzzy else self.index.exact(name)
+
+    def match(self, league_name: str) -> Optional[AliasMatch]:
+        """Best alias match with its confidence score, or None."""
+        return self.index.resolve(league_name)
+
     def normalize(self, league_name: str) -> str:
-        try:
-            return self.mapping[league_name]
-        except KeyError as exc:
-            raise KeyError(f"Unknown league alias: '{league_name}'") from exc
+        match = self._lookup(league_name)
+        if match is None:
+            raise KeyError(f"Unknown league alias: '{league_name}'")
+        return match.canonical
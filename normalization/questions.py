@@ -0,0 +1,207 @@
+"""Team and intent extraction from market question text."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from normalization.alias_index import fold
+
+INTENT_WIN = "win"
+INTENT_DRAW = "draw"
+INTENT_NOT_LOSE = "not_lose"
+INTENT_NOT_WIN = "not_win"
+
+# Folded phrases -> intent. Longer phrases win over the words inside them,
+# so "win or draw" is NOT_LOSE rather than WIN.
+INTENT_PHRASES = {
+    "win": INTENT_WIN,
+    "wins": INTENT_WIN,
+    "winner": INTENT_WIN,
+    "beat": INTENT_WIN,
+    "beats": INTENT_WIN,
+    "defeat": INTENT_WIN,
+    "draw": INTENT_DRAW,
+    "draws": INTENT_DRAW,
+    "tie": INTENT_DRAW,
+    "end in a draw": INTENT_DRAW,
+    "not lose": INTENT_NOT_LOSE,
+    "avoid defeat": INTENT_NOT_LOSE,
+    "win or draw": INTENT_NOT_LOSE,
+}
+
+# A win phrase right after one of these ("not win", "fail to beat") is
+# NOT_WIN; "to" between the two is skipped.
+NEGATION_WORDS = frozenset(
+    {"not", "never", "wont", "cant", "cannot", "dont", "doesnt", "fail", "fails", "failed"}
+)
+
+# Words allowed between the subject team and the intent ("Chelsea to win").
+SUBJECT_GAP_WORDS = frozenset({"to", "will", "can", "not", "fc", "afc"})
+
+# Aliases shorter than this are too likely to hit ordinary words.
+MIN_ALIAS_LENGTH = 3
+
+_TEAM = "team"
+_INTENT = "intent"
+
+
+@dataclass(frozen=True)
+class QuestionParse:
+    # Distinct teams in order of mention; ``subject`` is the one the intent
+    # applies to ("Will *Chelsea* beat Arsenal?"), when that is clear.
+    teams: tuple[str, ...]
+    intent: Optional[str]
+    subject: Optional[str] = None
+
+    @property
+    def opponent(self) -> Optional[str]:
+        if self.subject is None:
+            return None
+        others = [team for team in self.teams if team != self.subject]
+        return others[0] if others else None
+
+
+class AhoCorasick:
+    """Multi-pattern matcher; ``find`` is one pass over the text.
+
+    Patterns and text are expected pre-folded (lowercase words separated by
+    single spaces) and only whole-word matches are reported.
+    """
+
+    def __init__(self, patterns: Iterable[tuple[str, object]]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[tuple[int, object]]] = [[]]
+        for pattern, payload in patterns:
+            self._add(pattern, payload)
+        self._link()
+
+    def _add(self, pattern: str, payload: object) -> None:
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(pattern), payload))
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> list[tuple[int, int, object]]:
+        """Whole-word matches as (start, end, payload), leftmost-longest, non-overlapping."""
+        goto, fail, out = self._goto, self._fail, self._out
+        hits: list[tuple[int, int, object]] = []
+        state = 0
+        size = len(text)
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            if end < size and text[end] != " ":
+                continue
+            for length, payload in out[state]:
+                start = end - length
+                if start == 0 or text[start - 1] == " ":
+                    hits.append((start, end, payload))
+
+        hits.sort(key=lambda hit: (hit[0], hit[0] - hit[1]))
+        chosen: list[tuple[int, int, object]] = []
+        last_end = 0
+        for hit in hits:
+            if hit[0] >= last_end:
+                chosen.append(hit)
+                last_end = hit[1]
+        return chosen
+
+
+class QuestionParser:
+    """Pulls team mentions and the market intent out of a question.
+
+    Built once from every alias of a TeamNormalizer. A question is folded
+    the same way aliases are, then scanned once for teams and intent
+    phrases together.
+    """
+
+    def __init__(self, aliases: dict[str, str], ignore_tokens: Iterable[str] = ()):
+        ignore = frozenset(ignore_tokens)
+        patterns: dict[str, tuple[str, str]] = {}
+        ambiguous: set[str] = set()
+        for alias, canonical in aliases.items():
+            key = fold(alias)
+            stripped = " ".join(token for token in key.split() if token not in ignore)
+            for pattern in {key, stripped}:
+                if len(pattern) < MIN_ALIAS_LENGTH:
+                    continue
+                known = patterns.get(pattern)
+                if known is not None and known[1] != canonical:
+                    ambiguous.add(pattern)
+                patterns[pattern] = (_TEAM, canonical)
+        for pattern in ambiguous:
+            del patterns[pattern]
+        for phrase, intent in INTENT_PHRASES.items():
+            patterns.setdefault(phrase, (_INTENT, intent))
+        self._matcher = AhoCorasick(patterns.items())
+
+    @classmethod
+    def from_normalizer(cls, team_normalizer) -> "QuestionParser":
+        return cls(team_normalizer.mapping, getattr(team_normalizer.index, "ignore_tokens", ()))
+
+    def parse(self, question: str) -> QuestionParse:
+        text = fold(question or "")
+        teams: list[str] = []
+        intents: list[str] = []
+        subject = None
+        last_team: Optional[tuple[int, str]] = None
+        for start, end, (kind, value) in self._matcher.find(text):
+            if kind == _TEAM:
+                if value not in teams:
+                    teams.append(value)
+                last_team = (end, value)
+                continue
+            if not intents and last_team is not None:
+                gap = text[last_team[0] : start].split()
+                if all(word in SUBJECT_GAP_WORDS for word in gap):
+                    subject = last_team[1]
+            if value == INTENT_WIN and _negated(text, start):
+                value = INTENT_NOT_WIN
+            intents.append(value)
+        return QuestionParse(tuple(teams), _combine(intents), subject)
+
+
+def _negated(text: str, start: int) -> bool:
+    before = text[:start].split()[-2:]
+    if before and before[-1] == "to":
+        before = before[:-1]
+    return bool(before) and before[-1] in NEGATION_WORDS
+
+
+def _combine(intents: list[str]) -> Optional[str]:
+    if not intents:
+        return None
+    # A negated win is never a win market ("Will Chelsea not win?").
+    if INTENT_NOT_WIN in intents:
+        return INTENT_NOT_WIN
+    # Win plus draw in one question means "win or draw" ("beat or draw
+    # with", "win or tie"), whatever the phrasing.
+    if INTENT_NOT_LOSE in intents or (INTENT_WIN in intents and INTENT_DRAW in intents):
+        return INTENT_NOT_LOSE
+    return intents[0]
@@ -1,12 +1,32 @@
 """Team name normalization."""
 
-from typing import Dict
+from typing import Dict, Optional
+
+from normalization.alias_index import DEFAULT_MARGIN, DEFAULT_MIN_SCORE, AliasIndex, AliasMatch
+
+# Club-name tokens providers add or drop freely ("AFC Bournemouth").
+# "sc" is left out: "Barcelona SC" is a different club from Barcelona.
+CLUB_AFFIXES = frozenset({"fc", "afc", "cf", "cfc", "club"})
 
 
 class TeamNormalizer:
-    def __init__(self, mapping: Dict[str, str]):
+    def __init__(
+        self,
+        mapping: Dict[str, str],
+        *,
+        fuzzy: bool = False,
+        min_score: float = DEFAULT_MIN_SCORE,
+        margin: float = DEFAULT_MARGIN,
+    ):
+        # ``match`` always reports fuzzy candidates that clear ``min_score``
+        # and beat the runner-up by ``margin``; ``normalize`` only accepts
+        # them when ``fuzzy`` is set (see config.loaders).
         self.mapping = mapping
+        self.fuzzy = fuzzy
         self._validate_mapping()
+        self.index = AliasIndex(
+            mapping, ignore_tokens=CLUB_AFFIXES, fuzzy=True, min_score=min_score, margin=margin
+        )
 
     def _validate_mapping(self) -> None:
         reverse: dict[str, set[str]] = {}
@@ -19,8 +39,15 @@ class TeamNormalizer:
                     f"Alias '{alias}' maps to multiple canonicals: {canonicals}"
                 )
 
+    def _lookup(self, name: str) -> Optional[AliasMatch]:
+        return self.index.resolve(name) if self.fuzzy else self.index.exact(name)
+
+    def match(self, team_name: str) -> Optional[AliasMatch]:
+        """Best alias match with its confidence score, or None."""
+        return self.index.resolve(team_name)
+
     def normalize(self, team_name: str) -> str:
-        try:
-            return self.mapping[team_name]
-        except KeyError as exc:
-            raise KeyError(f"Unknown team alias: '{team_name}'") from exc
+        match = self._lookup(team_name)
+        if match is None:
+            raise KeyError(f"Unknown team alias: '{team_name}'")
+        return match.canonical
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
-import json
 import os
-from typing import Iterable
-
-import requests
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator
 
+from config.settings import POLYMARKET_PAGE_CONCURRENCY
+from utils.http import HttpTransport, RequestCounter, default_transport
+from utils.jsoncodec import decode_response, parse_json_lists
+from utils.ratelimit import PRIORITY_CATALOGUE, TokenBucket, venue_limiter
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -16,57 +18,112 @@ logger = get_logger(__name__)
 class PolymarketClient:
     BASE_URL = "https://gamma-api.polymarket.com"
 
-    def __init__(self, api_key: str | None = None):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        transport: HttpTransport | None = None,
+        limiter: TokenBucket | None = None,
+    ):
         self.api_key = api_key or os.getenv("POLYMARKET_API_KEY")
-        self.session = requests.Session()
+        self.transport = transport or default_transport()
+        self.limiter = limiter or venue_limiter("polymarket")
+        self.requests = RequestCounter()
+        self.headers = {"Accept": "application/json"}
         if self.api_key:
-            self.session.headers.update({"Authorization": f"Bearer {self.api_key}"})
-        self.session.headers.update({"Accept": "application/json"})
+            self.headers["Authorization"] = f"Bearer {self.api_key}"
 
     def get_markets(self, *, limit: int = 200) -> list[dict]:
-        markets: list[dict] = []
-        offset = 0
-        seen_ids: set[str] = set()
-
-        while True:
-            resp = self.session.get(
-                f"{self.BASE_URL}/markets",
-                params={"limit": limit, "offset": offset},
-                timeout=10,
-            )
-            resp.raise_for_status()
-            batch = resp.json()
-            if not batch:
-                break
-
-            normalized = self._normalize_batch(batch)
-            for item in normalized:
-                market_id = item.get("id")
-                if market_id and market_id in seen_ids:
-                    continue
-                if market_id:
-                    seen_ids.add(market_id)
-                markets.append(item)
-
-            if len(batch) < limit:
-                break
-            if len(seen_ids) == len(markets) and len(markets) > 0 and len(batch) == limit and offset > 0:
-                # Offset appears ineffective; avoid infinite pagination loop.
-                break
-            offset += limit
-
+        markets = list(self.iter_markets(limit=limit))
         logger.info("Fetched Polymarket markets", extra={"count": len(markets)})
         return markets
 
-    def _normalize_batch(self, batch: Iterable[dict]) -> list[dict]:
-        normalized = []
-        for market in batch:
-            normalized.append(self._normalize_market(market))
-        return normalized
+    def iter_markets(
+        self, *, limit: int = 200, concurrency: int = POLYMARKET_PAGE_CONCURRENCY
+    ) -> Iterator[dict]:
+        """Yield normalized markets while later pages are still downloading.
+
+        Up to ``concurrency`` pages are in flight, and the next offset is
+        requested as soon as any page arrives; markets are yielded in
+        arrival order. The first short page marks the end: nothing past it
+        is requested and in-flight pages beyond it are dropped. Paging also
+        stops when a full page brings no new market ids (the API is
+        ignoring ``offset``).
+        """
+        seen_ids: set[str] = set()
+        concurrency = max(1, concurrency)
+        pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="polymarket-page")
+        pending: dict[Future, int] = {}
+        next_offset = 0
+        # Offset of the first short page, once one has arrived.
+        end: int | None = None
+        try:
+            while True:
+                while end is None and len(pending) < concurrency:
+                    pending[pool.submit(self._fetch_page, next_offset, limit)] = next_offset
+                    next_offset += limit
+                if not pending:
+                    return
+
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    page_offset = pending.pop(future)
+                    if end is not None and page_offset > end:
+                        continue
+                    batch = future.result()
+                    if len(batch) < limit and (end is None or page_offset < end):
+                        end = page_offset
+                    fresh = 0
+                    for item in self._normalize_batch(batch):
+                        market_id = item.get("id")
+                        if market_id and market_id in seen_ids:
+                            continue
+                        if market_id:
+                            seen_ids.add(market_id)
+                        fresh += 1
+                        yield item
+                    if batch and fresh == 0:
+                        # Offset appears ineffective; avoid infinite pagination loop.
+                        return
+
+                if end is not None:
+                    for future, page_offset in list(pending.items()):
+                        if page_offset > end:
+                            future.cancel()
+                            del pending[future]
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch_page(self, offset: int, limit: int) -> list[dict]:
+        if self.limiter is not None:
+            self.limiter.acquire(1, PRIORITY_CATALOGUE)
+        self.requests.add()
+        resp = self.transport.get(
+            f"{self.BASE_URL}/markets",
+            params={"limit": limit, "offset": offset},
+            headers=self.headers,
+            limiter=self.limiter,
+        )
+        resp.raise_for_status()
+        return decode_response(resp) or []
 
-    def _normalize_market(self, market: dict) -> dict:
-        outcomes = _parse_json_list(market.get("outcomes"))
-        prices = _parse_json_list(market.get("outcomePrices"))
+    def _normalize_batch(self, batch: Iterable[dict]) -> list[dict]:
+        # The nested outcome strings of a whole page are decoded in one go.
+        batch = list(batch)
+        nested = parse_json_lists(
+            field for market in batch for field in (market.get("outcomes"), market.get("outcomePrices"))
+        )
+        return [
+            self._normalize_market(market, nested[2 * i], nested[2 * i + 1])
+            for i, market in enumerate(batch)
+        ]
+
+    def _normalize_market(
+        self, market: dict, outcomes: list | None = None, prices: list | None = None
+    ) -> dict:
+        if outcomes is None:
+            outcomes = _parse_json_list(market.get("outcomes"))
+        if prices is None:
+            prices = _parse_json_list(market.get("outcomePrices"))
 
         yes_price = None
         if outcomes and prices and len(outcomes) == len(prices):
@@ -103,17 +160,7 @@ class PolymarketClient:
 
 
 def _parse_json_list(value: object) -> list:
-    if value is None:
-        return []
-    if isinstance(value, list):
-        return value
-    if isinstance(value, str):
-        try:
-            parsed = json.loads(value)
-        except json.JSONDecodeError:
-            return []
-        return parsed if isinstance(parsed, list) else []
-    return []
+    return parse_json_lists([value])[0]
 
 
 def _safe_float(value: object) -> float | None:
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+from typing import Iterator
+
+from utils.http import RequestCounter
+
 
 class MockPolymarketClient:
     def __init__(self) -> None:
+        # Each listing stands for one page request.
+        self.requests = RequestCounter()
         self._markets = [
             {
                 "id": "pm-2001",
@@ -49,4 +55,9 @@ class MockPolymarketClient:
         ]
 
     def get_markets(self) -> list[dict]:
+        self.requests.add()
         return list(self._markets)
+
+    def iter_markets(self) -> Iterator[dict]:
+        self.requests.add()
+        return iter(list(self._markets))
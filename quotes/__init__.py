@@ -0,0 +1 @@
+"""In-process quote store shared by ingestors and the evaluator."""
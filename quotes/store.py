@@ -0,0 +1,174 @@
+"""Latest PM and exchange quotes per (event_key, team)."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Iterable, Iterator, Optional
+
+from exchanges.ladder import Ladder
+
+Key = tuple[int, str]
+
+
+class Quote:
+    __slots__ = (
+        "pm_market_id",
+        "pm_yes",
+        "pm_no",
+        "pm_updated",
+        "ex_market_id",
+        "ex_selection_id",
+        "back",
+        "lay",
+        "back_size",
+        "lay_size",
+        "back_ladder",
+        "lay_ladder",
+        "ex_updated",
+    )
+
+    def __init__(self) -> None:
+        self.pm_market_id: Optional[str] = None
+        self.pm_yes: Optional[float] = None
+        self.pm_no: Optional[float] = None
+        self.pm_updated = 0.0
+        self.ex_market_id: Optional[str] = None
+        self.ex_selection_id: Optional[str] = None
+        self.back: Optional[float] = None
+        self.lay: Optional[float] = None
+        self.back_size: Optional[float] = None
+        self.lay_size: Optional[float] = None
+        self.back_ladder: Optional[Ladder] = None
+        self.lay_ladder: Optional[Ladder] = None
+        self.ex_updated = 0.0
+
+    def pm_entry(self) -> Optional[tuple[float, float, str]]:
+        if self.pm_yes is None or self.pm_market_id is None:
+            return None
+        p_no = self.pm_no if self.pm_no is not None else 1.0 - self.pm_yes
+        return (self.pm_yes, p_no, self.pm_market_id)
+
+    def ex_entry(self) -> Optional[tuple]:
+        if self.ex_market_id is None:
+            return None
+        return (
+            self.ex_market_id,
+            self.ex_selection_id,
+            self.back,
+            self.lay,
+            self.back_ladder,
+            self.lay_ladder,
+        )
+
+
+def _top(ladder: Optional[Ladder]) -> Optional[float]:
+    return ladder.prices[0] if ladder else None
+
+
+def _size_at(ladder: Optional[Ladder], price: Optional[float]) -> Optional[float]:
+    if not ladder or price is None:
+        return None
+    for level_price, size in zip(ladder.prices, ladder.sizes):
+        if level_price == price:
+            return size
+    return None
+
+
+class QuoteStore:
+    """Thread-safe map of (event_key, team) -> Quote.
+
+    Ingestors call ``update_pm``/``update_exchange``; a key is marked dirty
+    only when its quote actually changed, and ``drain_dirty`` hands the
+    dirty set to the evaluator. The database is no longer needed to move
+    quotes between stages.
+    """
+
+    def __init__(self) -> None:
+        self._quotes: dict[Key, Quote] = {}
+        self._dirty: set[Key] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._quotes)
+
+    def get(self, key: Key) -> Optional[Quote]:
+        return self._quotes.get(key)
+
+    def update_pm(
+        self, key: Key, market_id: str, p_yes: float, p_no: Optional[float] = None
+    ) -> bool:
+        with self._lock:
+            quote = self._quotes.get(key)
+            if quote is None:
+                quote = self._quotes[key] = Quote()
+            if (quote.pm_market_id, quote.pm_yes, quote.pm_no) == (market_id, p_yes, p_no):
+                return False
+            quote.pm_market_id = market_id
+            quote.pm_yes = p_yes
+            quote.pm_no = p_no
+            quote.pm_updated = time.time()
+            self._dirty.add(key)
+            return True
+
+    def update_exchange(
+        self,
+        key: Key,
+        market_id: str,
+        selection_id: str,
+        back_ladder: Optional[Ladder],
+        lay_ladder: Optional[Ladder],
+        *,
+        best_back: Optional[float] = None,
+        best_lay: Optional[float] = None,
+    ) -> bool:
+        """Store a runner's book; return True if the quote changed.
+
+        ``best_back``/``best_lay`` override the ladders' first prices so a
+        caller can store the same best price it writes to the database.
+        """
+        back = best_back if best_back is not None else _top(back_ladder)
+        lay = best_lay if best_lay is not None else _top(lay_ladder)
+        back_levels = (back_ladder.prices, back_ladder.sizes) if back_ladder else None
+        lay_levels = (lay_ladder.prices, lay_ladder.sizes) if lay_ladder else None
+        with self._lock:
+            quote = self._quotes.get(key)
+            if quote is None:
+                quote = self._quotes[key] = Quote()
+            old_back = (quote.back_ladder.prices, quote.back_ladder.sizes) if quote.back_ladder else None
+            old_lay = (quote.lay_ladder.prices, quote.lay_ladder.sizes) if quote.lay_ladder else None
+            if (
+                quote.ex_market_id == market_id
+                and quote.ex_selection_id == selection_id
+                and (quote.back, quote.lay) == (back, lay)
+                and old_back == back_levels
+                and old_lay == lay_levels
+            ):
+                return False
+            quote.ex_market_id = market_id
+            quote.ex_selection_id = selection_id
+            quote.back = back
+            quote.lay = lay
+            quote.back_size = _size_at(back_ladder, back)
+            quote.lay_size = _size_at(lay_ladder, lay)
+            quote.back_ladder = back_ladder
+            quote.lay_ladder = lay_ladder
+            quote.ex_updated = time.time()
+            self._dirty.add(key)
+            return True
+
+    def drain_dirty(self) -> set[Key]:
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+        return dirty
+
+    def items(self, keys: Optional[Iterable[Key]] = None) -> Iterator[tuple[Key, Quote]]:
+        if keys is None:
+            with self._lock:
+                snapshot = list(self._quotes.items())
+            yield from snapshot
+            return
+        for key in keys:
+            quote = self._quotes.get(key)
+            if quote is not None:
+                yield key, quote
@@ -0,0 +1,6 @@
+"""Record venue HTTP traffic and serve it back offline."""
+
+from replay.recorder import TrafficRecorder
+from replay.transport import ReplayTransport
+
+__all__ = ["ReplayTransport", "TrafficRecorder"]
@@ -0,0 +1,132 @@
+"""Append-only, gzip-compressed capture of HTTP exchanges."""
+
+from __future__ import annotations
+
+import atexit
+import gzip
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Iterator, Optional
+
+# Response fields replaced before writing, so recordings carry no secrets.
+REDACT_KEYS = frozenset({"sessionToken", "token"})
+REDACTED = "REDACTED"
+
+# JSON body fields left out of the match key: they are derived from the
+# clock (Betfair's start-time window), so a replay never sends the same value.
+VOLATILE_BODY_KEYS = frozenset({"marketStartTime"})
+
+# Records buffered before the gzip stream is flushed to disk.
+FLUSH_EVERY = 100
+
+
+def request_key(method: str, url: str, params: Any = None, json_body: Any = None) -> str:
+    """Stable match key for a request.
+
+    Form bodies (the Betfair login) and client certs are deliberately left
+    out so a replay does not need the original credentials, and
+    ``VOLATILE_BODY_KEYS`` are dropped from JSON bodies.
+    """
+    canonical = json.dumps(
+        [method.upper(), url, params or {}, _stable(json_body)],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _stable(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _stable(v) for k, v in value.items() if k not in VOLATILE_BODY_KEYS}
+    if isinstance(value, list):
+        return [_stable(item) for item in value]
+    return value
+
+
+def _redact(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: REDACTED if k in REDACT_KEYS else _redact(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_redact(item) for item in value]
+    return value
+
+
+class TrafficRecorder:
+    """Appends one JSON line per completed request to a ``.jsonl.gz`` file.
+
+    Each process run appends a new gzip member, which ``gzip.open`` reads
+    back as one stream, so a file accumulates many sessions. Each line has
+    the match key, the URL, the offset since recording start, latency,
+    status, selected headers and the (redacted) body.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._handle = gzip.open(path, "at", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._unflushed = 0
+        self.recorded = 0
+        atexit.register(self.close)
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        request_kwargs: dict,
+        response,
+        elapsed: float,
+    ) -> None:
+        body = response.content.decode(response.encoding or "utf-8", errors="replace")
+        try:
+            body = json.dumps(_redact(json.loads(body)), separators=(",", ":"))
+        except ValueError:
+            pass
+        line = json.dumps(
+            {
+                "key": request_key(
+                    method, url, request_kwargs.get("params"), request_kwargs.get("json")
+                ),
+                "method": method.upper(),
+                "url": url,
+                "t": round(time.monotonic() - self._started - elapsed, 6),
+                "elapsed": round(elapsed, 6),
+                "status": response.status_code,
+                "content_type": response.headers.get("Content-Type"),
+                "body": body,
+            },
+            separators=(",", ":"),
+        )
+        with self._lock:
+            self._handle.write(line + "\n")
+            self.recorded += 1
+            self._unflushed += 1
+            if self._unflushed >= FLUSH_EVERY:
+                self._handle.flush()
+                self._unflushed = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._handle.close()
+
+
+def read_records(path: str) -> Iterator[dict]:
+    """Yield recorded lines; a trailing member cut off by a crash is tolerated."""
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        try:
+            for line in handle:
+                line = line.strip()
+                if line:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        return
+        except EOFError:
+            return
+
+
+def open_recorder(path: Optional[str]) -> Optional[TrafficRecorder]:
+    return TrafficRecorder(path) if path else None
@@ -0,0 +1,105 @@
+"""Drop-in stand-in for ``utils.http.HttpTransport`` backed by a recording."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Optional
+
+import requests
+
+from replay.recorder import read_records, request_key
+
+
+class ReplayTransport:
+    """Serves recorded responses to the real venue clients.
+
+    Requests are matched on method, URL, query params and JSON body.
+    Repeated requests get the recorded responses in order, and the last one
+    repeats once they run out, so polling loops keep working. ``speed=None``
+    answers immediately; otherwise the recorded timeline is reproduced:
+    each response is held until its recorded offset plus latency, divided
+    by ``speed``, has passed since the first replayed request. Repeated
+    responses only wait their latency. Offsets restart with every session
+    appended to a file, so keep one session per recording when timing
+    matters.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        speed: Optional[float] = None,
+        sleep=time.sleep,
+        clock=time.monotonic,
+    ):
+        self.speed = speed
+        self._sleep = sleep
+        self._clock = clock
+        self._started: Optional[float] = None
+        self._lock = threading.Lock()
+        self._queues: dict[str, deque] = defaultdict(deque)
+        self._last: dict[str, dict] = {}
+        for record in read_records(path):
+            self._queues[record["key"]].append(record)
+        self.served = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        key = request_key(method, url, kwargs.get("params"), kwargs.get("json"))
+        with self._lock:
+            now = self._clock()
+            if self._started is None:
+                self._started = now
+            queue = self._queues.get(key)
+            repeated = not queue
+            if queue:
+                record = queue.popleft()
+                self._last[key] = record
+            else:
+                record = self._last.get(key)
+            if record is None:
+                self.misses += 1
+            else:
+                self.served += 1
+
+        if record is None:
+            return _response(method, url, 404, '{"error": "not recorded"}', "application/json")
+        if self.speed:
+            if repeated:
+                delay = record["elapsed"] / self.speed
+            else:
+                due = self._started + (record.get("t", 0.0) + record["elapsed"]) / self.speed
+                delay = due - now
+            if delay > 0:
+                self._sleep(delay)
+        return _response(method, url, record["status"], record["body"], record.get("content_type"))
+
+    def stats(self) -> dict[str, dict]:
+        with self._lock:
+            return {"replay": {"served": self.served, "misses": self.misses}}
+
+    def close(self) -> None:
+        pass
+
+
+def _response(method: str, url: str, status: int, body: str, content_type) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = body.encode("utf-8")
+    resp.encoding = "utf-8"
+    resp.url = url
+    resp.request = requests.Request(method, url).prepare()
+    if content_type:
+        resp.headers["Content-Type"] = content_type
+    return resp
@@ -0,0 +1 @@
+"""Polling scheduler for daemon mode."""
@@ -0,0 +1,254 @@
+"""Long-running ingest/evaluate loop driven by the Scheduler."""
+
+from __future__ import annotations
+
+import threading
+from typing import Optional
+
+from arb_evaluator import ArbEvaluator
+from db.models import Event
+from ingest.events import ingest_events
+from ingest.exchange_markets import fetch_event_markets, ingest_market_books
+from normalization.cache import CacheReport
+from scheduling.priorities import book_poll_interval
+from scheduling.scheduler import RequestBudget, Scheduler
+from streaming.cache import OrderBookCache
+from streaming.client import StreamClient
+from streaming.ingest import flush_stream_quotes, publish_stream_quotes, register_runners
+from utils.logging import get_logger
+from utils.ratelimit import limiter_stats
+
+logger = get_logger(__name__)
+
+CATALOGUE_POLL_SECONDS = 900.0
+POLYMARKET_POLL_SECONDS = 30.0
+EVALUATE_SECONDS = 1.0
+STATS_SECONDS = 60.0
+# Longest the book job sleeps, so newly catalogued events start promptly.
+BOOK_IDLE_SECONDS = 5.0
+BOOK_JOB = "books"
+# How often streamed book changes are handed to the evaluator.
+STREAM_FLUSH_SECONDS = 0.05
+
+# Requests per minute the daemon may spend on each venue.
+VENUE_REQUESTS_PER_MINUTE = {
+    "betfair": 300,
+    "betdex": 600,
+    "polymarket": 120,
+}
+
+
+class ArbDaemon:
+    """Polls catalogues rarely and books often, re-evaluating changed keys.
+
+    The catalogue job caches each exchange event's match-odds market. One
+    book job then fetches the books of every event that is due in a single
+    ``list_market_books`` batch; each event's interval tightens as kickoff
+    approaches (see ``book_poll_interval``) and finished events drop out.
+    Polymarket is polled as one catalogue job. Each job is charged to its
+    venue's ``RequestBudget`` for the requests it actually sent (see
+    ``utils.http.RequestCounter``); a book tick with nothing due is free.
+
+    With ``stream_address`` ("host:port") books are polled once per
+    catalogue refresh to seed the runner rows, then kept current by a
+    ``StreamClient``; changed keys are evaluated every
+    ``STREAM_FLUSH_SECONDS``.
+    """
+
+    def __init__(
+        self,
+        session,
+        *,
+        exchange=None,
+        pm_ingestor=None,
+        team_normalizer=None,
+        league_normalizer=None,
+        evaluator: Optional[ArbEvaluator] = None,
+        quote_store=None,
+        writer=None,
+        scheduler: Optional[Scheduler] = None,
+        stream_address: Optional[str] = None,
+    ):
+        self.session = session
+        self.exchange = exchange
+        self.pm_ingestor = pm_ingestor
+        self.team_normalizer = team_normalizer
+        self.league_normalizer = league_normalizer
+        self.quote_store = quote_store
+        self.writer = writer
+        self.evaluator = evaluator or ArbEvaluator(writer=writer, quote_store=quote_store)
+        self.scheduler = scheduler or Scheduler(
+            {venue: RequestBudget(limit) for venue, limit in VENUE_REQUESTS_PER_MINUTE.items()}
+        )
+        self.cache_report = CacheReport(team_normalizer, league_normalizer)
+        self.pending_keys: set[tuple[int, str]] = set()
+        # event_key -> (event, market_id, market_name), from the catalogue job.
+        self._markets: dict[int, tuple[Event, str, Optional[str]]] = {}
+        self._book_due: dict[int, float] = {}
+        self.stream_address = stream_address
+        self.stream_cache = OrderBookCache() if stream_address else None
+        self._stream: Optional[StreamClient] = None
+        self._stream_markets: list[str] = []
+        self.latest_results: list = []
+        self._evaluated_once = False
+
+    def start(self) -> None:
+        if self.exchange is not None:
+            self.scheduler.schedule(
+                "catalogue:exchange", self._refresh_exchange_catalogue, venue=self.exchange.platform
+            )
+        if self.pm_ingestor is not None:
+            self.scheduler.schedule("catalogue:polymarket", self._poll_polymarket, venue="polymarket")
+        if self.stream_cache is not None:
+            self.scheduler.schedule("stream", self._flush_stream, delay=STREAM_FLUSH_SECONDS)
+        self.scheduler.schedule("evaluate", self._evaluate, delay=EVALUATE_SECONDS)
+        self.scheduler.schedule("stats", self._log_stats, delay=STATS_SECONDS)
+
+    def run_forever(self, stop: Optional[threading.Event] = None) -> None:
+        self.start()
+        try:
+            self.scheduler.run_forever(stop)
+        finally:
+            self.stop_stream()
+
+    def stop_stream(self) -> None:
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream = None
+
+    def _provider_id(self, event: Event) -> Optional[str]:
+        return event.betfair_id if self.exchange.platform == "betfair" else event.betdex_id
+
+    def _charge(self, venue: str, source, before: Optional[int], estimate: int) -> None:
+        # Spend the requests ``source`` sent since ``before``; clients
+        # without a request counter are charged ``estimate``.
+        after = _sent(source)
+        used = after - before if after is not None and before is not None else estimate
+        self.scheduler.spend(venue, used)
+
+    def _refresh_exchange_catalogue(self) -> float:
+        before = _sent(self.exchange)
+        ingest_events(
+            session=self.session,
+            adapter=self.exchange,
+            team_normalizer=self.team_normalizer,
+            league_normalizer=self.league_normalizer,
+        )
+        id_column = Event.betfair_id if self.exchange.platform == "betfair" else Event.betdex_id
+        events = self.session.query(Event).filter(id_column.isnot(None)).all()
+        pollable = [e for e in events if book_poll_interval(e.kickoff_time, e.status) is not None]
+        markets = fetch_event_markets(self.exchange, pollable)
+        self._markets = {market[0].event_key: market for market in markets}
+        now = self.scheduler.now()
+        added = 0
+        for event_key in self._markets:
+            if event_key not in self._book_due:
+                self._book_due[event_key] = now
+                added += 1
+        for event_key in list(self._book_due):
+            if event_key not in self._markets:
+                del self._book_due[event_key]
+        if self.stream_cache is not None:
+            self._resubscribe()
+        elif BOOK_JOB not in self.scheduler:
+            self.scheduler.schedule(BOOK_JOB, self._poll_books, venue=self.exchange.platform)
+        # One listing plus one market lookup per pollable event.
+        self._charge(self.exchange.platform, self.exchange, before, 1 + len(pollable))
+        logger.info(
+            "Exchange catalogue refreshed",
+            extra={"events": len(events), "markets": len(self._markets), "new_markets": added},
+        )
+        return CATALOGUE_POLL_SECONDS
+
+    def _poll_books(self) -> float:
+        now = self.scheduler.now()
+        due = []
+        for event_key, market in list(self._markets.items()):
+            if self._book_due.get(event_key, now) > now:
+                continue
+            event = market[0]
+            interval = book_poll_interval(event.kickoff_time, event.status)
+            if interval is None:
+                del self._markets[event_key]
+                self._book_due.pop(event_key, None)
+                continue
+            self._book_due[event_key] = now + interval
+            due.append(market)
+        if due:
+            before = _sent(self.exchange)
+            self.pending_keys |= ingest_market_books(
+                self.session,
+                self.exchange,
+                due,
+                quote_store=self.quote_store,
+                writer=self.writer,
+            )
+            batched = getattr(self.exchange, "list_market_books", None) is not None
+            self._charge(self.exchange.platform, self.exchange, before, 1 if batched else len(due))
+        next_due = min(self._book_due.values(), default=now + BOOK_IDLE_SECONDS)
+        return min(max(next_due - now, 0.0), BOOK_IDLE_SECONDS)
+
+    def _resubscribe(self) -> None:
+        # Seed rows and quotes for new markets, then (re)subscribe when the
+        # market set changed or the previous stream ended.
+        markets = list(self._markets.values())
+        self.pending_keys |= ingest_market_books(
+            self.session,
+            self.exchange,
+            markets,
+            quote_store=self.quote_store,
+            writer=None,
+        )
+        market_ids = register_runners(self.session, self.stream_cache, self.exchange.platform)
+        live = self._stream is not None and not self._stream.done.is_set()
+        if live and sorted(market_ids) == self._stream_markets:
+            return
+        self.stop_stream()
+        if not market_ids:
+            return
+        host, _sep, port = self.stream_address.rpartition(":")
+        self._stream = StreamClient(host or "127.0.0.1", int(port), self.stream_cache, market_ids).start()
+        self._stream_markets = sorted(market_ids)
+        logger.info("Stream subscribed", extra={"address": self.stream_address, "markets": len(market_ids)})
+
+    def _flush_stream(self) -> float:
+        if self.quote_store is not None:
+            keys = publish_stream_quotes(self.stream_cache, self.quote_store)
+        else:
+            keys = flush_stream_quotes(self.session, self.stream_cache, self.exchange.platform)
+        if keys and self._evaluated_once:
+            self.pending_keys |= keys
+            self._evaluate()
+        return STREAM_FLUSH_SECONDS
+
+    def _poll_polymarket(self) -> float:
+        client = self.pm_ingestor.client
+        before = _sent(client)
+        self.pending_keys |= self.pm_ingestor.ingest(self.session)
+        self._charge("polymarket", client, before, 1)
+        return POLYMARKET_POLL_SECONDS
+
+    def _evaluate(self) -> float:
+        if not self._evaluated_once:
+            self.latest_results = self.evaluator.evaluate(self.session)
+            self._evaluated_once = True
+        elif self.pending_keys or self.quote_store is not None:
+            keys, self.pending_keys = self.pending_keys, set()
+            if self.quote_store is not None:
+                keys |= self.quote_store.drain_dirty()
+            if keys:
+                self.latest_results = self.evaluator.evaluate(self.session, keys)
+        return EVALUATE_SECONDS
+
+    def _log_stats(self) -> float:
+        logger.info("Scheduler stats", extra=self.scheduler.stats())
+        throttling = limiter_stats()
+        if throttling:
+            logger.info("Rate limiter stats", extra={"venues": throttling})
+        logger.info("Normalization cache", extra={"caches": self.cache_report.cycle()})
+        return STATS_SECONDS
+
+
+def _sent(source) -> Optional[int]:
+    counter = getattr(source, "requests", None)
+    return counter.value if counter is not None else None
@@ -0,0 +1,40 @@
+"""Kickoff-aware polling intervals."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from utils.time import to_utc
+
+# (time until kickoff, book poll interval in seconds), nearest first.
+BOOK_POLL_TIERS: list[tuple[timedelta, float]] = [
+    (timedelta(minutes=15), 5.0),
+    (timedelta(hours=1), 15.0),
+    (timedelta(hours=6), 60.0),
+    (timedelta(hours=24), 300.0),
+]
+FAR_BOOK_POLL_SECONDS = 900.0
+LIVE_BOOK_POLL_SECONDS = 5.0
+# Events are treated as finished this long after kickoff.
+MATCH_WINDOW = timedelta(hours=3)
+
+DONE_STATUSES = {"FINISHED", "CANCELLED", "POSTPONED"}
+
+
+def book_poll_interval(
+    kickoff_time: datetime, status: str, now: Optional[datetime] = None
+) -> Optional[float]:
+    """Seconds between book polls for an event, or None to stop polling it."""
+    if status in DONE_STATUSES:
+        return None
+    now = now or datetime.now(timezone.utc)
+    until_kickoff = to_utc(kickoff_time) - now
+    if until_kickoff <= timedelta(0):
+        if -until_kickoff > MATCH_WINDOW:
+            return None
+        return LIVE_BOOK_POLL_SECONDS
+    for horizon, interval in BOOK_POLL_TIERS:
+        if until_kickoff <= horizon:
+            return interval
+    return FAR_BOOK_POLL_SECONDS
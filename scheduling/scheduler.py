@@ -0,0 +1,179 @@
+"""Due-time scheduler with per-venue request budgets."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# A job runs once and returns the delay until its next run, or None to stop.
+Job = Callable[[], Optional[float]]
+
+
+class RequestBudget:
+    """At most ``max_requests`` per rolling ``window`` seconds."""
+
+    def __init__(self, max_requests: int, window: float = 60.0, clock=time.monotonic):
+        self.max_requests = max_requests
+        self.window = window
+        self._clock = clock
+        self._sent: deque[float] = deque()
+
+    def _trim(self, now: float) -> None:
+        while self._sent and now - self._sent[0] >= self.window:
+            self._sent.popleft()
+
+    def available_in(self, cost: int = 1) -> float:
+        """Seconds until ``cost`` requests fit in the window (0 if they fit now)."""
+        now = self._clock()
+        self._trim(now)
+        overflow = len(self._sent) + cost - self.max_requests
+        if overflow <= 0:
+            return 0.0
+        if overflow > len(self._sent):
+            return self.window
+        return self._sent[overflow - 1] + self.window - now
+
+    def spend(self, cost: int = 1) -> None:
+        now = self._clock()
+        self._sent.extend([now] * cost)
+
+
+@dataclass(order=True)
+class _Entry:
+    due: float
+    seq: int
+    name: str = field(compare=False)
+    job: Job = field(compare=False)
+    venue: Optional[str] = field(compare=False, default=None)
+    cost: int = field(compare=False, default=0)
+
+
+class Scheduler:
+    """Runs named jobs when they fall due, in due-time order.
+
+    A job tied to a venue runs only when that venue's budget has room for
+    ``cost`` requests (at least one), and ``cost`` is spent up front. Jobs
+    whose request count is only known once they ran use ``cost=0`` and
+    report it with ``spend``. A job is pushed back until its budget fits. ``stats`` reports queue depth and how far behind schedule the
+    loop is running.
+    """
+
+    def __init__(
+        self,
+        budgets: Optional[dict[str, RequestBudget]] = None,
+        clock=time.monotonic,
+    ):
+        self.budgets = budgets or {}
+        self._clock = clock
+        self._heap: list[_Entry] = []
+        self._live: dict[str, _Entry] = {}
+        self._seq = itertools.count()
+        self.runs = 0
+        self.deferred = 0
+        self.failures = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._live
+
+    def now(self) -> float:
+        return self._clock()
+
+    def schedule(
+        self,
+        name: str,
+        job: Job,
+        *,
+        delay: float = 0.0,
+        venue: Optional[str] = None,
+        cost: int = 0,
+    ) -> None:
+        """Add or replace the job called ``name``."""
+        entry = _Entry(self._clock() + delay, next(self._seq), name, job, venue, cost)
+        self._live[name] = entry
+        heapq.heappush(self._heap, entry)
+
+    def spend(self, venue: str, cost: int) -> None:
+        """Charge ``cost`` requests a job made to ``venue``'s budget."""
+        budget = self.budgets.get(venue)
+        if budget is not None and cost > 0:
+            budget.spend(cost)
+
+    def cancel(self, name: str) -> None:
+        self._live.pop(name, None)
+
+    def _reschedule(self, entry: _Entry, delay: float) -> None:
+        self.schedule(entry.name, entry.job, delay=delay, venue=entry.venue, cost=entry.cost)
+
+    def run_pending(self) -> int:
+        """Run every job that is due now; returns how many ran."""
+        ran = 0
+        now = self._clock()
+        while self._heap and self._heap[0].due <= now:
+            entry = heapq.heappop(self._heap)
+            if self._live.get(entry.name) is not entry:
+                continue  # cancelled or replaced
+
+            budget = self.budgets.get(entry.venue) if entry.venue else None
+            if budget is not None:
+                wait = budget.available_in(max(entry.cost, 1))
+                if wait > 0:
+                    self.deferred += 1
+                    self._reschedule(entry, wait)
+                    continue
+                if entry.cost:
+                    budget.spend(entry.cost)
+
+            self.last_lag = now - entry.due
+            self.max_lag = max(self.max_lag, self.last_lag)
+            del self._live[entry.name]
+            try:
+                next_delay = entry.job()
+            except Exception:
+                self.failures += 1
+                logger.exception("Scheduled job failed", extra={"job": entry.name})
+                next_delay = None
+            self.runs += 1
+            ran += 1
+            if next_delay is not None and entry.name not in self._live:
+                self._reschedule(entry, next_delay)
+            now = self._clock()
+        return ran
+
+    def next_due_in(self) -> Optional[float]:
+        while self._heap and self._live.get(self._heap[0].name) is not self._heap[0]:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0].due - self._clock())
+
+    def run_forever(self, stop: Optional[threading.Event] = None, idle: float = 1.0) -> None:
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            self.run_pending()
+            wait = self.next_due_in()
+            stop.wait(idle if wait is None else min(wait, idle))
+
+    def stats(self) -> dict:
+        now = self._clock()
+        overdue = [e for e in self._live.values() if e.due <= now]
+        return {
+            "queue_depth": len(self._live),
+            "overdue": len(overdue),
+            "lag_seconds": max((now - e.due for e in overdue), default=0.0),
+            "last_lag_seconds": self.last_lag,
+            "max_lag_seconds": self.max_lag,
+            "runs": self.runs,
+            "deferred": self.deferred,
+            "failures": self.failures,
+        }
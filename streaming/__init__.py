@@ -0,0 +1 @@
+"""Push-based exchange market data (initial image + deltas)."""
@@ -0,0 +1,155 @@
+"""In-memory order-book cache fed by stream messages.
+
+Messages follow the exchange stream shape::
+
+    {"op": "mcm", "clk": "...", "pt": 1736538000000, "ct": "SUB_IMAGE",
+     "mc": [{"id": "mkt-1001", "img": true,
+             "rc": [{"id": "home", "atb": [[1.70, 250.0]], "atl": [[1.76, 200.0]]}]}]}
+
+``atb``/``atl`` entries are [price, size] levels; size 0 removes the level.
+``img`` (or ``ct == "SUB_IMAGE"``) replaces the market instead of patching it.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+from exchanges.ladder import Ladder
+
+Key = tuple[int, str]
+
+
+class RunnerBook:
+    __slots__ = ("back", "lay", "updated_at")
+
+    def __init__(self) -> None:
+        self.back: dict[float, float] = {}
+        self.lay: dict[float, float] = {}
+        self.updated_at = 0.0
+
+    def apply(self, atb: Optional[list], atl: Optional[list]) -> bool:
+        changed = _apply_levels(self.back, atb) | _apply_levels(self.lay, atl)
+        if changed:
+            self.updated_at = time.time()
+        return changed
+
+    def best_back(self) -> Optional[float]:
+        return max(self.back) if self.back else None
+
+    def best_lay(self) -> Optional[float]:
+        return min(self.lay) if self.lay else None
+
+    def back_ladder(self) -> Ladder:
+        return Ladder(sorted(self.back.items(), reverse=True))
+
+    def lay_ladder(self) -> Ladder:
+        return Ladder(sorted(self.lay.items()))
+
+
+def _apply_levels(side: dict[float, float], levels: Optional[list]) -> bool:
+    changed = False
+    for price, size in levels or []:
+        price = float(price)
+        size = float(size)
+        if size <= 0:
+            if side.pop(price, None) is not None:
+                changed = True
+        elif side.get(price) != size:
+            side[price] = size
+            changed = True
+    return changed
+
+
+class OrderBookCache:
+    """Order books per (market_id, selection_id), updated in place.
+
+    Runners registered with ``register`` are mapped to their (event_key,
+    team) key; every applied message reports the keys whose book moved,
+    both to the optional ``on_change`` callback and to ``drain``.
+    """
+
+    def __init__(self, on_change: Optional[Callable[[set[Key]], None]] = None):
+        self.on_change = on_change
+        self.clk: Optional[str] = None
+        self.last_latency_ms: Optional[float] = None
+        self.messages = 0
+        self._books: dict[tuple[str, str], RunnerBook] = {}
+        self._keys: dict[tuple[str, str], Key] = {}
+        self._dirty_runners: set[tuple[str, str]] = set()
+        self._dirty: set[Key] = set()
+        self._lock = threading.Lock()
+
+    def register(self, market_id: str, selection_id: str, event_key: int, team: str) -> None:
+        with self._lock:
+            self._keys[(str(market_id), str(selection_id))] = (event_key, team)
+
+    def key_for(self, market_id: str, selection_id: str) -> Optional[Key]:
+        return self._keys.get((str(market_id), str(selection_id)))
+
+    def book(self, market_id: str, selection_id: str) -> Optional[RunnerBook]:
+        return self._books.get((str(market_id), str(selection_id)))
+
+    def ladders(self, market_id: str, selection_id: str) -> tuple[Optional[Ladder], Optional[Ladder]]:
+        with self._lock:
+            book = self._books.get((str(market_id), str(selection_id)))
+            if book is None:
+                return None, None
+            return book.back_ladder(), book.lay_ladder()
+
+    def apply(self, message: dict) -> set[Key]:
+        changed_runners: set[tuple[str, str]] = set()
+        full_image = message.get("ct") == "SUB_IMAGE"
+        with self._lock:
+            for mc in message.get("mc") or []:
+                market_id = str(mc["id"])
+                if full_image or mc.get("img"):
+                    for runner_key in [k for k in self._books if k[0] == market_id]:
+                        del self._books[runner_key]
+                        changed_runners.add(runner_key)
+                for rc in mc.get("rc") or []:
+                    runner_key = (market_id, str(rc["id"]))
+                    book = self._books.get(runner_key)
+                    if book is None:
+                        book = self._books[runner_key] = RunnerBook()
+                    if book.apply(rc.get("atb"), rc.get("atl")):
+                        changed_runners.add(runner_key)
+
+            self.messages += 1
+            if message.get("clk"):
+                self.clk = message["clk"]
+            if message.get("pt"):
+                self.last_latency_ms = time.time() * 1000.0 - float(message["pt"])
+
+            self._dirty_runners |= changed_runners
+            changed = {self._keys[k] for k in changed_runners if k in self._keys}
+            self._dirty |= changed
+
+        if changed and self.on_change is not None:
+            self.on_change(changed)
+        return changed
+
+    def drain(self) -> tuple[set[Key], set[tuple[str, str]]]:
+        """Return and reset the (event_key, team) keys and runners changed so far."""
+        with self._lock:
+            keys, self._dirty = self._dirty, set()
+            runners, self._dirty_runners = self._dirty_runners, set()
+        return keys, runners
+
+    def quote_updates(self, platform: str, runners: Iterable[tuple[str, str]]) -> list[dict]:
+        """ExchangeMarket quote columns for ``runners``, keyed by row id."""
+        updates = []
+        with self._lock:
+            for market_id, selection_id in runners:
+                book = self._books.get((market_id, selection_id)) or RunnerBook()
+                updates.append(
+                    {
+                        "b_id": f"{platform}:{market_id}:{selection_id}",
+                        "best_back_odds": book.best_back(),
+                        "best_lay_odds": book.best_lay(),
+                        "back_ladder": book.back_ladder().encode() or None,
+                        "lay_ladder": book.lay_ladder().encode() or None,
+                    }
+                )
+        return updates
@@ -0,0 +1,83 @@
+"""Stream client that keeps an OrderBookCache current."""
+
+from __future__ import annotations
+
+import json
+import socket
+import threading
+from typing import Optional
+
+from streaming.cache import OrderBookCache
+from utils.jsoncodec import loads
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class StreamClient:
+    """Subscribes to ``market_ids`` and applies every ``mcm`` to ``cache``.
+
+    Runs on a background thread; ``stop`` closes the socket. ``done`` is
+    set when the server ends the stream.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        cache: OrderBookCache,
+        market_ids: list[str],
+        *,
+        connect_timeout: float = 10.0,
+    ):
+        self.host = host
+        self.port = port
+        self.cache = cache
+        self.market_ids = [str(m) for m in market_ids]
+        self.connect_timeout = connect_timeout
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "StreamClient":
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.connect_timeout)
+        self._sock.settimeout(None)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        subscription = {
+            "op": "marketSubscription",
+            "id": 1,
+            "marketFilter": {"marketIds": self.market_ids},
+        }
+        self._sock.sendall(json.dumps(subscription).encode("utf-8") + b"\r\n")
+        self._thread = threading.Thread(target=self._run, name="stream-client", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._sock.close()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+
+    def _run(self) -> None:
+        try:
+            with self._sock.makefile("rb") as stream:
+                for line in stream:
+                    message = loads(line)
+                    op = message.get("op")
+                    if op == "mcm":
+                        self.cache.apply(message)
+                    elif op == "status" and message.get("statusCode") != "SUCCESS":
+                        logger.warning("Stream status", extra={"status": message})
+        except OSError as exc:
+            self.error = exc
+        except Exception as exc:
+            self.error = exc
+            logger.exception("Stream client failed")
+        finally:
+            self.done.set()
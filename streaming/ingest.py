@@ -0,0 +1,62 @@
+"""Bridge between the stream order-book cache and the database."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import bindparam, select, update
+
+from db.models import ExchangeMarket
+from streaming.cache import Key, OrderBookCache
+
+
+def register_runners(session, cache: OrderBookCache, platform: str) -> list[str]:
+    """Map known ExchangeMarket runners into ``cache``; returns their market ids."""
+    market_ids: dict[str, None] = {}
+    stmt = select(
+        ExchangeMarket.market_id,
+        ExchangeMarket.selection_id,
+        ExchangeMarket.event_key,
+        ExchangeMarket.selection_name,
+    ).where(ExchangeMarket.platform == platform)
+    for market_id, selection_id, event_key, selection_name in session.execute(stmt):
+        cache.register(market_id, selection_id, event_key, selection_name)
+        market_ids[market_id] = None
+    return list(market_ids)
+
+
+def flush_stream_quotes(session, cache: OrderBookCache, platform: str) -> set[Key]:
+    """Write quotes for runners changed since the last flush; returns their keys.
+
+    The keys can be passed straight to ``ArbEvaluator.evaluate``.
+    """
+    keys, runners = cache.drain()
+    updates = cache.quote_updates(platform, runners)
+    if updates:
+        table = ExchangeMarket.__table__
+        session.execute(
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(
+                best_back_odds=bindparam("best_back_odds"),
+                best_lay_odds=bindparam("best_lay_odds"),
+                back_ladder=bindparam("back_ladder"),
+                lay_ladder=bindparam("lay_ladder"),
+                last_updated=datetime.now(timezone.utc),
+            ),
+            updates,
+        )
+        session.commit()
+    return keys
+
+
+def publish_stream_quotes(cache: OrderBookCache, quote_store) -> set[Key]:
+    """Push runners changed since the last drain into ``quote_store``."""
+    keys, runners = cache.drain()
+    for market_id, selection_id in runners:
+        key = cache.key_for(market_id, selection_id)
+        if key is None:
+            continue
+        back_ladder, lay_ladder = cache.ladders(market_id, selection_id)
+        quote_store.update_exchange(key, market_id, selection_id, back_ladder, lay_ladder)
+    return keys
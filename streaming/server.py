@@ -0,0 +1,206 @@
+"""Local stand-in for an exchange stream endpoint.
+
+Speaks line-delimited JSON over TCP: the client sends one
+``marketSubscription`` line and receives a ``connection`` line followed by
+``mcm`` messages from a recorded file or a synthetic generator. Lets the
+streaming path be built and measured offline.
+
+Usage: python -m streaming.server [--port N] [--record FILE] [--updates N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import random
+import socketserver
+import threading
+import time
+from typing import Callable, Iterable, Iterator, Optional
+
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Builds the message stream for one subscription (market ids may be empty).
+MessageSource = Callable[[list[str]], Iterable[dict]]
+
+
+def recorded_messages(path: str) -> MessageSource:
+    """Replay ``mcm`` messages from a .jsonl or .jsonl.gz file."""
+
+    def source(_market_ids: list[str]) -> Iterator[dict]:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+    return source
+
+
+def _levels(raw: list[dict]) -> list[list[float]]:
+    return [[float(level["price"]), float(level.get("size") or 0.0)] for level in raw or []]
+
+
+def synthetic_messages(
+    books: dict[str, dict], *, updates: int = 1000, interval: float = 0.0, seed: int = 7
+) -> MessageSource:
+    """Initial image of ``books`` (adapter book shape), then random deltas.
+
+    Each delta moves the size at one runner's best back or lay price, and
+    occasionally the price itself, ``interval`` seconds apart.
+    """
+
+    def source(market_ids: list[str]) -> Iterator[dict]:
+        rng = random.Random(seed)
+        wanted = [m for m in books if not market_ids or m in market_ids]
+        state: dict[tuple[str, str], dict[str, list[list[float]]]] = {}
+        image = []
+        for market_id in wanted:
+            rc = []
+            for runner in books[market_id].get("runners", []):
+                ex = runner.get("ex", {})
+                sides = {"atb": _levels(ex.get("availableToBack")), "atl": _levels(ex.get("availableToLay"))}
+                state[(market_id, str(runner["selectionId"]))] = sides
+                rc.append({"id": str(runner["selectionId"]), **sides})
+            image.append({"id": market_id, "img": True, "rc": rc})
+        clk = 0
+        yield {"op": "mcm", "ct": "SUB_IMAGE", "clk": str(clk), "mc": image}
+
+        runners = list(state)
+        for _ in range(updates if runners else 0):
+            if interval:
+                time.sleep(interval)
+            clk += 1
+            market_id, selection_id = rng.choice(runners)
+            side = rng.choice(["atb", "atl"])
+            levels = state[(market_id, selection_id)][side]
+            if not levels:
+                continue
+            price, _size = levels[0]
+            delta = []
+            if rng.random() < 0.2:
+                tick = 0.01 if side == "atl" else -0.01
+                delta.append([price, 0.0])
+                price = round(price + rng.choice([tick, -tick]), 2)
+            size = round(rng.uniform(10.0, 300.0), 2)
+            delta.append([price, size])
+            levels[0] = [price, size]
+            yield {
+                "op": "mcm",
+                "clk": str(clk),
+                "mc": [{"id": market_id, "rc": [{"id": selection_id, side: delta}]}],
+            }
+
+    return source
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        server: StreamServer = self.server.owner  # type: ignore[attr-defined]
+        line = self.rfile.readline()
+        if not line:
+            return
+        request = json.loads(line)
+        market_ids = [str(m) for m in request.get("marketFilter", {}).get("marketIds", [])]
+        self._send({"op": "connection", "connectionId": f"local-{id(self)}"})
+        self._send({"op": "status", "id": request.get("id"), "statusCode": "SUCCESS"})
+
+        last_pt: Optional[float] = None
+        started = time.time()
+        for message in server.source(market_ids):
+            if server.stopped.is_set():
+                return
+            recorded_pt = message.get("pt")
+            if server.realtime and recorded_pt is not None:
+                if last_pt is None:
+                    last_pt, started = float(recorded_pt), time.time()
+                wait = (float(recorded_pt) - last_pt) / 1000.0 - (time.time() - started)
+                if wait > 0:
+                    time.sleep(wait)
+            message = dict(message)
+            message["pt"] = time.time() * 1000.0
+            try:
+                self._send(message)
+            except (BrokenPipeError, ConnectionResetError):
+                return
+
+    def _send(self, message: dict) -> None:
+        self.wfile.write(json.dumps(message).encode("utf-8") + b"\r\n")
+        self.wfile.flush()
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class StreamServer:
+    """Threaded TCP stream server; ``address`` is known after ``start``.
+
+    With ``realtime`` set, recorded messages are paced by their ``pt``
+    timestamps; otherwise they are sent as fast as the socket allows.
+    """
+
+    def __init__(
+        self,
+        source: MessageSource,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        realtime: bool = False,
+    ):
+        self.source = source
+        self.realtime = realtime
+        self.stopped = threading.Event()
+        self._server = _TCPServer((host, port), _Handler)
+        self._server.owner = self  # type: ignore[attr-defined]
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self._server.server_address[:2]
+
+    def start(self) -> "StreamServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="stream-server", daemon=True
+        )
+        self._thread.start()
+        logger.info("Stream server listening", extra={"address": self.address})
+        return self
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def main() -> None:
+    from exchanges.betdex_mock_adapter import MockBetDEXAdapter
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=7000)
+    parser.add_argument("--record", help="jsonl(.gz) file of mcm messages to replay")
+    parser.add_argument("--realtime", action="store_true", help="pace recorded messages by pt")
+    parser.add_argument("--updates", type=int, default=10_000)
+    parser.add_argument("--interval", type=float, default=0.01)
+    args = parser.parse_args()
+
+    if args.record:
+        source = recorded_messages(args.record)
+    else:
+        source = synthetic_messages(
+            MockBetDEXAdapter()._books, updates=args.updates, interval=args.interval
+        )
+    server = StreamServer(source, port=args.port, realtime=args.realtime).start()
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
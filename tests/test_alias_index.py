@@ -0,0 +1,74 @@
+import pytest
+
+from config.loaders import load_league_normalizer, load_team_normalizer
+from normalization.leagues import LeagueNormalizer
+from normalization.teams import TeamNormalizer
+
+
+@pytest.mark.parametrize(
+    "raw",
+    ["Barcelona SC", "Barcelona B", "Real Madrid B", "Arsenal W", "Arsenal Women"],
+)
+def test_other_sides_do_not_resolve_to_first_team(raw):
+    teams = load_team_normalizer()
+    assert teams.match(raw) is None
+    with pytest.raises(KeyError):
+        teams.normalize(raw)
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "Premier League Women",
+        "Welsh Premier League",
+        "Irish Premier League",
+        "Kenyan Premier League",
+        "English Premier League Cup",
+        "La Liga F",
+        "Premier League 2",
+    ],
+)
+def test_other_competitions_do_not_resolve(raw):
+    leagues = load_league_normalizer()
+    assert leagues.match(raw) is None
+    assert raw not in leagues
+
+
+def test_exact_and_folded_aliases_resolve():
+    teams = load_team_normalizer()
+    assert teams.normalize("FC Barcelona") == "Barcelona"
+    assert teams.normalize("barcelona f.c.") == "Barcelona"
+    assert "Premier League" in load_league_normalizer()
+
+
+def test_fuzzy_is_report_only_unless_enabled():
+    mapping = {"Barcelona": "Barcelona", "Real Madrid": "Real Madrid"}
+    strict = TeamNormalizer(mapping)
+    assert strict.match("Barcelonaa").canonical == "Barcelona"
+    with pytest.raises(KeyError):
+        strict.normalize("Barcelonaa")
+    assert TeamNormalizer(mapping, fuzzy=True).normalize("Barcelonaa") == "Barcelona"
+
+    leagues = LeagueNormalizer({"La Liga": "La Liga"})
+    assert "La Ligaa" not in leagues
+    assert "La Ligaa" in LeagueNormalizer({"La Liga": "La Liga"}, fuzzy=True)
+
+
+def test_loaded_normalizers_accept_confident_fuzzy_matches():
+    teams = load_team_normalizer()
+    assert teams.fuzzy
+    assert teams.normalize("Barcelonaa") == "Barcelona"
+    assert "La Ligaa" in load_league_normalizer()
+
+
+def test_fuzzy_rejects_close_calls_between_canonicals():
+    mapping = {"Hamburg Wolves": "Hamburg Wolves"}
+    assert TeamNormalizer(mapping, fuzzy=True, margin=0.1).normalize("Hamburg Wolvs") == "Hamburg Wolves"
+
+    mapping["Hamburg Wolfs"] = "Hamburg Wolfs"
+    teams = TeamNormalizer(mapping, fuzzy=True, margin=0.1)
+    assert teams.match("Hamburg Wolvs") is None
+    with pytest.raises(KeyError):
+        teams.normalize("Hamburg Wolvs")
+    with pytest.raises(KeyError):
+        TeamNormalizer(mapping, fuzzy=True, min_score=0.95).normalize("Hamburg Wolvs")
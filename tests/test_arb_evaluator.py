@@ -0,0 +1,230 @@
+from dataclasses import astuple
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import update
+
+import arb_evaluator
+from arb_evaluator import (
+    BASE_STAKE_EUR,
+    MIN_EUR_PROFIT,
+    ArbEvaluator,
+    ArbResult,
+    _evaluate_pair,
+    _pair_rows,
+    _persist_results,
+    _size_with_depth,
+    evaluate_pairs,
+)
+from db.models import ArbitrageEvaluation, BinaryMarket, Event, ExchangeMarket
+from db.session import create_engine_and_session
+from exchanges.ladder import Ladder
+
+
+def _result(event_key, event_uid):
+    return ArbResult(
+        event_key=event_key,
+        team="Chelsea",
+        poly_market_id="pm-1",
+        betdex_market_id="mkt-1",
+        betdex_selection_id="7",
+        direction="PM_YES_vs_BDX_LAY",
+        pm_price=0.4,
+        bdx_odds=2.1,
+        stake_pm=5.0,
+        lay_stake_or_back_stake=3.0,
+        worst_case_profit=0.5,
+        profit_if_team_wins=0.5,
+        profit_if_team_not_win=0.6,
+        event_uid=event_uid,
+    )
+
+
+def test_results_without_event_uid_are_not_persisted():
+    _engine, session_local = create_engine_and_session("sqlite://")
+    session = session_local()
+    _persist_results(session, [_result(1, "ab" * 32), _result(2, None)])
+    assert [row.event_uid for row in session.query(ArbitrageEvaluation)] == ["ab" * 32]
+
+    _persist_results(session, [_result(2, None)])
+    assert session.query(ArbitrageEvaluation).count() == 1
+
+
+# PM YES at 0.40 against a lay at 2.2 clears the threshold at the fixed stake.
+_PAIR = (1, "Chelsea", "pm-1", 0.4, 0.62, "mkt-1", "7", None, 2.2)
+
+
+def _fixed():
+    (result,) = _evaluate_pair(_PAIR, min_profit=0.0)
+    assert result.stake_pm == BASE_STAKE_EUR
+    return result
+
+
+def test_single_level_ladder_reproduces_fixed_stake():
+    fixed = _fixed()
+    ladder = Ladder([(2.2, fixed.lay_stake_or_back_stake)])
+    sized = _size_with_depth(fixed, ladder, MIN_EUR_PROFIT)
+
+    assert sized.stake_pm == pytest.approx(fixed.stake_pm)
+    assert sized.lay_stake_or_back_stake == pytest.approx(fixed.lay_stake_or_back_stake)
+    assert sized.worst_case_profit == pytest.approx(fixed.worst_case_profit)
+    assert sized.bdx_odds == 2.2
+
+
+def test_multi_level_ladder_stops_where_worst_case_hits_threshold():
+    fixed = _fixed()
+    levels = [(2.2, 5.0), (2.3, 5.0), (2.6, 10.0), (2.9, 100.0)]
+    sized = _size_with_depth(fixed, Ladder(levels), MIN_EUR_PROFIT)
+
+    # The first three levels together still clear the threshold; the fourth
+    # is only taken in part, up to where the worst case reaches it.
+    assert 20.0 < sized.lay_stake_or_back_stake < 120.0
+    assert sized.worst_case_profit == pytest.approx(MIN_EUR_PROFIT, abs=1e-6)
+    assert sized.worst_case_profit >= MIN_EUR_PROFIT
+    assert sized.bdx_odds == pytest.approx(Ladder(levels).vwap(sized.lay_stake_or_back_stake))
+    assert sized.stake_pm > BASE_STAKE_EUR
+
+    # Without the fourth level, the whole book is taken.
+    whole = _size_with_depth(fixed, Ladder(levels[:3]), MIN_EUR_PROFIT)
+    assert whole.lay_stake_or_back_stake == pytest.approx(20.0)
+    assert whole.bdx_odds == pytest.approx(2.425)
+    assert whole.worst_case_profit > MIN_EUR_PROFIT
+
+
+def test_empty_or_thin_ladder_is_not_sized():
+    fixed = _fixed()
+    assert _size_with_depth(fixed, Ladder([]), MIN_EUR_PROFIT) is None
+    assert _size_with_depth(fixed, Ladder([(2.2, 0.1)]), MIN_EUR_PROFIT) is None
+    # The best level has no edge at all.
+    assert _size_with_depth(fixed, Ladder([(2.6, 100.0)]), MIN_EUR_PROFIT) is None
+
+
+def test_evaluate_pairs_sizes_only_pairs_with_a_ladder():
+    other = (2,) + _PAIR[1:]
+    ladders = {(1, "Chelsea"): (None, Ladder([(2.2, 5.0), (2.3, 5.0)]))}
+    sized, fixed = evaluate_pairs([_PAIR, other], vectorized=False, ladders=ladders)
+
+    assert sized.lay_stake_or_back_stake == pytest.approx(10.0)
+    assert fixed.stake_pm == BASE_STAKE_EUR
+
+
+NOW = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+
+def _session():
+    _engine, session_local = create_engine_and_session("sqlite://")
+    return session_local()
+
+
+def _seed(session, markets):
+    """``markets`` holds (event_key, team, pm_price, selection_name, best_lay)."""
+    for event_key in sorted({m[0] for m in markets}):
+        session.add(
+            Event(
+                event_key=event_key,
+                event_uid=f"{event_key:064x}",
+                sport="soccer",
+                league="Premier League",
+                home_team="Chelsea",
+                away_team="Arsenal",
+                kickoff_time=NOW,
+                status="SCHEDULED",
+            )
+        )
+    session.flush()
+    for i, (event_key, team, price, selection, lay) in enumerate(markets):
+        if price is not None:
+            session.add(
+                BinaryMarket(
+                    platform="polymarket",
+                    market_id=f"pm-{i}",
+                    event_key=event_key,
+                    team=team,
+                    question=f"Will {team} win?",
+                    yes_means=team,
+                    no_means=f"not {team}",
+                    price=price,
+                    last_updated=NOW,
+                )
+            )
+        if selection is not None:
+            session.add(
+                ExchangeMarket(
+                    id=f"betdex:mkt-{event_key}:{i}",
+                    platform="betdex",
+                    event_key=event_key,
+                    market_id=f"mkt-{event_key}",
+                    selection_id=str(i),
+                    selection_name=selection,
+                    best_lay_odds=lay,
+                    last_updated=NOW,
+                )
+            )
+    session.commit()
+
+
+def _set_lay(session, event_key, selection, lay):
+    session.execute(
+        update(ExchangeMarket)
+        .where(ExchangeMarket.event_key == event_key, ExchangeMarket.selection_name == selection)
+        .values(best_lay_odds=lay)
+    )
+    session.commit()
+
+
+def test_incremental_reload_matches_full_evaluation(monkeypatch):
+    session = _session()
+    _seed(
+        session,
+        [
+            (1, "Chelsea", 0.4, "Chelsea", 2.2),
+            (1, "Arsenal", 0.3, "Arsenal", 4.0),
+            (2, "Barcelona", 0.4, "Barcelona", 2.2),
+        ],
+    )
+    evaluator = ArbEvaluator(vectorized=False)
+    first = evaluator.evaluate(session)
+    assert {(r.event_key, r.team) for r in first} == {(1, "Chelsea"), (2, "Barcelona")}
+
+    # Chelsea loses its edge and Arsenal gains one.
+    _set_lay(session, 1, "Chelsea", 2.6)
+    _set_lay(session, 1, "Arsenal", 2.8)
+
+    repaired = []
+    real = arb_evaluator.evaluate_pairs
+
+    def spy(pairs, **kwargs):
+        repaired.extend((p[0], p[1]) for p in pairs)
+        return real(pairs, **kwargs)
+
+    monkeypatch.setattr(arb_evaluator, "evaluate_pairs", spy)
+    changed = {(1, "Chelsea"), (1, "Arsenal")}
+    incremental = evaluator.evaluate(session, changed)
+    assert sorted(repaired) == sorted(changed)
+
+    full = ArbEvaluator(vectorized=False).evaluate(session)
+    assert {(r.event_key, r.team) for r in incremental} == {(1, "Arsenal"), (2, "Barcelona")}
+    assert [astuple(r) for r in incremental] == [astuple(r) for r in full]
+
+
+def test_pair_rows_joins_on_event_key_and_team():
+    session = _session()
+    _seed(
+        session,
+        [
+            (1, "Chelsea", 0.4, "Chelsea", 2.2),
+            (1, "Arsenal", 0.3, None, None),
+            (1, "Draw", None, "The Draw", 3.4),
+            (2, "Barcelona", 0.55, "Barcelona", 1.9),
+            (3, "Girona", 0.2, None, None),
+        ],
+    )
+    # Only the Chelsea and Barcelona markets have a counterpart.
+    rows = sorted(_pair_rows(session), key=lambda row: row[0])
+    assert [key for key, _pm, _ex in rows] == [(1, "Chelsea"), (2, "Barcelona")]
+    key, (p_yes, p_no, pm_id), (market_id, selection_id, back, lay, back_ladder, lay_ladder) = rows[0]
+    assert (p_yes, p_no, pm_id) == (0.4, pytest.approx(0.6), "pm-0")
+    assert (market_id, selection_id, back, lay) == ("mkt-1", "0", None, 2.2)
+    assert back_ladder is None and lay_ladder is None
+
+    assert [key for key, _pm, _ex in _pair_rows(session, [2, 3])] == [(2, "Barcelona")]
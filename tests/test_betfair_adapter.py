@@ -0,0 +1,117 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from config.loaders import load_league_normalizer
+from exchanges.betfair_adapter import BetfairAdapter
+from ingestion.betfair.client import BetfairClient, RpcResult
+from replay.recorder import request_key
+from utils.http import RequestCounter
+
+COMPETITIONS = [
+    "Premier League",
+    "English Premier League",
+    "Welsh Premier League",
+    "Irish Premier League",
+    "Kenyan Premier League",
+    "Premier League Women",
+]
+
+
+class FakeBatch:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def add(self, method, params):
+        self.calls.append((method, params))
+
+    def send(self):
+        self.client.sent.extend(self.calls)
+        return [RpcResult(method, result=[]) for method, _params in self.calls]
+
+
+class FakeClient:
+    list_events_params = staticmethod(BetfairClient.list_events_params)
+
+    def __init__(self):
+        self.sent = []
+        self.windows = []
+
+    def list_competitions(self, start_window=None):
+        self.windows.append(start_window)
+        return [
+            {"competition": {"id": str(i), "name": name}}
+            for i, name in enumerate(COMPETITIONS)
+        ]
+
+    def batch(self):
+        return FakeBatch(self)
+
+
+def test_only_known_competitions_are_fetched():
+    client = FakeClient()
+    BetfairAdapter(client, league_normalizer=load_league_normalizer()).list_events()
+    fetched = {COMPETITIONS[int(params["filter"]["competitionIds"][0])] for _m, params in client.sent}
+    assert "Premier League" in fetched
+    assert fetched.isdisjoint(
+        {"Welsh Premier League", "Irish Premier League", "Kenyan Premier League", "Premier League Women"}
+    )
+
+
+def test_start_window_uses_injected_clock():
+    now = datetime(2026, 1, 1, 12, tzinfo=timezone.utc)
+    client = FakeClient()
+    BetfairAdapter(client, horizon_hours=24, clock=lambda: now).list_events()
+    start, end = client.windows[0]
+    assert end - now == timedelta(hours=24) and start < now
+
+
+def test_replay_key_ignores_start_window():
+    def body(hour):
+        window = (datetime(2026, 1, 1, hour, tzinfo=timezone.utc),) * 2
+        return BetfairClient.list_events_params("10932509", window)
+
+    url = BetfairClient.API_URL
+    assert request_key("POST", url, json_body=body(1)) == request_key("POST", url, json_body=body(9))
+    assert request_key("POST", url, json_body=body(1)) != request_key(
+        "POST", url, json_body=BetfairClient.list_events_params("1", None)
+    )
+
+
+class BookResponse:
+    def __init__(self, body):
+        self.content = json.dumps(body).encode()
+
+    def raise_for_status(self):
+        pass
+
+
+class BookTransport:
+    def __init__(self):
+        self.posts = []
+
+    def post(self, url, json=None, **kwargs):
+        self.posts.append(json)
+        return BookResponse(
+            [
+                {"id": call["id"], "result": [{"marketId": m, "runners": []} for m in call["params"]["marketIds"]]}
+                for call in json
+            ]
+        )
+
+
+def test_market_books_are_chunked_by_data_weight_in_one_post():
+    client = BetfairClient.__new__(BetfairClient)
+    client.transport = BookTransport()
+    client.limiter = None
+    client.headers = {}
+    client.requests = RequestCounter()
+    market_ids = [f"1.{i}" for i in range(100)]
+
+    books = BetfairAdapter(client).list_market_books(market_ids)
+
+    assert list(books) == market_ids
+    (post,) = client.transport.posts
+    # EX_BEST_OFFERS weighs 5, so 40 markets fit under the 200 cap.
+    assert [len(call["params"]["marketIds"]) for call in post] == [40, 40, 20]
+    assert {call["method"] for call in post} == {"SportsAPING/v1.0/listMarketBook"}
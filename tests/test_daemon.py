@@ -0,0 +1,121 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from config.loaders import load_league_normalizer, load_team_normalizer
+from db.session import create_engine_and_session
+from exchanges.betdex_mock_adapter import MockBetDEXAdapter
+from scheduling.daemon import ArbDaemon
+from scheduling.scheduler import RequestBudget, Scheduler
+
+
+class CountingAdapter(MockBetDEXAdapter):
+    def __init__(self):
+        super().__init__()
+        kickoff = (datetime.now(timezone.utc) + timedelta(minutes=10)).isoformat()
+        for event in self._events:
+            event["openDate"] = kickoff
+        self.calls = Counter()
+        self.batches = []
+
+    def list_markets(self, event_id):
+        self.calls["list_markets"] += 1
+        return super().list_markets(event_id)
+
+    def list_market_book(self, market_id):
+        self.calls["list_market_book"] += 1
+        return super().list_market_book(market_id)
+
+    def list_market_books(self, market_ids):
+        self.calls["list_market_books"] += 1
+        self.batches.append(len(market_ids))
+        return super().list_market_books(market_ids)
+
+
+def test_books_are_batched_and_catalogue_is_not_refetched():
+    now = [0.0]
+    adapter = CountingAdapter()
+    _engine, session_local = create_engine_and_session("sqlite://")
+    daemon = ArbDaemon(
+        session_local(),
+        exchange=adapter,
+        team_normalizer=load_team_normalizer(),
+        league_normalizer=load_league_normalizer(),
+        scheduler=Scheduler(clock=lambda: now[0]),
+    )
+    daemon.start()
+    for _ in range(12):  # 0s .. 11s; books poll every 5s this close to kickoff
+        daemon.scheduler.run_pending()
+        now[0] += 1.0
+
+    assert adapter.calls["list_markets"] == 3
+    assert adapter.calls["list_market_book"] == 0
+    assert adapter.calls["list_market_books"] == 3
+    assert adapter.batches == [3, 3, 3]
+
+
+class PerMarketAdapter(CountingAdapter):
+    # Like the real BetDEX REST API: no batched book endpoint.
+    list_market_books = None
+
+
+def _run_daemon(adapter, seconds):
+    now = [0.0]
+    budget = RequestBudget(1000, clock=lambda: now[0])
+    _engine, session_local = create_engine_and_session("sqlite://")
+    daemon = ArbDaemon(
+        session_local(),
+        exchange=adapter,
+        team_normalizer=load_team_normalizer(),
+        league_normalizer=load_league_normalizer(),
+        scheduler=Scheduler({"betdex": budget}, clock=lambda: now[0]),
+    )
+    daemon.start()
+    spent = []
+    for _ in range(seconds):
+        before = len(budget._sent)
+        daemon.scheduler.run_pending()
+        spent.append(len(budget._sent) - before)
+        now[0] += 1.0
+    return spent
+
+
+def test_budget_is_charged_per_request_sent():
+    # 0s: list_events + 3 list_markets, then one batched book request;
+    # books again at 5s and 10s; ticks with nothing due cost nothing.
+    assert _run_daemon(CountingAdapter(), 12) == [5, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0]
+    # Without a batch endpoint every due market is its own GET.
+    adapter = PerMarketAdapter()
+    assert _run_daemon(adapter, 12) == [7, 0, 0, 0, 0, 3, 0, 0, 0, 0, 3, 0]
+    assert adapter.calls["list_market_book"] == 9
+
+
+def test_stream_mode_seeds_once_then_follows_the_stream():
+    import time
+
+    from streaming.server import StreamServer, synthetic_messages
+
+    adapter = CountingAdapter()
+    server = StreamServer(synthetic_messages(adapter._books, updates=50)).start()
+    host, port = server.address
+    _engine, session_local = create_engine_and_session("sqlite://")
+    daemon = ArbDaemon(
+        session_local(),
+        exchange=adapter,
+        team_normalizer=load_team_normalizer(),
+        league_normalizer=load_league_normalizer(),
+        stream_address=f"{host}:{port}",
+    )
+    try:
+        daemon.start()
+        deadline = time.monotonic() + 5.0
+        while daemon.stream_cache.messages < 51 and time.monotonic() < deadline:
+            daemon.scheduler.run_pending()
+            time.sleep(0.01)
+        daemon.scheduler.run_pending()
+    finally:
+        daemon.stop_stream()
+        server.stop()
+
+    assert daemon.stream_cache.messages == 51  # image + 50 deltas
+    assert adapter.calls["list_market_books"] == 1  # the seed snapshot only
+    assert "books" not in daemon.scheduler
@@ -0,0 +1,68 @@
+import random
+from dataclasses import astuple
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from arb_evaluator import _evaluate_pairs_scalar, _evaluate_pairs_vectorized
+
+EDGE_ODDS = [None, 0.0, 0.5, 1.0, 1.01, 1.0100001, 1.02, 2.0, 1000.0]
+EDGE_PRICES = [0.0, 0.001, 0.5, 0.998, 1.0]
+
+
+def _pairs(seed: int, n: int) -> list[tuple]:
+    rng = random.Random(seed)
+
+    def odds():
+        if rng.random() < 0.3:
+            return rng.choice(EDGE_ODDS)
+        return round(rng.uniform(1.0, 12.0), rng.choice([2, 6]))
+
+    def price():
+        if rng.random() < 0.2:
+            return rng.choice(EDGE_PRICES)
+        return rng.uniform(0.01, 0.99)
+
+    return [
+        (
+            rng.randrange(-(2**63), 2**63),
+            f"team-{i}",
+            f"pm-{i}",
+            price(),
+            price(),
+            f"mkt-{i}",
+            str(rng.randrange(1000)),
+            odds(),
+            odds(),
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_vectorized_matches_scalar(seed):
+    pairs = _pairs(seed, 2000)
+    scalar = _evaluate_pairs_scalar(pairs)
+    vectorized = _evaluate_pairs_vectorized(pairs)
+    assert scalar, "sample should contain opportunities"
+    assert [astuple(r) for r in vectorized] == [astuple(r) for r in scalar]
+
+
+@pytest.mark.parametrize("min_profit", [-1e9, 0.0, 0.5])
+def test_vectorized_matches_scalar_at_any_threshold(min_profit):
+    pairs = _pairs(99, 500)
+    scalar = _evaluate_pairs_scalar(pairs, min_profit)
+    vectorized = _evaluate_pairs_vectorized(pairs, min_profit)
+    assert [astuple(r) for r in vectorized] == [astuple(r) for r in scalar]
+
+
+def test_missing_and_unusable_odds_give_no_results():
+    pairs = [
+        (1, "a", "pm", 0.2, 0.2, "mkt", "1", None, None),
+        (2, "b", "pm", 0.2, 0.2, "mkt", "1", 1.01, 1.01),
+        (3, "c", "pm", 0.2, 0.2, "mkt", "1", 0.0, 1.0),
+    ]
+    assert _evaluate_pairs_scalar(pairs, -1e9) == []
+    assert _evaluate_pairs_vectorized(pairs, -1e9) == []
+    assert _evaluate_pairs_vectorized([]) == []
@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import update
+
+from config.loaders import load_league_normalizer, load_team_normalizer
+from db.models import Event
+from db.session import create_engine_and_session
+from ingest.event_resolution import EventIndexLoader, PayloadHashCache, resolve_events
+from ingest.events import ingest_events
+from normalization.events import normalize_event
+
+KICKOFF = datetime(2030, 1, 11, 15, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def session():
+    _engine, session_local = create_engine_and_session("sqlite://")
+    return session_local()
+
+
+@pytest.fixture(scope="module")
+def normalizers():
+    return load_team_normalizer(), load_league_normalizer()
+
+
+def _event(normalizers, kickoff, home="Chelsea", away="Arsenal", league="Premier League"):
+    teams, leagues = normalizers
+    return normalize_event(
+        sport="soccer",
+        league=league,
+        season=None,
+        home_team=home,
+        away_team=away,
+        kickoff_time=kickoff,
+        status="SCHEDULED",
+        team_normalizer=teams,
+        league_normalizer=leagues,
+    )
+
+
+def test_same_fixture_twice_in_one_batch_is_one_event(session, normalizers):
+    candidates = [
+        (_event(normalizers, KICKOFF), "bdx-1"),
+        (_event(normalizers, KICKOFF + timedelta(minutes=5)), "bdx-2"),
+    ]
+    assert resolve_events(session, "betdex", candidates) == (1, 0)
+    assert session.query(Event).count() == 1
+
+
+def test_shifted_kickoff_merges_when_stored_key_is_also_in_batch(session, normalizers):
+    stored = _event(normalizers, KICKOFF)
+    resolve_events(session, "betfair", [(stored, "bf-1")])
+    session.commit()
+
+    candidates = [
+        (_event(normalizers, KICKOFF), "bdx-1"),
+        (_event(normalizers, KICKOFF + timedelta(minutes=5)), "bdx-2"),
+    ]
+    assert resolve_events(session, "betdex", candidates) == (0, 1)
+    session.commit()
+    events = session.query(Event).all()
+    assert [(e.event_key, e.betfair_id, e.betdex_id) for e in events] == [
+        (stored["event_key"], "bf-1", "bdx-1")
+    ]
+
+
+def test_event_index_loader_reads_only_recent_rows(session, normalizers):
+    old = _event(normalizers, KICKOFF - timedelta(days=30))
+    recent = _event(normalizers, KICKOFF)
+    resolve_events(session, "betfair", [(old, "bf-1"), (recent, "bf-2")])
+    session.commit()
+    # Pretend the first event was stored long ago.
+    session.execute(
+        update(Event)
+        .where(Event.event_key == old["event_key"])
+        .values(created_at=datetime(2020, 1, 1, tzinfo=timezone.utc))
+    )
+    session.commit()
+
+    loader = EventIndexLoader()
+    assert loader.refresh(session) == 2
+    assert loader.scanned == 2
+
+    new = _event(normalizers, KICKOFF, home="Barcelona", away="Real Madrid", league="La Liga")
+    resolve_events(session, "betfair", [(new, "bf-3")])
+    session.commit()
+    assert loader.refresh(session) == 1
+    # Only rows inside the overlap window are read again, not the old one.
+    assert loader.scanned == 2
+    assert loader.refresh(session) == 0
+    assert len(loader.index) == 3
+    lookup = loader.index.lookup(new["league"], new["home_team"], new["away_team"], KICKOFF)
+    assert lookup == new["event_key"]
+
+
+class ListingAdapter:
+    platform = "betdex"
+
+    def __init__(self, events):
+        self.events = events
+
+    def list_events(self):
+        return [dict(ev) for ev in self.events]
+
+
+def test_unchanged_payloads_are_skipped(session, normalizers):
+    teams, leagues = normalizers
+    adapter = ListingAdapter(
+        [{"id": "bdx-1", "name": "Chelsea v Arsenal", "openDate": KICKOFF.isoformat(), "league": "Premier League"}]
+    )
+    cache = PayloadHashCache()
+    ingest_events(session, adapter, teams, leagues, cache)
+    assert [e.betdex_id for e in session.query(Event)] == ["bdx-1"]
+
+    # With the payload unchanged the event is not looked at again, so a
+    # deleted row stays deleted.
+    session.query(Event).delete()
+    session.commit()
+    ingest_events(session, adapter, teams, leagues, cache)
+    assert session.query(Event).count() == 0
+
+    adapter.events[0]["openDate"] = (KICKOFF + timedelta(minutes=15)).isoformat()
+    ingest_events(session, adapter, teams, leagues, cache)
+    assert session.query(Event).count() == 1
@@ -0,0 +1,106 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from db.models import ExchangeMarket
+from db.session import create_engine_and_session
+from ingest.exchange_markets import (
+    _runner_rows,
+    fetch_books,
+    fetch_event_markets,
+    write_exchange_quotes,
+)
+
+
+class SlowAdapter:
+    platform = "betdex"
+    max_concurrency = 3
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+        self.book_calls = []
+        self._lock = threading.Lock()
+
+    def list_markets(self, event_id):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.05)
+        with self._lock:
+            self.in_flight -= 1
+        if event_id == "e3":
+            return []
+        return [
+            {"id": f"{event_id}-ou", "name": "Over/Under 2.5"},
+            {"id": f"{event_id}-mo", "name": "Match Odds"},
+        ]
+
+
+class BatchAdapter(SlowAdapter):
+    def list_market_books(self, market_ids):
+        self.book_calls.append(list(market_ids))
+        return {market_id: {"runners": [{"id": 1, "name": "x"}]} for market_id in market_ids[:-1]}
+
+
+def _events(n):
+    return [SimpleNamespace(event_key=i, betdex_id=f"e{i}", betfair_id=None) for i in range(n)]
+
+
+def test_catalogues_are_fetched_concurrently_in_event_order():
+    adapter = SlowAdapter()
+    events = _events(8)
+    found = fetch_event_markets(adapter, events, max_workers=16)
+
+    # The adapter's own limit caps the pool, but calls still overlap.
+    assert 1 < adapter.peak <= 3
+    # Event e3 has no markets; the rest keep their order.
+    assert [(ev.event_key, market_id, name) for ev, market_id, name in found] == [
+        (i, f"e{i}-mo", "Match Odds") for i in range(8) if i != 3
+    ]
+
+
+def test_books_use_one_batch_call_for_distinct_markets():
+    adapter = BatchAdapter()
+    ev1, ev2 = _events(2)
+    markets = [(ev1, "m1", "Match Odds"), (ev2, "m2", "Match Odds"), (ev1, "m1", "Match Odds")]
+    fetched = fetch_books(adapter, markets)
+
+    assert adapter.book_calls == [["m1", "m2"]]
+    # m2 came back without a book and gets an empty one.
+    assert [(market_id, book["runners"]) for _ev, market_id, _name, book in fetched] == [
+        ("m1", [{"id": 1, "name": "x"}]),
+        ("m2", []),
+        ("m1", [{"id": 1, "name": "x"}]),
+    ]
+
+
+def _fetched(event_key, back_price):
+    book = {
+        "runners": [
+            {"id": 7, "name": "Chelsea", "back": [{"price": back_price, "size": 10.0}]},
+            {"id": 8, "name": "Arsenal", "lay": [{"price": 3.5, "size": 4.0}]},
+        ]
+    }
+    return [(SimpleNamespace(event_key=event_key), "mkt-1", "Match Odds", book)]
+
+
+def test_upsert_reports_only_keys_whose_quotes_moved():
+    _engine, session_local = create_engine_and_session("sqlite://")
+    session = session_local()
+
+    assert write_exchange_quotes(session, _runner_rows("betdex", _fetched(1, 2.0))) == {
+        (1, "Chelsea"),
+        (1, "Arsenal"),
+    }
+    session.commit()
+    assert write_exchange_quotes(session, _runner_rows("betdex", _fetched(1, 2.0))) == set()
+
+    # A changed quote is reported under the stored identity, which the
+    # upsert leaves untouched.
+    changed = write_exchange_quotes(session, _runner_rows("betdex", _fetched(99, 2.1)))
+    session.commit()
+    assert changed == {(1, "Chelsea")}
+    row = session.get(ExchangeMarket, "betdex:mkt-1:7")
+    assert (row.event_key, row.best_back_odds, row.back_ladder) == (1, 2.1, "2.1@10.0")
+    assert session.query(ExchangeMarket).count() == 2
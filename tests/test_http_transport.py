@@ -0,0 +1,184 @@
+import gzip
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from utils.http import BACKOFF_MAX, HttpTransport
+from utils.ratelimit import PRIORITY_BOOK, TokenBucket
+
+
+class ScriptedServer:
+    """Local stand-in: each path answers with its queued (status, headers) first,
+    then 200 with a gzipped JSON body when the client accepts gzip."""
+
+    def __init__(self):
+        self.script: dict[str, list[tuple[int, dict]]] = {}
+        self.hits: dict[str, int] = {}
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_GET(self):
+                self._answer()
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                self._answer()
+
+            def _answer(self):
+                with server._lock:
+                    server.hits[self.path] = server.hits.get(self.path, 0) + 1
+                    queued = server.script.get(self.path) or []
+                    status, headers = queued.pop(0) if queued else (200, {})
+                body = b""
+                if status == 200:
+                    body = json.dumps({"path": self.path, "pad": "x" * 2000}).encode()
+                    headers = {"Content-Type": "application/json"}
+                    if "gzip" in self.headers.get("Accept-Encoding", ""):
+                        body = gzip.compress(body)
+                        headers["Content-Encoding"] = "gzip"
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+@pytest.fixture
+def server():
+    server = ScriptedServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def sleeps():
+    return []
+
+
+@pytest.fixture
+def transport(sleeps):
+    transport = HttpTransport(max_retries=3, sleep=sleeps.append, timeout=5)
+    yield transport
+    transport.close()
+
+
+def test_retries_5xx_and_429_until_success(server, transport, sleeps):
+    server.script["/flaky"] = [(503, {}), (429, {}), (502, {})]
+    resp = transport.get(f"{server.url}/flaky")
+
+    assert resp.status_code == 200
+    assert server.hits["/flaky"] == 4
+    assert len(sleeps) == 3
+    stats = transport.stats()[server.url.split("//")[1]]
+    assert (stats["requests"], stats["retries"], stats["errors"]) == (4, 3, 3)
+
+
+class RecordingBucket(TokenBucket):
+    def __init__(self):
+        super().__init__(rate=1000.0, capacity=10.0)
+        self.charged = []
+
+    def acquire(self, cost=1.0, priority=1):
+        self.charged.append((cost, priority))
+        return super().acquire(cost, priority)
+
+
+def test_retries_take_limiter_tokens(server, transport):
+    limiter = RecordingBucket()
+    server.script["/busy"] = [(429, {}), (503, {})]
+    resp = transport.get(f"{server.url}/busy", limiter=limiter, priority=PRIORITY_BOOK)
+
+    assert resp.status_code == 200
+    # The first attempt is the caller's to pay for; each retry takes a token.
+    assert limiter.charged == [(1, PRIORITY_BOOK), (1, PRIORITY_BOOK)]
+
+    limiter.charged.clear()
+    transport.get(f"{server.url}/fine", limiter=limiter)
+    assert limiter.charged == []
+
+
+def test_retry_after_is_honoured(server, transport, sleeps):
+    server.script["/slow"] = [(429, {"Retry-After": "2"}), (503, {"Retry-After": "600"})]
+    assert transport.get(f"{server.url}/slow").status_code == 200
+    # The first wait is at least Retry-After; a huge one is capped.
+    assert sleeps[0] >= 2.0
+    assert sleeps[1] == BACKOFF_MAX
+
+
+def test_gives_up_after_max_retries(server, transport, sleeps):
+    server.script["/down"] = [(503, {})] * 10
+    resp = transport.get(f"{server.url}/down")
+
+    assert resp.status_code == 503
+    assert server.hits["/down"] == 4
+    assert len(sleeps) == 3
+    stats = transport.stats()[server.url.split("//")[1]]
+    assert (stats["requests"], stats["retries"], stats["errors"]) == (4, 3, 4)
+
+
+def test_non_idempotent_post_is_not_retried(server, transport, sleeps):
+    server.script["/order"] = [(503, {})]
+    assert transport.post(f"{server.url}/order", json={}).status_code == 503
+    assert server.hits["/order"] == 1
+    assert sleeps == []
+
+    server.script["/read"] = [(503, {})]
+    assert transport.post(f"{server.url}/read", json={}, idempotent=True).status_code == 200
+    assert server.hits["/read"] == 2
+
+
+def test_connection_errors_are_retried_then_raised(transport, sleeps):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    with pytest.raises(requests.ConnectionError):
+        transport.get(f"http://127.0.0.1:{port}/gone")
+    assert len(sleeps) == 3
+    assert transport.stats()[f"127.0.0.1:{port}"]["errors"] == 4
+
+
+def test_gzip_is_decoded_and_wire_bytes_counted(server, transport):
+    resp = transport.get(f"{server.url}/data")
+    assert resp.json()["path"] == "/data"
+    assert resp.headers["Content-Encoding"] == "gzip"
+    stats = transport.stats()[server.url.split("//")[1]]
+    assert 0 < stats["bytes_in"] < len(resp.content)
+
+
+def test_keep_alive_connections_are_reused(server, transport):
+    for i in range(5):
+        assert transport.get(f"{server.url}/data/{i}").status_code == 200
+    assert server.connections == 1
@@ -0,0 +1,45 @@
+import pytest
+
+from utils import jsoncodec
+from utils.jsoncodec import decode_response, loads, parse_json_lists
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+
+def test_decode_response_reads_bytes():
+    assert decode_response(FakeResponse(b'{"a": [1, 2]}')) == {"a": [1, 2]}
+    with pytest.raises(ValueError):
+        decode_response(FakeResponse(b"<html>"))
+
+
+def test_stdlib_fallback_accepts_memoryview(monkeypatch):
+    monkeypatch.setattr(jsoncodec, "orjson", None)
+    assert loads(memoryview(b'["Yes", "No"]')) == ["Yes", "No"]
+
+
+def test_parse_json_lists_batches_and_passes_through():
+    values = ['["Yes", "No"]', ["a"], None, '["Yes", "No"]', '["0.4", "0.6"]']
+    results = parse_json_lists(values)
+    assert results == [["Yes", "No"], ["a"], [], ["Yes", "No"], ["0.4", "0.6"]]
+    # Equal strings share one decoded list.
+    assert results[0] is results[3]
+
+
+@pytest.mark.parametrize(
+    "bad",
+    [
+        '["Yes", "No"',  # not batchable: parsed alone
+        '["a"],["b"]',  # batchable but splits into two lists
+        '[1, }',  # breaks the batched decode
+        '{"Yes": 1}',  # valid JSON, not a list
+    ],
+)
+def test_parse_json_lists_falls_back_per_value(bad):
+    assert parse_json_lists(['["Yes", "No"]', bad, '["0.4", "0.6"]']) == [
+        ["Yes", "No"],
+        [],
+        ["0.4", "0.6"],
+    ]
@@ -0,0 +1,29 @@
+import pytest
+
+from exchanges.ladder import Ladder
+
+
+def test_vwap_walks_levels_in_order():
+    ladder = Ladder([(2.0, 10.0), (2.2, 0.0), (2.4, 30.0)])
+    # Empty levels are dropped.
+    assert ladder.prices == (2.0, 2.4)
+    assert ladder.depth == 40.0
+
+    assert ladder.vwap(0) == 2.0
+    assert ladder.vwap(5.0) == 2.0
+    assert ladder.vwap(10.0) == 2.0
+    assert ladder.vwap(20.0) == pytest.approx((2.0 * 10 + 2.4 * 10) / 20)
+    assert ladder.vwap(40.0) == pytest.approx(ladder.level_vwap(1)) == pytest.approx(2.3)
+
+
+def test_vwap_past_the_depth_is_none():
+    assert Ladder([(2.0, 10.0)]).vwap(10.5) is None
+    assert Ladder([]).vwap(1.0) is None
+
+
+def test_encode_round_trips():
+    ladder = Ladder.from_levels([{"price": 1.7, "size": 250.0}, {"price": "1.72", "size": 80}, {"size": 5}])
+    assert ladder.encode() == "1.7@250.0;1.72@80.0"
+    decoded = Ladder.decode(ladder.encode())
+    assert (decoded.prices, decoded.sizes) == (ladder.prices, ladder.sizes)
+    assert Ladder.decode("") is None
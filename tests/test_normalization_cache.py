@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta, timezone
+
+from config.loaders import load_league_normalizer, load_team_normalizer
+from normalization.cache import (
+    CacheReport,
+    cache_stats,
+    clear_caches,
+    event_uid_for,
+    parse_kickoff_utc,
+)
+from utils.hashing import stable_hash
+
+
+def test_loaders_share_one_instance_until_cleared():
+    teams = load_team_normalizer()
+    assert load_team_normalizer() is teams
+    assert load_league_normalizer() is load_league_normalizer()
+
+    load_team_normalizer.cache_clear()
+    try:
+        fresh = load_team_normalizer()
+        assert fresh is not teams
+        assert fresh.normalize("Chelsea") == teams.normalize("Chelsea")
+    finally:
+        load_team_normalizer.cache_clear()
+
+
+def test_kickoff_parsing_is_memoized():
+    clear_caches()
+    first = parse_kickoff_utc("2030-01-11T15:00:00Z")
+    assert first == datetime(2030, 1, 11, 15, tzinfo=timezone.utc)
+    assert parse_kickoff_utc("2030-01-11T15:00:00Z") is first
+    assert parse_kickoff_utc("2030-01-11T16:00:00+01:00") == first
+    assert cache_stats()["kickoff"] == {"hits": 1, "misses": 2, "size": 2}
+
+    clear_caches()
+    assert cache_stats()["kickoff"]["size"] == 0
+
+
+def test_uids_stay_keyed_on_the_isoformat():
+    utc = datetime(2030, 1, 11, 15, tzinfo=timezone.utc)
+    cet = utc.astimezone(timezone(timedelta(hours=1)))
+    args = ("Premier League", "Chelsea", "Arsenal")
+    assert event_uid_for(*args, utc.isoformat()) == stable_hash(
+        f"Premier League|Chelsea|Arsenal|{utc.isoformat()}"
+    )
+    assert event_uid_for(*args, utc.isoformat()) != event_uid_for(*args, cet.isoformat())
+
+
+def test_cache_report_gives_per_cycle_deltas():
+    clear_caches()
+    report = CacheReport()
+    for _ in range(3):
+        parse_kickoff_utc("2030-01-11T15:00:00Z")
+    assert report.cycle()["kickoff"] == {"hits": 2, "misses": 1, "hit_rate": 0.667, "size": 1}
+
+    parse_kickoff_utc("2030-01-11T15:00:00Z")
+    assert report.cycle()["kickoff"]["hit_rate"] == 1.0
+    assert report.cycle()["kickoff"]["hit_rate"] is None
@@ -0,0 +1,70 @@
+import json
+import threading
+import time
+
+from polymarket.client import PolymarketClient
+
+LIMIT = 2
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.content = json.dumps(body).encode()
+
+    def raise_for_status(self):
+        pass
+
+
+class PagedTransport:
+    """Serves ``total`` markets; the page at ``slow_offset`` takes a while."""
+
+    def __init__(self, total, slow_offset=None, ignore_offset=False):
+        self.total = total
+        self.slow_offset = slow_offset
+        self.ignore_offset = ignore_offset
+        self.events = []
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, headers=None, **kwargs):
+        offset = 0 if self.ignore_offset else params["offset"]
+        with self._lock:
+            self.events.append(("start", params["offset"]))
+        if offset == self.slow_offset:
+            time.sleep(0.3)
+        page = [{"id": str(i), "question": f"q{i}"} for i in range(offset, min(offset + LIMIT, self.total))]
+        with self._lock:
+            self.events.append(("end", params["offset"]))
+        return FakeResponse(page)
+
+    def requested(self):
+        return sorted(offset for kind, offset in self.events if kind == "start")
+
+
+def _client(transport):
+    return PolymarketClient(transport=transport, limiter=None)
+
+
+def test_pages_are_requested_as_earlier_ones_finish():
+    transport = PagedTransport(total=9, slow_offset=0)
+    markets = list(_client(transport).iter_markets(limit=LIMIT, concurrency=2))
+
+    assert sorted(int(m["id"]) for m in markets) == list(range(9))
+    # The slow first page does not hold back the next requests...
+    assert transport.events.index(("start", 4)) < transport.events.index(("end", 0))
+    # ...and nothing is requested past the short page at offset 8.
+    assert transport.requested() == [0, 2, 4, 6, 8]
+
+
+def test_in_flight_pages_past_the_end_are_not_yielded():
+    transport = PagedTransport(total=3)
+    markets = list(_client(transport).iter_markets(limit=LIMIT, concurrency=4))
+    assert sorted(int(m["id"]) for m in markets) == [0, 1, 2]
+    # The first window was already in flight; nothing is requested after it.
+    assert transport.requested() in ([0, 2, 4], [0, 2, 4, 6])
+
+
+def test_paging_stops_when_offset_is_ignored():
+    transport = PagedTransport(total=100, ignore_offset=True)
+    markets = list(_client(transport).iter_markets(limit=LIMIT, concurrency=3))
+    assert [m["id"] for m in markets] == ["0", "1"]
+    assert len(transport.requested()) <= 6
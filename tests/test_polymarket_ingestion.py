@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import ingestion.polymarket as polymarket
+from config.loaders import load_league_normalizer, load_team_normalizer
+from db.models import BinaryMarket
+from db.session import create_engine_and_session
+from ingest.event_resolution import resolve_events
+from ingestion.polymarket import SKIP_NO_MATCHING_EVENT, PolymarketIngestor
+from normalization.events import normalize_event
+
+KICKOFF = datetime(2030, 1, 11, 15, 0, tzinfo=timezone.utc)
+
+
+class FakeClient:
+    def __init__(self, markets):
+        self.markets = markets
+
+    def get_markets(self):
+        return [dict(market) for market in self.markets]
+
+
+def _market(market_id, team, price, home="Chelsea", away="Arsenal", kickoff=KICKOFF):
+    return {
+        "id": market_id,
+        "question": f"Will {team} win?",
+        "price": price,
+        "league": "Premier League",
+        "team": team,
+        "home_team": home,
+        "away_team": away,
+        "kickoff": kickoff.isoformat(),
+        "category": "Sports",
+        "outcomeType": "BINARY",
+    }
+
+
+@pytest.fixture
+def setup():
+    teams, leagues = load_team_normalizer(), load_league_normalizer()
+    _engine, session_local = create_engine_and_session("sqlite://")
+    session = session_local()
+
+    def store(home, away):
+        event = normalize_event(
+            sport="soccer",
+            league="Premier League",
+            season=None,
+            home_team=home,
+            away_team=away,
+            kickoff_time=KICKOFF,
+            status="SCHEDULED",
+            team_normalizer=teams,
+            league_normalizer=leagues,
+        )
+        resolve_events(session, "betfair", [(event, f"bf-{home}")])
+        session.commit()
+        return event["event_key"]
+
+    return session, teams, leagues, store
+
+
+def test_repeat_ingest_upserts_and_reports_only_moved_prices(setup, monkeypatch):
+    session, teams, leagues, store = setup
+    event_key = store("Chelsea", "Arsenal")
+    # Flush after every market so the chunked upsert path is exercised.
+    monkeypatch.setattr(polymarket, "UPSERT_CHUNK_SIZE", 1)
+    client = FakeClient(
+        [
+            _market("pm-1", "Chelsea", 0.5, kickoff=KICKOFF + timedelta(minutes=30)),
+            _market("pm-2", "Arsenal", 0.3),
+        ]
+    )
+    ingestor = PolymarketIngestor(client, teams, leagues)
+
+    assert ingestor.ingest(session) == {(event_key, "Chelsea"), (event_key, "Arsenal")}
+    assert ingestor.ingest(session) == set()
+
+    client.markets[1]["price"] = 0.35
+    assert ingestor.ingest(session) == {(event_key, "Arsenal")}
+    prices = {row.market_id: row.price for row in session.query(BinaryMarket)}
+    assert prices == {"pm-1": 0.5, "pm-2": 0.35}
+
+
+def test_events_stored_between_cycles_are_picked_up(setup):
+    session, teams, leagues, store = setup
+    store("Chelsea", "Arsenal")
+    client = FakeClient([_market("pm-3", "Tottenham", 0.6, home="Tottenham", away="Chelsea")])
+    ingestor = PolymarketIngestor(client, teams, leagues)
+
+    assert ingestor.ingest(session) == set()
+    assert ingestor.stats[SKIP_NO_MATCHING_EVENT] == 1
+
+    event_key = store("Tottenham", "Chelsea")
+    assert ingestor.ingest(session) == {(event_key, "Tottenham")}
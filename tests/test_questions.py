@@ -0,0 +1,67 @@
+import pytest
+
+from config.loaders import load_team_normalizer
+from normalization.questions import (
+    INTENT_DRAW,
+    INTENT_NOT_LOSE,
+    INTENT_NOT_WIN,
+    INTENT_WIN,
+    QuestionParser,
+)
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return QuestionParser.from_normalizer(load_team_normalizer())
+
+
+@pytest.mark.parametrize(
+    "question, intent",
+    [
+        ("Will Chelsea win against Arsenal?", INTENT_WIN),
+        ("Will Chelsea beat Arsenal?", INTENT_WIN),
+        ("Chelsea vs Arsenal: will it end in a draw?", INTENT_DRAW),
+        ("Will Chelsea win or draw against Arsenal?", INTENT_NOT_LOSE),
+        ("Will Chelsea beat or draw with Arsenal?", INTENT_NOT_LOSE),
+        ("Will Chelsea win or tie against Arsenal?", INTENT_NOT_LOSE),
+        ("Will Chelsea not lose to Arsenal?", INTENT_NOT_LOSE),
+        ("Will Chelsea not win against Arsenal?", INTENT_NOT_WIN),
+        ("Will Chelsea fail to beat Arsenal?", INTENT_NOT_WIN),
+        ("Chelsea won't win vs Arsenal?", INTENT_NOT_WIN),
+    ],
+)
+def test_intent(parser, question, intent):
+    assert parser.parse(question).intent == intent
+
+
+def test_subject_and_teams(parser):
+    parsed = parser.parse("Will Chelsea not win against Arsenal?")
+    assert parsed.teams == ("Chelsea", "Arsenal")
+    assert parsed.subject == "Chelsea"
+    assert parsed.opponent == "Arsenal"
+
+
+def test_ingestor_skips_markets_that_are_not_win_markets():
+    from config.loaders import load_league_normalizer
+    from db.session import create_engine_and_session
+    from ingestion.polymarket import SKIP_NOT_WIN_MARKET, PolymarketIngestor
+
+    class Client:
+        def get_markets(self):
+            return [
+                {"id": str(i), "category": "Sports", "outcomeType": "BINARY", "question": q}
+                for i, q in enumerate(
+                    [
+                        "Will Chelsea beat or draw with Arsenal?",
+                        "Will Chelsea win or tie against Arsenal?",
+                        "Will Chelsea not win against Arsenal?",
+                    ]
+                )
+            ]
+
+    _engine, session_local = create_engine_and_session("sqlite://")
+    ingestor = PolymarketIngestor(Client(), load_team_normalizer(), load_league_normalizer())
+    session = session_local()
+    for _cycle in range(2):  # counters are per cycle
+        assert ingestor.ingest(session) == set()
+        assert ingestor.stats[SKIP_NOT_WIN_MARKET] == 3
@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+
+from exchanges.ladder import Ladder
+from ingest.exchange_markets import _runner_rows
+from quotes.store import QuoteStore
+
+
+def _book(back, lay):
+    return {
+        "runners": [
+            {"selectionId": 7, "runnerName": "Chelsea", "ex": {"availableToBack": back, "availableToLay": lay}}
+        ]
+    }
+
+
+def test_store_best_prices_match_database_rows():
+    store = QuoteStore()
+    event = SimpleNamespace(event_key=42)
+    # Levels out of order and an empty top level: the DB row keeps the
+    # provider's first price, and the store must agree with it.
+    back = [{"price": 2.1, "size": 0}, {"price": 2.2, "size": 50.0}, {"price": 2.0, "size": 10.0}]
+    lay = [{"price": 2.3, "size": 20.0}, {"price": 2.26, "size": 5.0}]
+    rows = _runner_rows("betdex", [(event, "mkt-1", "Match Odds", _book(back, lay))], store)
+
+    row = rows["betdex:mkt-1:7"]
+    quote = store.get((42, "Chelsea"))
+    assert (quote.back, quote.lay) == (row["best_back_odds"], row["best_lay_odds"]) == (2.1, 2.3)
+    assert quote.back_size is None
+    assert quote.lay_size == 20.0
+
+
+def test_best_price_change_alone_marks_key_dirty():
+    store = QuoteStore()
+    ladder = Ladder([(2.0, 10.0)])
+    assert store.update_exchange((1, "a"), "m", "s", ladder, None)
+    store.drain_dirty()
+    assert not store.update_exchange((1, "a"), "m", "s", ladder, None)
+    assert store.update_exchange((1, "a"), "m", "s", ladder, None, best_back=2.02)
+    assert store.drain_dirty() == {(1, "a")}
+    assert store.get((1, "a")).back == 2.02
@@ -0,0 +1,88 @@
+import json
+
+from ingestion.betfair.client import BetfairClient
+from utils.http import RequestCounter
+from utils.ratelimit import TokenBucket
+
+
+class RecordingBucket(TokenBucket):
+    def __init__(self, rate, capacity):
+        super().__init__(rate, capacity)
+        self.charged = []
+
+    def acquire(self, cost=1.0, priority=1):
+        self.charged.append(cost)
+        return super().acquire(cost, priority)
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.content = json.dumps(body).encode()
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeTransport:
+    def __init__(self):
+        self.posts = []
+
+    def post(self, url, json=None, **kwargs):
+        self.posts.append(json)
+        return FakeResponse([{"id": item["id"], "result": []} for item in json])
+
+
+def _client(limiter):
+    client = BetfairClient.__new__(BetfairClient)
+    client.transport = FakeTransport()
+    client.limiter = limiter
+    client.headers = {}
+    client.requests = RequestCounter()
+    return client
+
+
+def test_oversized_cost_leaves_the_bucket_in_debt():
+    bucket = TokenBucket(rate=100.0, capacity=10.0)
+    assert bucket.acquire(30) == 0.0
+    # 20 tokens of debt plus one token at 100/s.
+    assert bucket.acquire(1) >= 0.2
+
+
+def test_rpc_batch_takes_one_token_per_post():
+    limiter = RecordingBucket(rate=1000.0, capacity=10.0)
+    client = _client(limiter)
+    results = client._rpc_batch([("listMarketBook", {"marketIds": [str(i)]}) for i in range(120)])
+
+    assert len(results) == 120 and all(result.ok for result in results)
+    # Posts are split only at Betfair's per-request call limit.
+    assert [len(post) for post in client.transport.posts] == [50, 50, 20]
+    assert client.requests.value == 3
+    assert limiter.charged == [1, 1, 1]
+
+
+class ErrorTransport(FakeTransport):
+    def __init__(self, body):
+        super().__init__()
+        self.body = body
+
+    def post(self, url, json=None, **kwargs):
+        self.posts.append(json)
+        return FakeResponse(self.body)
+
+
+def test_rpc_batch_top_level_error_fails_every_call():
+    error = {
+        "code": -32099,
+        "message": "ANGX-0003",
+        "data": {"APINGException": {"errorCode": "INVALID_SESSION_INFORMATION"}},
+    }
+    client = _client(None)
+    client.transport = ErrorTransport({"jsonrpc": "2.0", "error": error})
+    results = client._rpc_batch([("listMarketBook", {}), ("listMarketCatalogue", {})])
+    assert [(r.method, r.ok, r.error) for r in results] == [
+        ("listMarketBook", False, error),
+        ("listMarketCatalogue", False, error),
+    ]
+
+    client.transport = ErrorTransport(None)
+    assert [r.error for r in client._rpc_batch([("listEvents", {})])] == [{"message": "empty response"}]
@@ -0,0 +1,78 @@
+import gzip
+import json
+
+from replay.recorder import request_key
+from replay.transport import ReplayTransport
+
+URL = "https://venue.test/markets"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 6))
+        self.now += seconds
+
+
+def _recording(tmp_path, records):
+    path = tmp_path / "traffic.jsonl.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as handle:
+        for page, t, elapsed in records:
+            params = {"page": page}
+            handle.write(
+                json.dumps(
+                    {
+                        "key": request_key("GET", URL, params),
+                        "method": "GET",
+                        "url": URL,
+                        "t": t,
+                        "elapsed": elapsed,
+                        "status": 200,
+                        "content_type": "application/json",
+                        "body": json.dumps({"page": page}),
+                    }
+                )
+                + "\n"
+            )
+    return str(path)
+
+
+def test_responses_follow_the_recorded_timeline(tmp_path):
+    path = _recording(tmp_path, [(1, 0.0, 0.5), (2, 2.0, 0.5), (3, 2.2, 0.1)])
+    clock = FakeClock()
+    transport = ReplayTransport(path, speed=2.0, sleep=clock.sleep, clock=clock)
+
+    assert transport.get(URL, params={"page": 1}).json() == {"page": 1}
+    # Page 2 was requested 2s in and answered 0.5s later: due at 1.25s at x2.
+    clock.now += 0.25
+    transport.get(URL, params={"page": 2})
+    # Already past page 3's slot (1.15s), so it is served at once.
+    transport.get(URL, params={"page": 3})
+    assert clock.sleeps == [0.25, 0.75]
+    assert clock.now - 100.0 == 1.25
+
+
+def test_repeated_responses_wait_their_latency_only(tmp_path):
+    path = _recording(tmp_path, [(1, 5.0, 0.4)])
+    clock = FakeClock()
+    transport = ReplayTransport(path, speed=1.0, sleep=clock.sleep, clock=clock)
+
+    transport.get(URL, params={"page": 1})
+    transport.get(URL, params={"page": 1})
+    assert clock.sleeps == [5.4, 0.4]
+    assert transport.stats()["replay"] == {"served": 2, "misses": 0}
+
+
+def test_no_speed_answers_immediately(tmp_path):
+    path = _recording(tmp_path, [(1, 5.0, 0.4)])
+    clock = FakeClock()
+    transport = ReplayTransport(path, sleep=clock.sleep, clock=clock)
+    assert transport.get(URL, params={"page": 1}).status_code == 200
+    assert transport.get(URL, params={"page": 9}).status_code == 404
+    assert clock.sleeps == []
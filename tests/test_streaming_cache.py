@@ -0,0 +1,56 @@
+from streaming.cache import OrderBookCache
+
+KEY = (42, "Chelsea")
+
+
+def _message(runners, img=False, ct="RESUB_DELTA", market="mkt-1"):
+    return {"op": "mcm", "clk": "c1", "ct": ct, "mc": [{"id": market, "img": img, "rc": runners}]}
+
+
+def _cache(changes=None):
+    cache = OrderBookCache(on_change=None if changes is None else changes.append)
+    cache.register("mkt-1", "7", *KEY)
+    cache.register("mkt-1", "8", 42, "Arsenal")
+    return cache
+
+
+def test_image_replaces_market_state():
+    cache = _cache()
+    cache.apply(_message([{"id": 7, "atb": [[2.0, 10.0], [1.9, 5.0]]}, {"id": 8, "atl": [[3.0, 4.0]]}], img=True))
+    changed = cache.apply(_message([{"id": 7, "atb": [[2.1, 20.0]]}], ct="SUB_IMAGE"))
+
+    # Runner 8 is gone from the new image, so both keys moved.
+    assert changed == {KEY, (42, "Arsenal")}
+    assert cache.book("mkt-1", "7").back == {2.1: 20.0}
+    assert cache.book("mkt-1", "8") is None
+    assert cache.clk == "c1"
+
+
+def test_delta_updates_and_removes_levels():
+    changes = []
+    cache = _cache(changes)
+    cache.apply(_message([{"id": 7, "atb": [[2.0, 10.0], [1.9, 5.0]], "atl": [[2.1, 3.0]]}], img=True))
+    cache.drain()
+
+    assert cache.apply(_message([{"id": 7, "atb": [[2.0, 12.0], [1.9, 0]]}])) == {KEY}
+    book = cache.book("mkt-1", "7")
+    assert book.back == {2.0: 12.0}
+    assert book.lay == {2.1: 3.0}
+    assert (book.best_back(), book.best_lay()) == (2.0, 2.1)
+
+    # Repeating a level, or removing one that is absent, moves nothing.
+    assert cache.apply(_message([{"id": 7, "atb": [[2.0, 12.0], [1.8, 0]]}])) == set()
+    assert changes == [{KEY}, {KEY}]
+    assert cache.drain() == ({KEY}, {("mkt-1", "7")})
+
+
+def test_delta_before_any_image_builds_the_book():
+    cache = _cache()
+    assert cache.apply(_message([{"id": 7, "atl": [[2.2, 5.0], [2.3, 1.0]]}])) == {KEY}
+    back, lay = cache.ladders("mkt-1", "7")
+    assert len(back) == 0
+    assert lay.prices == (2.2, 2.3)
+
+    # An unregistered runner is cached but reports no key.
+    assert cache.apply(_message([{"id": 9, "atb": [[1.5, 1.0]]}])) == set()
+    assert cache.book("mkt-1", "9").best_back() == 1.5
@@ -0,0 +1,58 @@
+from arb_evaluator import ArbResult, _evaluation_rows, _persist_results
+from db.models import ArbitrageEvaluation
+from db.session import create_engine_and_session
+from db.writer import BackgroundWriter
+
+
+def _result(event_key):
+    return ArbResult(
+        event_key=event_key,
+        team="Chelsea",
+        poly_market_id="pm-1",
+        betdex_market_id="mkt-1",
+        betdex_selection_id="7",
+        direction="PM_YES_vs_BDX_LAY",
+        pm_price=0.4,
+        bdx_odds=2.1,
+        stake_pm=5.0,
+        lay_stake_or_back_stake=3.0,
+        worst_case_profit=0.5,
+        profit_if_team_wins=0.5,
+        profit_if_team_not_win=0.6,
+        event_uid=f"{event_key:064x}",
+    )
+
+
+def _sessions(tmp_path):
+    _engine, session_local = create_engine_and_session(f"sqlite:///{tmp_path / 'arb.db'}")
+    return session_local
+
+
+def test_flush_waits_for_queued_inserts(tmp_path):
+    session_local = _sessions(tmp_path)
+    writer = BackgroundWriter(session_local)
+    session = session_local()
+    try:
+        _persist_results(session, [_result(i) for i in range(25)], chunk_size=10, writer=writer)
+        writer.flush()
+        assert writer.pending() == 0
+        assert session.query(ArbitrageEvaluation).count() == 25
+    finally:
+        writer.close()
+
+
+def test_failed_job_is_rolled_back_and_writer_keeps_going(tmp_path):
+    session_local = _sessions(tmp_path)
+    writer = BackgroundWriter(session_local)
+    table = ArbitrageEvaluation.__table__
+    (row,) = _evaluation_rows([_result(1)])
+    try:
+        # The second chunk violates NOT NULL, so the whole job is undone.
+        writer.insert(table, [row, {**row, "team": None}], chunk_size=1)
+        writer.insert(table, [row])
+        writer.flush()
+    finally:
+        writer.close()
+
+    assert writer.failed == 1
+    assert session_local().query(ArbitrageEvaluation).count() == 1
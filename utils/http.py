@@ -0,0 +1,238 @@
+"""Shared HTTP transport for the venue clients."""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.settings import (
+    HTTP_MAX_RETRIES,
+    HTTP_POOL_SIZE,
+    HTTP_TIMEOUT,
+    RECORD_TRAFFIC_PATH,
+    REPLAY_SPEED,
+    REPLAY_TRAFFIC_PATH,
+)
+from replay.recorder import TrafficRecorder, open_recorder
+from replay.transport import ReplayTransport
+from utils.logging import get_logger
+from utils.ratelimit import PRIORITY_CATALOGUE, TokenBucket
+
+logger = get_logger(__name__)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+BACKOFF_BASE = 0.2
+BACKOFF_MAX = 5.0
+
+
+@dataclass
+class HostStats:
+    requests: int = 0
+    retries: int = 0
+    errors: int = 0
+    bytes_in: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "errors": self.errors,
+            "bytes_in": self.bytes_in,
+            "avg_ms": round(1000 * self.total_seconds / self.requests, 2) if self.requests else 0.0,
+            "max_ms": round(1000 * self.max_seconds, 2),
+        }
+
+
+class HttpTransport:
+    """One pooled ``requests.Session`` shared by every venue client.
+
+    Connections are pooled per host (``pool_size`` each), so concurrent
+    workers reuse keep-alive sockets instead of opening new ones. Responses
+    are negotiated as gzip. Idempotent requests are retried on connection
+    errors and ``RETRY_STATUSES`` with jittered exponential backoff, honouring
+    ``Retry-After``. Clients pass their own auth headers per request, and
+    their rate limiter so that retries are paid for like first attempts.
+    With a ``recorder`` every final response is captured for replay.
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_size: int = HTTP_POOL_SIZE,
+        timeout: float = HTTP_TIMEOUT,
+        max_retries: int = HTTP_MAX_RETRIES,
+        recorder: Optional[TrafficRecorder] = None,
+        sleep=time.sleep,
+    ):
+        self.timeout = timeout
+        self.recorder = recorder
+        self.max_retries = max_retries
+        self._sleep = sleep
+        self.session = requests.Session()
+        self.session.headers.update({"Accept-Encoding": "gzip, deflate"})
+        # Retries are handled in ``request`` so they can be counted and
+        # applied to idempotent POSTs such as Betfair JSON-RPC reads.
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._stats: dict[str, HostStats] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        idempotent: Optional[bool] = None,
+        timeout: Optional[float] = None,
+        limiter: Optional[TokenBucket] = None,
+        priority: int = PRIORITY_CATALOGUE,
+        **kwargs,
+    ) -> requests.Response:
+        """Send a request, retrying when it is safe to.
+
+        ``idempotent`` defaults to True for GET/HEAD/OPTIONS/PUT/DELETE; pass
+        it explicitly for read-only POSTs. The caller pays ``limiter`` for
+        the first attempt; each retry takes one more token at ``priority``
+        after its backoff. The final response is returned as-is, so callers
+        still call ``raise_for_status``.
+        """
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        attempts = 1 + (self.max_retries if idempotent else 0)
+        host = urlsplit(url).netloc
+        kwargs.setdefault("timeout", timeout or self.timeout)
+
+        for attempt in range(attempts):
+            last = attempt == attempts - 1
+            if attempt and limiter is not None:
+                limiter.acquire(1, priority)
+            started = time.perf_counter()
+            try:
+                resp = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self._record(host, time.perf_counter() - started, 0, error=True, retry=not last)
+                if last:
+                    raise
+                self._backoff(attempt, None)
+                continue
+
+            elapsed = time.perf_counter() - started
+            size = _wire_bytes(resp)
+            retryable = resp.status_code in RETRY_STATUSES
+            self._record(
+                host,
+                elapsed,
+                size,
+                error=resp.status_code >= 400,
+                retry=retryable and not last,
+            )
+            if not retryable or last:
+                if self.recorder is not None:
+                    self.recorder.record(method, url, kwargs, resp, elapsed)
+                return resp
+            logger.debug(
+                "Retrying HTTP request",
+                extra={"host": host, "status": resp.status_code, "attempt": attempt + 1},
+            )
+            self._backoff(attempt, resp.headers.get("Retry-After"))
+        raise AssertionError("unreachable")
+
+    def stats(self) -> dict[str, dict]:
+        with self._lock:
+            return {host: stats.as_dict() for host, stats in self._stats.items()}
+
+    def close(self) -> None:
+        self.session.close()
+        if self.recorder is not None:
+            self.recorder.close()
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> None:
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * (2**attempt))
+        # Full jitter keeps concurrent workers from retrying in lockstep.
+        delay = random.uniform(0, delay)
+        if retry_after:
+            try:
+                delay = max(delay, min(BACKOFF_MAX, float(retry_after)))
+            except ValueError:
+                pass
+        self._sleep(delay)
+
+    def _record(self, host: str, seconds: float, size: int, *, error: bool, retry: bool) -> None:
+        with self._lock:
+            stats = self._stats.get(host)
+            if stats is None:
+                stats = self._stats[host] = HostStats()
+            stats.requests += 1
+            stats.bytes_in += size
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            if error:
+                stats.errors += 1
+            if retry:
+                stats.retries += 1
+
+
+class RequestCounter:
+    """Thread-safe count of the requests a venue client has sent.
+
+    The daemon reads it around each job to charge venue budgets for the
+    requests actually made.
+    """
+
+    def __init__(self) -> None:
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def add(self, count: int = 1) -> None:
+        with self._lock:
+            self.value += count
+
+
+def _wire_bytes(resp: requests.Response) -> int:
+    """Body bytes as received, i.e. before gzip decoding when available."""
+    raw = getattr(resp, "raw", None)
+    tell = getattr(raw, "tell", None)
+    if tell is not None:
+        try:
+            return int(tell())
+        except Exception:
+            pass
+    return len(resp.content or b"")
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_transport() -> HttpTransport:
+    """The process-wide transport the venue clients share.
+
+    Traffic is recorded to ``RECORD_TRAFFIC_PATH`` when it is set, and
+    served from ``REPLAY_TRAFFIC_PATH`` instead of the network when that is.
+    """
+    global _default
+    with _default_lock:
+        if _default is None:
+            if REPLAY_TRAFFIC_PATH:
+                _default = ReplayTransport(REPLAY_TRAFFIC_PATH, speed=REPLAY_SPEED or None)
+            else:
+                _default = HttpTransport(recorder=open_recorder(RECORD_TRAFFIC_PATH))
+        return _default
@@ -0,0 +1,83 @@
+"""JSON decoding for venue payloads, using orjson when it is installed."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Iterable, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+JSONDecodeError = orjson.JSONDecodeError if orjson is not None else json.JSONDecodeError
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Decode a JSON document straight from the bytes on the wire.
+
+    Both backends accept bytes, so callers should pass ``resp.content``
+    rather than ``resp.text`` and skip the intermediate str.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def decode_response(resp) -> Any:
+    """``resp.json()`` without the text decode."""
+    return loads(resp.content)
+
+
+def parse_json_lists(values: Iterable[object]) -> list[list]:
+    """Parse many JSON-encoded list fields at once.
+
+    Gamma nests ``outcomes``/``outcomePrices`` as JSON strings, and most of
+    them repeat (``'["Yes", "No"]'``). Distinct array-looking strings are
+    joined into one array and decoded in a single call; if that fails or
+    does not split back into one list per input, every string is parsed on
+    its own. Values already decoded pass through, anything else becomes
+    ``[]``. Equal inputs share one result list, so treat results as
+    read-only.
+    """
+    values = list(values)
+    distinct: dict[str, list] = {}
+    for value in values:
+        if isinstance(value, str) and value not in distinct:
+            distinct[value] = []
+
+    batchable = [text for text in distinct if text[:1] == "[" and text[-1:] == "]"]
+    decoded: list = []
+    if batchable:
+        try:
+            decoded = loads("[" + ",".join(batchable) + "]")
+        except (ValueError, JSONDecodeError):
+            decoded = []
+    if len(decoded) == len(batchable) and all(isinstance(item, list) for item in decoded):
+        distinct.update(zip(batchable, decoded))
+    else:
+        batchable = []
+    for text in distinct.keys() - set(batchable):
+        parsed = _loads_or_none(text)
+        distinct[text] = parsed if isinstance(parsed, list) else []
+
+    results: list[list] = []
+    for value in values:
+        if isinstance(value, str):
+            results.append(distinct[value])
+        elif isinstance(value, list):
+            results.append(value)
+        else:
+            results.append([])
+    return results
+
+
+def _loads_or_none(text: str) -> Any:
+    try:
+        return loads(text)
+    except (ValueError, JSONDecodeError):
+        return None
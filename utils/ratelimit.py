@@ -0,0 +1,131 @@
+"""Per-venue token-bucket rate limiting with request priorities."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Optional
+
+# Lower runs first: book refreshes move prices, catalogue calls can wait.
+PRIORITY_BOOK = 0
+PRIORITY_CATALOGUE = 1
+
+_PRIORITY_NAMES = {PRIORITY_BOOK: "book", PRIORITY_CATALOGUE: "catalogue"}
+
+# venue -> (tokens refilled per second, bucket capacity). One token is one
+# HTTP request, including a Betfair JSON-RPC array POST and each retry.
+VENUE_RATE_LIMITS = {
+    "betfair": (5.0, 10.0),
+    "betdex": (10.0, 20.0),
+    "polymarket": (4.0, 8.0),
+}
+
+
+class TokenBucket:
+    """Blocking token bucket that serves waiters in priority order.
+
+    Only the highest-priority (then oldest) waiter may take tokens, so a
+    queued book refresh is never starved by a stream of catalogue calls.
+    A request costing more than ``capacity`` waits for a full bucket and
+    leaves it in debt, so later callers pay for the excess.
+    Time spent blocked is accumulated per priority for ``stats``.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._cond = threading.Condition()
+        self._waiting: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._acquired: dict[int, int] = {}
+        self._throttled: dict[int, int] = {}
+        self._wait_seconds: dict[int, float] = {}
+
+    def acquire(self, cost: float = 1.0, priority: int = PRIORITY_CATALOGUE) -> float:
+        """Block until ``cost`` tokens are available; return seconds waited."""
+        # Tokens that must be on hand before taking ``cost``; the rest is debt.
+        needed = min(cost, self.capacity)
+        ticket = (priority, next(self._seq))
+        with self._cond:
+            started = self._clock()
+            heapq.heappush(self._waiting, ticket)
+            blocked = False
+            try:
+                while True:
+                    self._refill()
+                    if self._waiting[0] == ticket:
+                        if self._tokens >= needed:
+                            self._tokens -= cost
+                            break
+                        timeout = (needed - self._tokens) / self.rate
+                    else:
+                        timeout = None
+                    blocked = True
+                    self._cond.wait(timeout)
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+
+            waited = self._clock() - started if blocked else 0.0
+            self._acquired[priority] = self._acquired.get(priority, 0) + 1
+            if blocked:
+                self._throttled[priority] = self._throttled.get(priority, 0) + 1
+                self._wait_seconds[priority] = self._wait_seconds.get(priority, 0.0) + waited
+            return waited
+
+    def stats(self) -> dict:
+        with self._cond:
+            self._refill()
+            return {
+                "tokens": round(self._tokens, 2),
+                "waiting": len(self._waiting),
+                **{
+                    _PRIORITY_NAMES.get(priority, str(priority)): {
+                        "acquired": count,
+                        "throttled": self._throttled.get(priority, 0),
+                        "wait_seconds": round(self._wait_seconds.get(priority, 0.0), 3),
+                    }
+                    for priority, count in sorted(self._acquired.items())
+                },
+            }
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+
+_limiters: dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def venue_limiter(venue: str) -> Optional[TokenBucket]:
+    """The shared bucket for ``venue``, or None if it is not rate limited."""
+    with _limiters_lock:
+        limiter = _limiters.get(venue)
+        if limiter is None and venue in VENUE_RATE_LIMITS:
+            rate, capacity = VENUE_RATE_LIMITS[venue]
+            limiter = _limiters[venue] = TokenBucket(rate, capacity)
+        return limiter
+
+
+def limiter_stats() -> dict[str, dict]:
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {venue: limiter.stats() for venue, limiter in limiters.items()}